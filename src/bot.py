@@ -1,6 +1,12 @@
 import discord
 from discord.ext import commands
 from . import config
+from .providers.data_provider import DataProvider
+from .utils.executors import shutdown_executors
+from .utils.attachments import close_http_session
+from .utils.document_parser import shutdown_parser_pool
+from .utils.dm_router import DMRouter
+from .utils.interaction_router import InteractionRouter
 import os
 import pkgutil
 from pathlib import Path
@@ -18,6 +24,9 @@ class InterviewCoach(commands.Bot):
             intents=intents,
             description="Your professional Discord interview coach"
         )
+        # Reactions are routed by message id, and DMs by user, to the handler a cog registered
+        self.interaction_router = InteractionRouter(self)
+        self.dm_router = DMRouter(self)
 
     async def setup_hook(self):
         """Automatically load all cogs and tasks from the cogs directory"""
@@ -49,6 +58,18 @@ class InterviewCoach(commands.Bot):
                     task_path = f'src.cogs.tasks.{task_name}'
                     await load_cog(task_path)
 
+    async def close(self):
+        await super().close()
+        # Save deck positions of sessions still open at shutdown
+        try:
+            await DataProvider().flush_question_decks()
+        except Exception as e:
+            print(f'Failed to save question decks: {e}')
+        # Cogs are unloaded by now; let in-flight LLM and parse jobs finish
+        await shutdown_executors()
+        shutdown_parser_pool()
+        await close_http_session()
+
     async def on_ready(self):
         print(f'{self.user} has connected to Discord!')
         print(f'Serving {len(self.guilds)} guilds')
@@ -0,0 +1,74 @@
+import discord
+from discord.ext import commands, tasks
+import logging
+from ..config.bot_config import HOT_RELOAD_SECONDS
+from ..providers.question_bank import QuestionBank
+from ..providers.prompt_manager import PromptRegistry
+from ..utils.hot_reload import HotReloader
+from ..utils.executors import executor_stats
+
+logger = logging.getLogger(__name__)
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.reloader = HotReloader([])
+        if HOT_RELOAD_SECONDS > 0:
+            self.watch_sources.change_interval(seconds=HOT_RELOAD_SECONDS)
+            self.watch_sources.start()
+
+    def cog_unload(self):
+        self.watch_sources.cancel()
+
+    def _refresh_sources(self):
+        # Banks and registries are created lazily by the cogs that use them
+        self.reloader.sources = QuestionBank.loaded_banks() + PromptRegistry.loaded_registries()
+
+    @tasks.loop(seconds=5)
+    async def watch_sources(self):
+        self._refresh_sources()
+        try:
+            await self.reloader.check()
+        except Exception as e:
+            logger.error(f"Error checking for changed question/prompt files: {e}")
+
+    @watch_sources.before_loop
+    async def before_watch_sources(self):
+        await self.bot.wait_until_ready()
+
+    @commands.command(name='reload')
+    @commands.is_owner()
+    async def reload(self, ctx):
+        """Rebuild question banks and prompt templates from disk"""
+        self._refresh_sources()
+        results = await self.reloader.check(force=True)
+
+        embed = discord.Embed(title="Reload", color=discord.Color.blue())
+        for name, outcome in results.items():
+            embed.add_field(name=name, value=outcome[:1024], inline=False)
+        if not results:
+            embed.description = "Nothing loaded yet."
+        await ctx.send(embed=embed)
+
+    @commands.command(name='executors')
+    @commands.is_owner()
+    async def show_executors(self, ctx):
+        """Show queue depth and wait/run times of each workload executor"""
+        embed = discord.Embed(title="Executors", color=discord.Color.blue())
+        for name, stats in executor_stats().items():
+            embed.add_field(
+                name=f"{name} ({stats['running']}/{stats['workers']} busy)",
+                value=(
+                    f"Queued: {stats['queued']} (peak {stats['max_queued']})\n"
+                    f"Done: {stats['completed']}, failed: {stats['failed']}\n"
+                    f"Wait p50/p95: {stats['wait_p50_ms']:.0f}/{stats['wait_p95_ms']:.0f} ms\n"
+                    f"Run p50/p95: {stats['run_p50_ms']:.0f}/{stats['run_p95_ms']:.0f} ms"
+                ),
+                inline=False
+            )
+        if not embed.fields:
+            embed.description = "No executors have been used yet."
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
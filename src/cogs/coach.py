@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 from ..providers.llm_provider import LLMProvider
 from ..providers.prompt_manager import PromptManager
+from ..utils.broadcast import split_message
+from ..utils.executors import get_executor
 
 class InterviewCoach(commands.Cog):
     def __init__(self, bot):
@@ -19,20 +21,19 @@ class InterviewCoach(commands.Cog):
         await ctx.send("Consulting the interview coach. Please wait...")
 
         try:
-            prompt = self.prompt_manager.format_prompt("interview_coach", question=question)
-            response = await self._get_coach_response(prompt)
+            rendered = self.prompt_manager.render("interview_coach", question=question)
+            if rendered.truncated:
+                await ctx.send("Your question was quite long, so the coach will only see the first part of it.")
+            response = await self._get_coach_response(rendered.text)
 
-            # Split the response into chunks if it's too long
-            chunks = [response[i:i+1900] for i in range(0, len(response), 1900)]
-            for chunk in chunks:
+            # Split the response on paragraph and code block boundaries if it's too long
+            for chunk in split_message(response):
                 await ctx.send(chunk)
         except Exception as e:
             await ctx.send(f"Sorry, I encountered an error while consulting the interview coach: {str(e)}")
 
     async def _get_coach_response(self, prompt: str) -> str:
-        loop = self.bot.loop
-        response = await loop.run_in_executor(None, self.llm_provider.generate_coach_response, prompt)
-        return response
+        return await get_executor('llm').run(self.llm_provider.generate_coach_response, prompt)
 
 async def setup(bot):
     await bot.add_cog(InterviewCoach(bot))
@@ -2,18 +2,23 @@ from discord.ext import commands
 import logging
 import discord
 from ..services.interview_service import InterviewService
+from ..providers.data_provider import DataProvider
 from src.utils.question_loader import QuestionLoader
-from typing import Dict, Tuple
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
+# Unanswered type/difficulty prompts are dropped after this long
+SELECTION_TIMEOUT_SECONDS = 300
+
 class Interview(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.question_loader = QuestionLoader()
         self.interview_service = InterviewService()
-        self.pending_selection: Dict[int, Tuple[discord.Message, str]] = {}
+        self.data_provider = DataProvider()
+        # user_id -> id of the type/difficulty prompt currently waiting for their reaction
+        self.selection_prompts = {}
 
     @commands.command(name='interview')
     async def start_interview(self, ctx):
@@ -26,6 +31,12 @@ class Interview(commands.Cog):
             await ctx.send("You already have an active interview session!")
             return
 
+        # Answers arrive as DMs; the router sends them to handle_answer and nowhere else
+        other_flow = self.bot.dm_router.start(ctx.author.id, "interview", self.handle_answer)
+        if other_flow:
+            await ctx.send(f"{ctx.author.mention} Please finish your {other_flow} session before starting an interview.")
+            return
+
         try:
             await ctx.author.send("Welcome to Discord Interview Coach! Starting your session...")
             await ctx.send(f"{ctx.author.mention} Check your DMs to start the interview!")
@@ -34,8 +45,7 @@ class Interview(commands.Cog):
             embed = await self.question_loader.create_type_selection_embed()
             selection_msg = await ctx.author.send(embed=embed)
 
-            # Store message and selection type
-            self.pending_selection[ctx.author.id] = (selection_msg, "type")
+            self._await_selection(ctx.author, selection_msg, "type")
 
             # Add reaction options
             reactions = ['💻', '👥', '📊']
@@ -43,6 +53,7 @@ class Interview(commands.Cog):
                 await selection_msg.add_reaction(reaction)
 
         except discord.Forbidden:
+            self.bot.dm_router.end(ctx.author.id, "interview")
             await ctx.send(
                 f"{ctx.author.mention} I couldn't send you a DM. "
                 "Please enable DMs from server members and try again!"
@@ -53,38 +64,62 @@ class Interview(commands.Cog):
         embed = await self.question_loader.create_difficulty_selection_embed()
         difficulty_msg = await user.send(embed=embed)
 
-        # Store message and selection type
-        self.pending_selection[user.id] = (difficulty_msg, "difficulty")
+        self._await_selection(user, difficulty_msg, "difficulty")
 
         # Add reaction options
         reactions = ['🟢', '🟡', '🔴']
         for reaction in reactions:
             await difficulty_msg.add_reaction(reaction)
 
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
-        """Handle interview type and difficulty selection"""
-        if user.bot or user.id not in self.pending_selection:
-            return
+    def _await_selection(self, user: discord.User, selection_msg: discord.Message, selection_type: str):
+        """Route the user's reaction on a type or difficulty prompt to handle_selection"""
+        if selection_type == "type":
+            parse = self.question_loader.get_interview_type_from_reaction
+        else:
+            parse = self.question_loader.get_difficulty_from_reaction
+
+        async def on_select(reaction: discord.Reaction, _user: discord.User):
+            await self.handle_selection(user, selection_msg, selection_type, parse(str(reaction.emoji)))
+
+        # A prompt from an earlier !interview goes inert, so it can't expire the new session
+        previous = self.selection_prompts.get(user.id)
+        if previous is not None:
+            self.bot.interaction_router.unregister(previous)
+        self.selection_prompts[user.id] = selection_msg.id
+        self.bot.interaction_router.register(
+            selection_msg.id,
+            on_select,
+            check=lambda reaction, reactor: reactor.id == user.id and parse(str(reaction.emoji)) is not None,
+            timeout=SELECTION_TIMEOUT_SECONDS,
+            on_expire=lambda: self.selection_expired(user, selection_msg)
+        )
 
-        selection_msg, selection_type = self.pending_selection[user.id]
-        if reaction.message.id != selection_msg.id:
+    async def handle_selection(self, user: discord.User, selection_msg: discord.Message,
+                               selection_type: str, choice: str):
+        """Handle interview type and difficulty selection"""
+        if self.selection_prompts.get(user.id) != selection_msg.id:
             return
 
         if selection_type == "type":
-            interview_type = self.question_loader.get_interview_type_from_reaction(str(reaction.emoji))
-            if interview_type:
-                self.interview_service.create_session(user.id, interview_type)
-                await selection_msg.delete()
-                await self.send_difficulty_selection(user)
+            self.interview_service.create_session(user.id, choice)
+            await selection_msg.delete()
+            await self.send_difficulty_selection(user)
 
         elif selection_type == "difficulty":
-            difficulty = self.question_loader.get_difficulty_from_reaction(str(reaction.emoji))
-            if difficulty:
-                self.interview_service.set_difficulty(user.id, difficulty)
-                await selection_msg.delete()
-                del self.pending_selection[user.id]
-                await self.start_interview_question(user)
+            del self.selection_prompts[user.id]
+            self.interview_service.set_difficulty(user.id, choice)
+            await selection_msg.delete()
+            await self.start_interview_question(user)
+
+    async def selection_expired(self, user: discord.User, selection_msg: discord.Message):
+        if self.selection_prompts.get(user.id) != selection_msg.id:
+            return  # Superseded by a newer prompt
+        await self._end_session(user.id)
+        try:
+            await selection_msg.delete()
+        except discord.NotFound:
+            pass
+        await user.send("The interview setup timed out. Use `!interview` whenever you're ready to start again.")
 
     async def start_interview_question(self, user: discord.User):
         """Start the interview with the first question"""
@@ -101,16 +136,20 @@ class Interview(commands.Cog):
                 await user.send(embed=embed)
             else:
                 await user.send("Error: Could not get a question. Please try again.")
-                self.interview_service.end_session(user.id)
+                await self._end_session(user.id)
         except Exception as e:
             await user.send(f"Error starting interview: {str(e)}")
-            self.interview_service.end_session(user.id)
+            await self._end_session(user.id)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not isinstance(message.channel, discord.DMChannel):
-            return
+    async def _end_session(self, user_id: int):
+        prompt = self.selection_prompts.pop(user_id, None)
+        if prompt is not None:
+            self.bot.interaction_router.unregister(prompt)
+        self.bot.dm_router.end(user_id, "interview")
+        await self.interview_service.end_session(user_id)
 
+    async def handle_answer(self, message: discord.Message):
+        """Evaluate a DM as the answer to the current question"""
         session = self.interview_service.get_session(message.author.id)
         if not session or session.status != "waiting_for_answer":
             return
@@ -143,15 +182,19 @@ class Interview(commands.Cog):
                         summary = result['content']
                         summary_embed = self.create_summary_embed(summary)
                         await message.channel.send(embed=summary_embed)
+                        await self.data_provider.record_activity(
+                            message.author.id, 'mock_interview',
+                            interview_type=session.interview_type, difficulty=session.difficulty
+                        )
                     else:
                         logger.error(f"Unexpected result format for summary: {result}")
                         await message.channel.send("An error occurred while generating the summary. The interview has ended.")
-                    self.interview_service.end_session(message.author.id)
+                    await self._end_session(message.author.id)
 
             except Exception as e:
                 logger.error(f"Error processing response: {str(e)}", exc_info=True)
                 await message.channel.send(f"Error processing response: {str(e)}")
-                self.interview_service.end_session(message.author.id)
+                await self._end_session(message.author.id)
 
     @commands.command(name='active_interviews')
     async def check_active_interviews(self, ctx):
@@ -0,0 +1,95 @@
+import discord
+from discord.ext import commands
+import logging
+from typing import Optional
+from ..providers.data_provider import DataProvider
+from ..providers.data.leaderboard import CoinLeaderboard
+
+logger = logging.getLogger(__name__)
+
+class Leaderboard(commands.Cog):
+    MAX_ENTRIES = 25
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.data_provider = DataProvider()
+
+    async def warm_leaderboard(self):
+        """Build the leaderboard at startup so no command waits for the first profile scan"""
+        try:
+            await self.data_provider.get_leaderboard()
+        except Exception as e:
+            logger.error(f"Failed to build the coin leaderboard at startup: {e}", exc_info=True)
+
+    async def _get_board(self, guild: Optional[discord.Guild]):
+        """Return the shared leaderboard and the partition for this guild (global in DMs)"""
+        board = await self.data_provider.get_leaderboard()
+        if guild is None:
+            return board, CoinLeaderboard.GLOBAL
+
+        partition = str(guild.id)
+        if not board.has_partition(partition):
+            board.build_partition(partition, (member.id for member in guild.members if not member.bot))
+        return board, partition
+
+    @commands.command(name='leaderboard')
+    async def show_leaderboard(self, ctx, count: int = 10):
+        """
+        Show the users with the most coins in this server.
+        Usage: !leaderboard [count]
+        """
+        count = max(1, min(count, self.MAX_ENTRIES))
+        board, partition = await self._get_board(ctx.guild)
+        top_users = board.top(count, partition)
+
+        if not top_users:
+            await ctx.send("No one has earned any coins yet!")
+            return
+
+        lines = []
+        for position, (user_id, coins) in enumerate(top_users, 1):
+            user = self.bot.get_user(int(user_id))
+            name = user.display_name if user else f"User {user_id}"
+            lines.append(f"**{position}.** {name} - {coins} 🪙")
+
+        title = f"🏆 {ctx.guild.name} Leaderboard" if ctx.guild else "🏆 Global Leaderboard"
+        embed = discord.Embed(title=title, description="\n".join(lines), color=discord.Color.gold())
+        await ctx.send(embed=embed)
+
+    @commands.command(name='rank')
+    async def show_rank(self, ctx, member: discord.Member = None):
+        """
+        Show your coin rank (or another member's) in this server.
+        Usage: !rank [@member]
+        """
+        target = member or ctx.author
+        board, partition = await self._get_board(ctx.guild)
+        result = board.rank(target.id, partition)
+
+        if result is None:
+            await ctx.send(f"{target.display_name} hasn't earned any coins yet!")
+            return
+
+        rank, total = result
+        await ctx.send(f"🏅 {target.display_name} is ranked **#{rank}** of {total} with {board.coins(target.id)} 🪙")
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if not member.bot:
+            board = await self.data_provider.get_leaderboard()
+            board.add_member(str(member.guild.id), member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        board = await self.data_provider.get_leaderboard()
+        board.remove_member(str(member.guild.id), member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        board = await self.data_provider.get_leaderboard()
+        board.drop_partition(str(guild.id))
+
+async def setup(bot):
+    cog = Leaderboard(bot)
+    await bot.add_cog(cog)
+    bot.loop.create_task(cog.warm_leaderboard())
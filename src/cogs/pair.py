@@ -4,16 +4,21 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from src.utils.question_loader import QuestionLoader
+from ..providers.data_provider import DataProvider
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+PAIR_REQUEST_TIMEOUT_SECONDS = 300
+SELECTION_TIMEOUT_SECONDS = 300
+
 class PairInterview(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.pending_pairs = {}  # Store pending pair requests
         self.active_interviews = {}  # Store active interview sessions
         self.question_loader = QuestionLoader()
+        self.data_provider = DataProvider()
 
     @commands.command(name="pair")
     async def pair_interview(self, ctx):
@@ -42,84 +47,90 @@ class PairInterview(commands.Cog):
                 'created_at': datetime.now()
             }
 
-            # Wait for 5 minutes then clean up if no one joined
-            await asyncio.sleep(300)
-            if message.id in self.pending_pairs:
-                await message.delete()
-                del self.pending_pairs[message.id]
-                try:
-                    await ctx.send(f"⏰ Pair interview request from {ctx.author.mention} has expired.")
-                except:
-                    pass
+            # The first other member to react joins; the request expires after 5 minutes
+            self.bot.interaction_router.register(
+                message.id,
+                lambda reaction, user: self._accept_pair(message, user),
+                check=lambda reaction, user: str(reaction.emoji) == "✋" and user != ctx.author,
+                timeout=PAIR_REQUEST_TIMEOUT_SECONDS,
+                on_expire=lambda: self._expire_pair(ctx, message)
+            )
 
         except Exception as e:
             logger.error(f"Error creating pair request: {str(e)}", exc_info=True)
             await ctx.send("❌ An error occurred while creating the pair request.")
 
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        """Handle reactions to pair requests and question type selection"""
-        if user.bot:
+    async def _accept_pair(self, message, user):
+        """Start the interview for a member who reacted to a pair request"""
+        pair_info = self.pending_pairs.pop(message.id, None)
+        if pair_info is None:
             return
+        try:
+            # Create interview channels
+            await self._create_interview_channels(message, pair_info['initiator'], user)
 
-        message = reaction.message
-        # Handle pair request reactions
-        if message.id in self.pending_pairs:
-            if user == self.pending_pairs[message.id]['initiator']:
-                return
+            # Clean up the pair request
+            await message.delete()
 
-            if str(reaction.emoji) == "✋":
-                try:
-                    # Create interview channels
-                    await self._create_interview_channels(message, self.pending_pairs[message.id]['initiator'], user)
-
-                    # Clean up the pair request
-                    await message.delete()
-                    del self.pending_pairs[message.id]
+        except Exception as e:
+            logger.error(f"Error creating interview channels: {str(e)}", exc_info=True)
+            await message.channel.send("❌ An error occurred while creating the interview channels.")
 
-                except Exception as e:
-                    logger.error(f"Error creating interview channels: {str(e)}", exc_info=True)
-                    await message.channel.send("❌ An error occurred while creating the interview channels.")
+    async def _expire_pair(self, ctx, message):
+        if self.pending_pairs.pop(message.id, None) is None:
             return
-
-        # Handle question type selection
-        category_id = message.channel.category_id
-        if category_id in self.active_interviews:
-            interview = self.active_interviews[category_id]
-            if 'pending_selection' in interview and message.id == interview['pending_selection']['message_id']:
-                # Check if this is one of our interview type emojis
-                if str(reaction.emoji) in self.question_loader.INTERVIEW_TYPE_EMOJIS:
-                    interview_type = self.question_loader.INTERVIEW_TYPE_EMOJIS[str(reaction.emoji)]
-
-                    # Send difficulty selection
-                    difficulty_embed = await self.question_loader.create_difficulty_selection_embed()
-                    diff_msg = await message.channel.send(embed=difficulty_embed)
-
-                    # Update pending selection
-                    interview['pending_selection'] = {
-                        'message_id': diff_msg.id,
-                        'type': 'difficulty',
-                        'interview_type': interview_type
-                    }
-
-                    # Add difficulty reactions
-                    for emoji in self.question_loader.DIFFICULTY_EMOJIS:
-                        await diff_msg.add_reaction(emoji)
-
-                    # Delete the type selection message
-                    await message.delete()
-
-                # Handle difficulty selection
-                elif str(reaction.emoji) in self.question_loader.DIFFICULTY_EMOJIS:
-                    difficulty = self.question_loader.DIFFICULTY_EMOJIS[str(reaction.emoji)]
-                    interview_type = interview['pending_selection']['interview_type']
-
-                    # Delete the difficulty selection message
-                    await message.delete()
-                    del interview['pending_selection']
-
-                    # Send question with selected type and difficulty
-                    await self._send_question(message.channel, interview, interview_type, difficulty)
+        try:
+            await message.delete()
+            await ctx.send(f"⏰ Pair interview request from {ctx.author.mention} has expired.")
+        except discord.HTTPException:
+            pass
+
+    def _await_type_selection(self, interview, type_msg):
+        """Route a participant's type reaction to a difficulty prompt"""
+        async def on_type(reaction, user):
+            interview_type = self.question_loader.INTERVIEW_TYPE_EMOJIS[str(reaction.emoji)]
+
+            # Send difficulty selection
+            difficulty_embed = await self.question_loader.create_difficulty_selection_embed()
+            diff_msg = await type_msg.channel.send(embed=difficulty_embed)
+            self._await_difficulty_selection(interview, diff_msg, interview_type)
+
+            # Add difficulty reactions
+            for emoji in self.question_loader.DIFFICULTY_EMOJIS:
+                await diff_msg.add_reaction(emoji)
+
+            # Delete the type selection message
+            await type_msg.delete()
+
+        self.bot.interaction_router.register(
+            type_msg.id,
+            on_type,
+            check=lambda reaction, user: (self._is_participant(interview, user)
+                                          and str(reaction.emoji) in self.question_loader.INTERVIEW_TYPE_EMOJIS),
+            timeout=SELECTION_TIMEOUT_SECONDS
+        )
+
+    def _await_difficulty_selection(self, interview, diff_msg, interview_type: str):
+        async def on_difficulty(reaction, user):
+            difficulty = self.question_loader.DIFFICULTY_EMOJIS[str(reaction.emoji)]
+
+            # Delete the difficulty selection message
+            await diff_msg.delete()
+
+            # Send question with selected type and difficulty
+            await self._send_question(diff_msg.channel, interview, interview_type, difficulty)
+
+        self.bot.interaction_router.register(
+            diff_msg.id,
+            on_difficulty,
+            check=lambda reaction, user: (self._is_participant(interview, user)
+                                          and str(reaction.emoji) in self.question_loader.DIFFICULTY_EMOJIS),
+            timeout=SELECTION_TIMEOUT_SECONDS
+        )
+
+    @staticmethod
+    def _is_participant(interview, user) -> bool:
+        return user.id in (interview['user1'].id, interview['user2'].id)
 
     async def _create_interview_channels(self, message, user1, user2):
         """Create a category with voice and text channels for the interview"""
@@ -155,8 +166,10 @@ class PairInterview(commands.Cog):
                 'user1': user1,
                 'user2': user2,
                 'created_at': datetime.now(),
+                'started_at': datetime.now(),  # Unlike created_at, not reset by !extend
                 'current_question': None,  # Track current question
-                'asked_questions': set()    # Track asked questions
+                'current_type': None,
+                'current_level': None
             }
 
             # Move users to voice channel if they're in a voice channel
@@ -180,6 +193,7 @@ class PairInterview(commands.Cog):
                     f"`!question` - Get an interview question (will show type options)\n"
                     f"`!question <type>` - Get a specific type question\n"
                     f"  Types: technical, behavioral, system_design\n"
+                    f"`!question search <terms>` - Find a question by topic\n"
                     f"`!next` - Get next question of same type\n"
                     f"`!stop` - End the interview (5 minute countdown)\n"
                     f"`!extend` - Add 30 more minutes\n\n"
@@ -284,8 +298,8 @@ class PairInterview(commands.Cog):
             await ctx.send("❌ An error occurred while extending the interview.")
 
     @commands.command(name="question")
-    async def get_interview_question(self, ctx, question_type: str = None):
-        """Get a random interview question based on type"""
+    async def get_interview_question(self, ctx, question_type: str = None, *, query: str = None):
+        """Get a random interview question based on type, or search with !question search <terms>"""
         try:
             # Check if this is an interview text channel
             category_id = ctx.channel.category_id
@@ -301,17 +315,17 @@ class PairInterview(commands.Cog):
                 # Send type selection
                 type_embed = await self.question_loader.create_type_selection_embed()
                 type_msg = await ctx.send(embed=type_embed)
-
-                # Store the message for reaction handling
-                interview['pending_selection'] = {
-                    'message_id': type_msg.id
-                }
+                self._await_type_selection(interview, type_msg)
 
                 # Add reaction options
                 for emoji in self.question_loader.get_interview_type_emojis():
                     await type_msg.add_reaction(emoji)
                 return
 
+            if question_type.lower() == "search":
+                await self._search_questions(ctx, interview, query)
+                return
+
             # If type is specified directly
             await self._send_question(ctx, interview, question_type.lower(), "medium")  # Default to medium difficulty
 
@@ -319,16 +333,57 @@ class PairInterview(commands.Cog):
             logger.error(f"Error getting interview question: {str(e)}", exc_info=True)
             await ctx.send("❌ An error occurred while getting the question.")
 
+    async def _search_questions(self, ctx, interview, query: Optional[str]):
+        """Pose the best match for the search terms and list the runners-up"""
+        if not query:
+            await ctx.send("❌ Usage: `!question search [type] <terms>`, e.g. `!question search technical caching`")
+            return
+
+        # An optional leading question type narrows the search
+        question_type = None
+        first, _, rest = query.partition(" ")
+        if first.lower() in self.question_loader.INTERVIEW_TYPE_EMOJIS.values() and rest.strip():
+            question_type, query = first.lower(), rest
+
+        results = self.question_loader.search_questions(query, question_type, limit=5)
+        if not results:
+            await ctx.send(f"❌ No questions match `{query}`.")
+            return
+
+        question_type, question = results[0]
+        level = question.get('difficulty', 'medium')
+        if isinstance(level, list):  # Questions usable at several levels keep the default
+            level = 'medium' if 'medium' in level or not level else level[0]
+        interview['current_question'] = question
+        interview['current_type'] = question_type
+        interview['current_level'] = level
+
+        embed = await self.question_loader.create_question_embed(question_type, level, question)
+        if len(results) > 1:
+            embed.add_field(
+                name="🔎 Other Matches",
+                value="\n".join(
+                    f"• [{other_type}] {other['question'][:90]}" for other_type, other in results[1:]
+                ),
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
     async def _send_question(self, ctx, interview, question_type: str, level: str = "medium"):
         """Send a question for discussion"""
-        question = await self.question_loader.get_random_question(question_type, level)
+        # The pair's deck lives in the profile of the member with the lower id
+        owner_id, partner_id = sorted((interview['user1'].id, interview['user2'].id))
+        decks = await self.data_provider.get_question_decks(str(owner_id))
+        question = self.question_loader.draw_question(decks, question_type, level, owner=f"pair:{partner_id}:")
+        await self.data_provider.mark_decks_dirty(str(owner_id))
         if not question:
             await ctx.send("❌ No questions found for the specified type.")
             return
 
         # Store current question
         interview['current_question'] = question
-        interview['asked_questions'].add(question.get('id', ''))
+        interview['current_type'] = question_type
+        interview['current_level'] = level
 
         # Create and send embed
         embed = await self.question_loader.create_question_embed(question_type, level, question)
@@ -354,8 +409,8 @@ class PairInterview(commands.Cog):
                 await ctx.send("❌ No active question. Use `!question <type> <level>` to start.")
                 return
 
-            question_type = current_question.get('type')
-            level = current_question.get('difficulty')
+            question_type = interview['current_type']
+            level = interview['current_level']
 
             # Get and send next question
             await self._send_question(ctx, interview, question_type, level)
@@ -432,6 +487,15 @@ class PairInterview(commands.Cog):
                 logger.error(f"Error deleting category: {e}")
 
             logger.info(f"Successfully cleaned up interview session {category_id}")
+
+            duration_minutes = int((datetime.now() - interview['started_at']).total_seconds() // 60)
+            for user in (interview['user1'], interview['user2']):
+                await self.data_provider.record_activity(
+                    user.id, 'interview_practice', duration_minutes=duration_minutes
+                )
+            await self.data_provider.flush_question_decks(
+                [interview['user1'].id, interview['user2'].id]
+            )
         except Exception as e:
             logger.error(f"Error in cleanup: {str(e)}")
         finally:
@@ -444,15 +508,7 @@ class PairInterview(commands.Cog):
             try:
                 current_time = datetime.now()
 
-                # Clean up old pending requests
-                for message_id, pair_info in list(self.pending_pairs.items()):
-                    if (current_time - pair_info['created_at']) > timedelta(minutes=5):
-                        try:
-                            await pair_info['message'].delete()
-                        except:
-                            pass
-                        del self.pending_pairs[message_id]
-
+                # Pending pair requests expire through the interaction router
                 # Clean up old interview sessions
                 for category_id, interview in list(self.active_interviews.items()):
                     if (current_time - interview['created_at']) > timedelta(hours=2):
@@ -1,18 +1,19 @@
 import discord
 from discord.ext import commands
 import io
-import PyPDF2
-import docx
 from ..services.resume_service import ResumeService
+from ..providers.data_provider import DataProvider
 from src.utils.embed_builder import EmbedBuilder
+from ..utils.attachments import download_attachment
+from ..utils.document_parser import DocumentTooLarge, ExtractionResult, SUPPORTED_FORMATS, parse_document
 
 class Resume(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.resume_service = ResumeService()
         self.embed_builder = EmbedBuilder()
-        self.pending_resumes = {}  # Store user_id: waiting_for_resume
-        self.supported_formats = ['.txt', '.doc', '.docx', '.pdf']
+        self.data_provider = DataProvider()
+        self.supported_formats = SUPPORTED_FORMATS
 
     @commands.command(name='resume')
     async def refine_resume(self, ctx):
@@ -21,6 +22,12 @@ class Resume(commands.Cog):
         Usage: !resume
         Upload your resume as a file (.txt, .doc, .docx, .pdf) or paste the text directly.
         """
+        # The upload arrives as a DM; the router sends it to handle_upload and nowhere else
+        other_flow = self.bot.dm_router.start(ctx.author.id, "resume", self.handle_upload)
+        if other_flow:
+            await ctx.send(f"{ctx.author.mention} Please finish your {other_flow} session before starting a resume review.")
+            return
+
         try:
             instructions = (
                 "Welcome to the Resume Refinement service!\n\n"
@@ -32,41 +39,26 @@ class Resume(commands.Cog):
             await ctx.author.send(instructions)
             await ctx.send(f"{ctx.author.mention} Check your DMs to start the resume refinement process!")
 
-            self.pending_resumes[ctx.author.id] = True
-
         except discord.Forbidden:
+            self.bot.dm_router.end(ctx.author.id, "resume")
             await ctx.send(
                 f"{ctx.author.mention} I couldn't send you a DM. "
                 "Please enable DMs from server members and try again!"
             )
 
-    async def extract_text_from_file(self, attachment) -> str:
+    async def extract_text_from_file(self, attachment) -> ExtractionResult:
         """Extract text from various file formats"""
         file_ext = attachment.filename[attachment.filename.rfind('.'):].lower()
 
         if file_ext not in self.supported_formats:
             raise ValueError(f"Unsupported file format. Supported formats: {', '.join(self.supported_formats)}")
 
-        # Download the file
-        file_data = io.BytesIO()
-        await attachment.save(file_data)
-        file_data.seek(0)
-
         try:
-            if file_ext == '.txt':
-                return file_data.read().decode('utf-8')
-
-            elif file_ext == '.pdf':
-                pdf_reader = PyPDF2.PdfReader(file_data)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-
-            elif file_ext in ['.doc', '.docx']:
-                doc = docx.Document(file_data)
-                return "\n".join([paragraph.text for paragraph in doc.paragraphs])
-
+            # Oversized files are refused before downloading; large ones spill to disk
+            async with download_attachment(attachment) as download:
+                return await parse_document(file_ext, download.source, download.digest)
+        except DocumentTooLarge:
+            raise
         except Exception as e:
             raise ValueError(f"Error reading file: {str(e)}")
 
@@ -84,48 +76,62 @@ class Resume(commands.Cog):
             for chunk in chunks:
                 await channel.send(f"```{chunk}```")
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not isinstance(message.channel, discord.DMChannel):
-            return
-
-        if message.author.id in self.pending_resumes:
-            async with message.channel.typing():
-                try:
-                    resume_text = ""
-
-                    # Check for file attachment
-                    if message.attachments:
-                        attachment = message.attachments[0]
-                        await message.channel.send("Processing your resume file... Please wait.")
-                        resume_text = await self.extract_text_from_file(attachment)
-                    else:
-                        # Use message content as resume text
-                        resume_text = message.content
-
-                    if not resume_text.strip():
-                        await message.channel.send("No resume content found. Please try again.")
-                        return
-
-                    await message.channel.send("Analyzing your resume... Please wait.")
-
-                    # Get refinement feedback
-                    feedback = await self.resume_service.analyze_resume(resume_text)
-
-                    # Send feedback in chunks
-                    await self.send_feedback_in_chunks(message.channel, feedback)
-
-                    # Clean up
-                    del self.pending_resumes[message.author.id]
-
-                    # Ask if they want to save the refined version
-                    await self.offer_download(message.channel, feedback.get("refined_content", ""))
-
-                except ValueError as ve:
-                    await message.channel.send(f"Error: {str(ve)}")
-                except Exception as e:
-                    await message.channel.send(f"Error processing resume: {str(e)}")
-                    del self.pending_resumes[message.author.id]
+    async def handle_upload(self, message: discord.Message):
+        """Review a resume sent as a DM, attached or pasted"""
+        async with message.channel.typing():
+            try:
+                resume_text = ""
+
+                # Check for file attachment
+                if message.attachments:
+                    attachment = message.attachments[0]
+                    await message.channel.send("Processing your resume file... Please wait.")
+                    extraction = await self.extract_text_from_file(attachment)
+                    resume_text = extraction.text
+                    if extraction.limit_hit:
+                        await message.channel.send(
+                            "⚠️ Your file is very long, so only the first part of it was read."
+                        )
+                else:
+                    # Use message content as resume text
+                    resume_text = message.content
+
+                if not resume_text.strip():
+                    await message.channel.send("No resume content found. Please try again.")
+                    return
+
+                await message.channel.send("Analyzing your resume... Please wait.")
+
+                # Get refinement feedback
+                feedback = await self.resume_service.analyze_resume(resume_text, user_id=message.author.id)
+
+                if feedback.get("reused_sections"):
+                    changed = ", ".join(feedback["changed_sections"]) or "none"
+                    await message.channel.send(
+                        f"♻️ Reused earlier feedback for {len(feedback['reused_sections'])} unchanged section(s). "
+                        f"Newly reviewed sections: {changed}."
+                    )
+
+                if feedback.get("truncated"):
+                    await message.channel.send(
+                        "⚠️ Your resume was too long to review in full, so only the first part was analyzed."
+                    )
+
+                # Send feedback in chunks
+                await self.send_feedback_in_chunks(message.channel, feedback)
+                await self.data_provider.record_activity(message.author.id, 'resume_review')
+
+                # Clean up
+                self.bot.dm_router.end(message.author.id, "resume")
+
+                # Ask if they want to save the refined version
+                await self.offer_download(message.channel, feedback.get("refined_content", ""))
+
+            except ValueError as ve:
+                await message.channel.send(f"Error: {str(ve)}")
+            except Exception as e:
+                await message.channel.send(f"Error processing resume: {str(e)}")
+                self.bot.dm_router.end(message.author.id, "resume")
 
     async def offer_download(self, channel, refined_content: str):
         """Offer to provide the refined resume as a downloadable file"""
@@ -134,23 +140,26 @@ class Resume(commands.Cog):
 
         await channel.send("Would you like to download the refined resume as a file? React with 📥 to download.")
         msg = await channel.send("(This offer will expire in 60 seconds)")
-        await msg.add_reaction("📥")
 
-        def check(reaction, user):
-            return not user.bot and str(reaction.emoji) == "📥" and reaction.message.id == msg.id
-
-        try:
-            await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-            # Create and send file
-            file = discord.File(
-                io.StringIO(refined_content),
-                filename="refined_resume.txt"
-            )
-            await channel.send("Here's your refined resume:", file=file)
-        except TimeoutError:
-            await msg.delete()
-        except Exception as e:
-            await channel.send(f"Error creating file: {str(e)}")
+        async def send_file(reaction, user):
+            try:
+                # Create and send file
+                file = discord.File(
+                    io.StringIO(refined_content),
+                    filename="refined_resume.txt"
+                )
+                await channel.send("Here's your refined resume:", file=file)
+            except Exception as e:
+                await channel.send(f"Error creating file: {str(e)}")
+
+        self.bot.interaction_router.register(
+            msg.id,
+            send_file,
+            check=lambda reaction, user: str(reaction.emoji) == "📥",
+            timeout=60.0,
+            on_expire=msg.delete
+        )
+        await msg.add_reaction("📥")
 
 async def setup(bot):
     await bot.add_cog(Resume(bot))
\ No newline at end of file
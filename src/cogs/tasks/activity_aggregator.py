@@ -0,0 +1,24 @@
+from discord.ext import commands
+import logging
+from ...utils.task_scheduler import BaseScheduledTask
+from ...services.activity_service import ActivityService
+
+logger = logging.getLogger(__name__)
+
+class ActivityAggregator(commands.Cog, BaseScheduledTask):
+    def __init__(self, bot):
+        commands.Cog.__init__(self)
+        BaseScheduledTask.__init__(self, bot)
+        self.activity_service = ActivityService()
+        self.start_task_loop()
+
+    def cog_unload(self):
+        self.stop_task_loop()
+
+    async def execute(self):
+        """Fold pending activity events into user profiles"""
+        result = await self.activity_service.aggregate()
+        logger.info(f"Activity aggregation finished: {result or 'nothing pending'}")
+
+async def setup(bot):
+    await bot.add_cog(ActivityAggregator(bot))
\ No newline at end of file
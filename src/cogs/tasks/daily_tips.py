@@ -1,9 +1,11 @@
-from discord.ext import commands, tasks
-from datetime import datetime, time
+from discord.ext import commands
 from ...utils.task_scheduler import BaseScheduledTask
+from ...utils.executors import get_executor
+from ...utils.broadcast import broadcast
 from ...config.task_config import TASK_CONFIG
 import logging
 from ...providers.llm_provider import LLMProvider
+from ...services.tip_buffer import TipBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -13,48 +15,35 @@ class DailyTips(commands.Cog, BaseScheduledTask):
         commands.Cog.__init__(self)
         BaseScheduledTask.__init__(self, bot)
         self.llm_provider = llm_provider
-        self.task_loop = self.create_task_loop()
-        logger.info("Starting DailyTips task loop")
-        self.task_loop.start()
+        self.tip_buffer = TipBuffer.shared()
+        self.start_task_loop()
 
     def cog_unload(self):
-        self.task_loop.cancel()
+        self.stop_task_loop()
 
     async def execute(self):
-        """Generate and send daily tech tip to all designated channels"""
-        logger.info("DailyTips execute method called")
-
-        if not self.should_run():
-            logger.info("DailyTips should_run() returned False - skipping execution")
-            return
-
+        """Send the next pre-generated tech tip to all designated channels"""
         channel_ids = TASK_CONFIG['dailytips']['channel_ids']
         logger.info(f"Executing daily tip task for channels: {channel_ids}")
 
         try:
-            # Generate the daily tip using llm_provider
-            daily_tip = await self.llm_provider.create_daily_tip()
-
-            for channel_id in channel_ids:
-                channel = self.bot.get_channel(channel_id)
-                if channel:
-                    try:
-                        # Split long messages if needed
-                        if len(daily_tip) > 2000:
-                            chunks = [daily_tip[i:i+1990] for i in range(0, len(daily_tip), 1990)]
-                            for chunk in chunks:
-                                await channel.send(chunk)
-                        else:
-                            await channel.send(daily_tip)
-                        logger.info(f"Sent daily tip to channel {channel_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to send daily tip to channel {channel_id}: {e}")
-                else:
-                    logger.warning(f"Could not find channel with ID {channel_id}")
-
+            daily_tip = await self.next_tip()
+            await broadcast(self.bot, channel_ids, daily_tip, label="dailytips")
         except Exception as e:
             logger.error(f"Failed to execute daily tip task: {e}")
 
+    async def next_tip(self) -> str:
+        """Dequeue a buffered tip, generating one on the spot only if the producer fell behind"""
+        disk = get_executor('disk')
+        daily_tip = await disk.run(self.tip_buffer.pop)
+        if daily_tip is not None:
+            return daily_tip
+
+        logger.warning("Daily tip buffer is empty; generating today's tip now")
+        daily_tip = await self.llm_provider.generate_daily_tip()
+        await disk.run(self.tip_buffer.record_sent, daily_tip)
+        return daily_tip
+
 async def setup(bot):
     llm_provider = LLMProvider()
     await bot.add_cog(DailyTips(bot, llm_provider))
\ No newline at end of file
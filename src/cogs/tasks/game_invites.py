@@ -3,6 +3,7 @@ import discord
 import asyncio
 from datetime import datetime, time
 from ...utils.task_scheduler import BaseScheduledTask
+from ...utils.broadcast import fan_out, send_with_retry
 from ...config.task_config import TASK_CONFIG
 from ...config.game_config import GAME_CONFIGS
 from .games import AVAILABLE_GAMES
@@ -176,7 +177,7 @@ class GameInvites(commands.Cog, BaseScheduledTask):
                     continue
 
             view = GameSelectView(self)
-            message = await channel.send(embed=embed, view=view)
+            message = await send_with_retry(channel, embed=embed, view=view)
 
             # Initialize invite data
             self.active_invites[message.id] = {
@@ -336,16 +337,11 @@ class GameInvites(commands.Cog, BaseScheduledTask):
 
         logger.info(f"Found {len(channel_ids)} configured channels for game invites")
 
-        for channel_id in channel_ids:
-            channel = self.bot.get_channel(channel_id)
-            if channel:
-                logger.info(f"Creating scheduled game invite in channel {channel.name} ({channel_id})")
-                try:
-                    await self.create_game_invite(channel)
-                except Exception as e:
-                    logger.error(f"Error creating game invite in channel {channel.name} ({channel_id}): {e}")
-            else:
-                logger.warning(f"Could not find channel with ID {channel_id}")
+        async def deliver(channel, stats):
+            await self.create_game_invite(channel)
+            stats.messages += 1
+
+        await fan_out(self.bot, channel_ids, deliver, label="gameinvites")
 
 async def setup(bot):
     await bot.add_cog(GameInvites(bot))
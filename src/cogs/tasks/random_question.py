@@ -2,7 +2,8 @@ from asyncio import Lock
 import logging
 from discord.ext import commands
 from discord import Embed, Status
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
 import asyncio
 from ...utils.task_scheduler import BaseScheduledTask
 from ...config.task_config import TASK_CONFIG
@@ -14,8 +15,7 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
     def __init__(self, bot):
         commands.Cog.__init__(self)
         BaseScheduledTask.__init__(self, bot)
-        self.task_loop = self.create_task_loop()
-        self.task_loop.start()
+        self.start_task_loop()
         self.data_provider = DataProvider()
         self.test_user_ids = TASK_CONFIG['randomquestions']['test_user_ids']
         self.allow_multiple_daily = TASK_CONFIG['randomquestions'].get('allow_multiple_daily', False)
@@ -23,6 +23,9 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
         self.sent_messages_lock = Lock()
         logger.info(f"Initialized RandomQuestions with {len(self.test_user_ids)} test users")
 
+    def cog_unload(self):
+        self.stop_task_loop()
+
     async def execute(self):
         """Send daily check-in to online subscribed users"""
         current_date = datetime.now().date()
@@ -30,10 +33,13 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
 
         logger.info(f"Starting daily check-in execution for {len(self.test_user_ids)} users")
 
+        # Prefetch every profile in one pass instead of one file scan per user
+        profiles = await self.data_provider.get_profiles(self.test_user_ids)
+
         # Create tasks for all eligible users
         tasks = []
         for user_id in self.test_user_ids:
-            task = self.process_user(user_id, current_date, current_time)
+            task = self.process_user(user_id, current_date, current_time, profiles.get(str(user_id)))
             tasks.append(task)
 
         # Run all tasks concurrently
@@ -41,8 +47,9 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
 
         logger.info("Completed daily check-in execution")
 
-    async def process_user(self, user_id: str, current_date: datetime.date, current_time: datetime):
-        """Process check-in for a single user"""
+    async def process_user(self, user_id: str, current_date: datetime.date, current_time: datetime,
+                           user_profile: Optional[Dict[str, Any]] = None):
+        """Process check-in for a single user, using a prefetched profile when given"""
         try:
             user_id = str(user_id)
             logger.info(f"Processing user_id: {user_id}")
@@ -57,7 +64,8 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
                 logger.info(f"User {user.name} (ID: {user_id}) is offline or not found in any shared guild")
                 return
 
-            user_profile = await self.data_provider.get_user_profile(user_id)
+            if user_profile is None:
+                user_profile = await self.data_provider.get_user_profile(user_id)
             logger.debug(f"User profile for {user_id}: {user_profile}")
 
             if not self.allow_multiple_daily and user_profile.get('last_check_in_date') == current_date.isoformat():
@@ -76,8 +84,8 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
             message = await self.ask_daily_question(user)
 
             try:
-                reaction, _ = await self.bot.wait_for(
-                    'reaction_add',
+                reaction, _ = await self.bot.interaction_router.wait(
+                    message.id,
                     timeout=300,
                     check=lambda r, u: u.id == int(user_id) and str(r.emoji)[0] in "123456"
                 )
@@ -85,20 +93,18 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
                 # Get fresh user profile before modifications
                 user_profile = await self.data_provider.get_user_profile(user_id)
 
-                # Update coins
-                user_profile['total_coins'] += 50
-                await self.data_provider.save_user_profile(user_profile)
-
-                # Update streak
-                streak = await self.update_user_streak(user_id)
-
-                # Update last check-in date
-                user_profile = await self.data_provider.get_user_profile(user_id)
+                # Update streak and last check-in date with a single save
+                streak = self.apply_streak(user_profile, current_date)
                 user_profile['last_check_in_date'] = current_date.isoformat()
                 await self.data_provider.save_user_profile(user_profile)
 
+                # Coins are credited by the activity aggregator from this event
+                await self.data_provider.record_activity(
+                    user_id, 'daily_check_in', streak=streak, answer=str(reaction.emoji)[0]
+                )
+
                 logger.info(f"Updated streak for user {user_id}: {streak}")
-                await self.send_streak_message(user, user_id, streak, "Daily Check-in")
+                await self.send_streak_message(user, user_id, streak, "Daily Check-in", user_profile)
 
                 # Use lock when updating sent_messages
                 async with self.sent_messages_lock:
@@ -147,8 +153,12 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
 
     async def update_user_streak(self, user_id: str):
         user_profile = await self.data_provider.get_user_profile(user_id)
+        streak = self.apply_streak(user_profile, datetime.now().date())
+        await self.data_provider.save_user_profile(user_profile)
+        return streak
 
-        current_date = datetime.now().date()
+    def apply_streak(self, user_profile: Dict[str, Any], current_date: date) -> int:
+        """Advance or reset the streak on an already loaded profile without saving it"""
         last_activity_date = datetime.fromisoformat(user_profile['current_streak']['last_activity_date']).date()
 
         if current_date == last_activity_date + timedelta(days=1):
@@ -157,27 +167,24 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
             user_profile['current_streak']['count'] = 1
 
         user_profile['current_streak']['last_activity_date'] = current_date.isoformat()
-
-        await self.data_provider.save_user_profile(user_profile)
-        logger.info(f"Updated streak for user {user_id}: {user_profile['current_streak']}")
+        logger.info(f"Updated streak for user {user_profile['user_id']}: {user_profile['current_streak']}")
 
         return user_profile['current_streak']['count']
 
-    async def generate_streak_message(self, user_id: str, streak: int):
+    async def generate_streak_message(self, user_id: str, streak: int, user_profile: Optional[Dict[str, Any]] = None):
         user_id = str(user_id)
-        user_profile = await self.data_provider.get_user_profile(user_id)
-        level_config = await self.data_provider.get_level_config()
+        if user_profile is None:
+            user_profile = await self.data_provider.get_user_profile(user_id)
+        level_table = await self.data_provider.get_level_table()
 
         logger.debug(f"User profile for streak message: {user_profile}")
-        logger.debug(f"Level config: {level_config}")
 
-        current_level = next(level for level in level_config['levels'] if level['coins_required'] <= user_profile['total_coins'])
-        next_level = next((level for level in level_config['levels'] if level['coins_required'] > user_profile['total_coins']), None)
+        current_level, next_level = level_table.resolve(user_profile['total_coins'])
 
         daily_reward = current_level['daily_reward']
         next_reward = next_level['daily_reward'] if next_level else daily_reward
 
-        total_levels = len(level_config['levels'])
+        total_levels = len(level_table)
 
         if next_level:
             progress = user_profile['total_coins'] - current_level['coins_required']
@@ -185,11 +192,10 @@ class RandomQuestions(commands.Cog, BaseScheduledTask):
             progress_percentage = min(progress / total_for_next_level, 1)
             filled_squares = int(progress_percentage * 6)
             progress_bar = f"{'🟩' * filled_squares}{'🟥' * (6 - filled_squares)}"
+            logger.debug(f"Progress bar calculation: progress={progress}, total_for_next_level={total_for_next_level}, percentage={progress_percentage}, filled_squares={filled_squares}")
         else:
             progress_bar = "🟩🟩🟩🟩🟩🟩"  # Max level reached
 
-        logger.debug(f"Progress bar calculation: progress={progress}, total_for_next_level={total_for_next_level}, percentage={progress_percentage}, filled_squares={filled_squares}")
-
         message = f"""
 🔥 Current Streak: {streak} day{'s' if streak != 1 else ''}
 💰 Total Coins: {user_profile['total_coins']}
@@ -207,8 +213,9 @@ New daily reward: {daily_reward} 🪙
         logger.debug(f"Generated streak message for user {user_id}: {message}")
         return message
 
-    async def send_streak_message(self, user, user_id: str, streak: int, context: str):
-        streak_message = await self.generate_streak_message(user_id, streak)
+    async def send_streak_message(self, user, user_id: str, streak: int, context: str,
+                                  user_profile: Optional[Dict[str, Any]] = None):
+        streak_message = await self.generate_streak_message(user_id, streak, user_profile)
         embed = Embed(title=f"Your Streak Information ({context})", description=streak_message, color=0x00ff00)
         await user.send(embed=embed)
         logger.info(f"Sent streak message to user {user_id} for {context}")
@@ -221,7 +228,7 @@ New daily reward: {daily_reward} 🪙
         streak = user_profile['current_streak']['count']
         logger.info(f"User {user_id} requested streak information. user_profile: {user_profile}")
         logger.info(f"User {user_id} requested streak information. Current streak: {streak}")
-        await self.send_streak_message(ctx.author, user_id, streak, "Command")
+        await self.send_streak_message(ctx.author, user_id, streak, "Command", user_profile)
 
 async def setup(bot):
     await bot.add_cog(RandomQuestions(bot))
\ No newline at end of file
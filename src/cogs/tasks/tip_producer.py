@@ -0,0 +1,49 @@
+from discord.ext import commands
+import logging
+from ...utils.task_scheduler import BaseScheduledTask
+from ...utils.executors import get_executor
+from ...config.task_config import TASK_CONFIG
+from ...providers.llm_provider import LLMProvider
+from ...services.tip_buffer import TipBuffer
+
+logger = logging.getLogger(__name__)
+
+class TipProducer(commands.Cog, BaseScheduledTask):
+    """Fills the daily tip buffer off-peak so the 10 AM broadcast never waits on the model"""
+
+    def __init__(self, bot, llm_provider):
+        commands.Cog.__init__(self)
+        BaseScheduledTask.__init__(self, bot)
+        self.llm_provider = llm_provider
+        self.tip_buffer = TipBuffer.shared()
+        config = TASK_CONFIG['tipproducer']
+        self.buffer_size = config.get('buffer_size', 7)
+        self.attempts_per_tip = config.get('attempts_per_tip', 3)
+        self.start_task_loop()
+
+    def cog_unload(self):
+        self.stop_task_loop()
+
+    async def execute(self):
+        """Generate tips until the buffer holds buffer_size, skipping near-duplicates"""
+        disk = get_executor('disk')
+        missing = self.buffer_size - await disk.run(self.tip_buffer.pending_count)
+        if missing <= 0:
+            logger.info(f"Daily tip buffer already holds {self.buffer_size} tips")
+            return
+
+        added = rejected = 0
+        for _ in range(missing * self.attempts_per_tip):
+            tip = await self.llm_provider.generate_daily_tip()
+            reason = await disk.run(self.tip_buffer.add, tip)
+            if reason is None:
+                added += 1
+                if added == missing:
+                    break
+            else:
+                rejected += 1
+                logger.info(f"Discarded a generated daily tip: {reason}")
+        logger.info(f"Daily tip buffer: added {added}, rejected {rejected} near-duplicates")
+
+async def setup(bot):
+    await bot.add_cog(TipProducer(bot, LLMProvider()))
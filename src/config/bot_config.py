@@ -9,6 +9,9 @@ load_dotenv()
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 COMMAND_PREFIX = os.getenv('COMMAND_PREFIX', '!')
 
+# How often question and prompt files are checked for edits (0 disables hot reload)
+HOT_RELOAD_SECONDS = int(os.getenv('HOT_RELOAD_SECONDS', '5'))
+
 # Parse test user IDs from comma-separated string to list of integers
 TEST_USER_IDS = [
     int(id.strip())
@@ -1,36 +1,53 @@
-from datetime import time
 from .bot_config import DAILY_TIPS_CHANNEL_IDS, GAME_CHANNELS_IDS, TEST_USER_IDS
 
+# Schedules are local wall-clock fire times (see utils/task_scheduler.Schedule).
+# A run missed while the bot was down or busy is caught up, once, if it is
+# less than catchup_minutes overdue.
 TASK_CONFIG = {
     'randomquestions': {
         'enabled': True,
         'test_user_ids': TEST_USER_IDS,
-        'loop_minutes': 30,
         'allow_multiple_daily': False,
         'schedule': {
             'type': 'all_hours',
-            'minute_window': 60  # run within first 30 minutes of each hour
+            'every_minutes': 30,
+            'catchup_minutes': 30
+        }
+    },
+    'activityaggregator': {
+        'enabled': True,
+        'schedule': {
+            'type': 'all_hours',  # fold pending ledger events every 10 minutes
+            'every_minutes': 10,
+            'catchup_minutes': 10
         }
     },
     'dailytips': {
         'enabled': True,
         'channel_ids': DAILY_TIPS_CHANNEL_IDS,
-        'loop_minutes': 30,
         'schedule': {
-            'type': 'specific_hours',  # runs once per day
+            'type': 'daily',
             'hours': [10],    # run at 10 AM
-            'minute_window': 30  # run within first 30 minutes
+            'catchup_minutes': 30  # still send it if the bot comes up by 10:30
+        }
+    },
+    'tipproducer': {
+        'enabled': True,
+        'buffer_size': 7,  # tips kept ready for the daily broadcast
+        'attempts_per_tip': 3,  # generations allowed per missing tip before giving up until the next run
+        'schedule': {
+            'type': 'specific_hours',
+            'hours': [3],  # off-peak
+            'catchup_minutes': 240
         }
     },
     'gameinvites': {
         'enabled': True,
         'channel_ids': GAME_CHANNELS_IDS,
-        'loop_minutes': 15,
         'schedule': {
             'type': 'specific_hours',
             'hours': [12, 17, 18, 19, 22],  # specific hours to run
-            'minute_window': 60,  # run any time within the hour
-            'interval': 1  # minutes
+            'catchup_minutes': 60  # run any time within the hour
         },
         'game_settings': {
             'player_wait_time': 60,  # seconds to wait for players
@@ -38,4 +55,4 @@ TASK_CONFIG = {
             'min_players': 3
         }
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ActivityLedger:
+    """
+    Append-only JSONL log of coin-earning activity events.
+    Events are identified by their byte offset in the ledger file; a checkpoint
+    records how far the aggregator has folded the log into profiles, and every
+    coin award is written to an audit log. Lines that can't be parsed (a crash
+    mid-append) are moved to a quarantine log and skipped.
+    """
+    DATA_DIR = Path("data/user_data")
+    RECORDS_DIR = DATA_DIR / "records"
+
+    LEDGER_FILE = RECORDS_DIR / "activity_ledger.jsonl"
+    CHECKPOINT_FILE = RECORDS_DIR / "activity_ledger_checkpoint.json"
+    AUDIT_FILE = RECORDS_DIR / "coin_audit.jsonl"
+    QUARANTINE_FILE = RECORDS_DIR / "activity_ledger_quarantine.jsonl"
+
+    def __init__(self):
+        self.RECORDS_DIR.mkdir(parents=True, exist_ok=True)
+
+    def append(self, user_id: str, activity: str, **details) -> Dict[str, Any]:
+        """Append one activity event; this is the only work done on the hot path"""
+        event = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'user_id': str(user_id),
+            'activity': activity,
+            **details
+        }
+        with open(self.LEDGER_FILE, 'a') as f:
+            f.write(json.dumps(event) + '\n')
+        logger.debug(f"Recorded activity event: {event}")
+        return event
+
+    def read_pending(self, max_events: int = 10000) -> Tuple[List[Dict[str, Any]], int]:
+        """Return up to max_events unfolded events (each tagged with its 'offset') and the offset after them"""
+        start = self.get_checkpoint()
+        events = []
+        try:
+            with open(self.LEDGER_FILE, 'rb') as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Partially written event; pick it up next time
+                    if len(events) >= max_events:
+                        break
+                    try:
+                        event = json.loads(line)
+                        if not isinstance(event, dict):
+                            raise ValueError(f"expected an object, got {type(event).__name__}")
+                    except ValueError as e:  # Includes json.JSONDecodeError and bad UTF-8
+                        # Skip it, or it would stop every later event from being folded
+                        logger.error(f"Quarantining unreadable ledger line at offset {offset}: {e}")
+                        self._quarantine(offset, line, str(e))
+                    else:
+                        event['offset'] = offset
+                        events.append(event)
+                    offset += len(line)
+        except FileNotFoundError:
+            return [], start
+        return events, offset
+
+    def _quarantine(self, offset: int, line: bytes, error: str) -> None:
+        entry = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'offset': offset,
+            'line': line.decode('utf-8', errors='replace').rstrip('\n'),
+            'error': error
+        }
+        with open(self.QUARANTINE_FILE, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def get_checkpoint(self) -> int:
+        try:
+            with open(self.CHECKPOINT_FILE, 'r') as f:
+                return json.load(f)['offset']
+        except FileNotFoundError:
+            return 0
+
+    def commit(self, offset: int) -> None:
+        """Mark every event before offset as folded"""
+        tmp_file = self.CHECKPOINT_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'offset': offset, 'updated_at': datetime.now().isoformat(timespec='seconds')}, f)
+        os.replace(tmp_file, self.CHECKPOINT_FILE)
+
+    def write_audit(self, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        with open(self.AUDIT_FILE, 'a') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, AsyncIterator
 
 class DataManager(ABC):
     @abstractmethod
@@ -10,6 +10,29 @@ class DataManager(ABC):
     async def save_user_profile(self, profile: Dict[str, Any]) -> None:
         pass
 
+    @abstractmethod
+    async def get_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several profiles in one pass, keyed by user_id (new profiles for unknown ids)"""
+        pass
+
+    @abstractmethod
+    async def save_profiles(self, profiles: List[Dict[str, Any]]) -> None:
+        """Insert or update several profiles in one pass"""
+        pass
+
+    @abstractmethod
+    def iter_profiles(self) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every stored profile (used for full rebuilds such as the leaderboard)"""
+        pass
+
     @abstractmethod
     async def get_level_config(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    async def get_activity_config(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    async def get_streak_config(self) -> Dict[str, Any]:
         pass
\ No newline at end of file
@@ -1,8 +1,10 @@
 import json
 import logging
+import os
+import time
 from pathlib import Path
 from .data_manager import DataManager
-from typing import Dict, Any
+from typing import Dict, Any, List, AsyncIterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -13,14 +15,30 @@ class FileDataManager(DataManager):
 
     USER_PROFILES_FILE = RECORDS_DIR / "user_profiles.jsonl"
     LEVEL_CONFIG_FILE = CONFIG_DIR / "level_config.json"
+    ACTIVITY_CONFIG_FILE = CONFIG_DIR / "activity_config.json"
+    STREAK_CONFIG_FILE = CONFIG_DIR / "streak_config.json"
 
-    def __init__(self):
+    # How often (seconds) a cached config checks its file mtime
+    CONFIG_CHECK_SECONDS = 60
+
+    def __init__(self, data_dir: Optional[Path] = None):
         logger.info(f"Initializing FileDataManager")
+        if data_dir is not None:
+            # Point this instance at another data directory (e.g. for benchmarks)
+            self.DATA_DIR = Path(data_dir)
+            self.RECORDS_DIR = self.DATA_DIR / "records"
+            self.CONFIG_DIR = self.DATA_DIR / "configs"
+            self.USER_PROFILES_FILE = self.RECORDS_DIR / "user_profiles.jsonl"
+            self.LEVEL_CONFIG_FILE = self.CONFIG_DIR / "level_config.json"
+            self.ACTIVITY_CONFIG_FILE = self.CONFIG_DIR / "activity_config.json"
+            self.STREAK_CONFIG_FILE = self.CONFIG_DIR / "streak_config.json"
         logger.debug(f"RECORDS_DIR: {self.RECORDS_DIR}")
         logger.debug(f"CONFIG_DIR: {self.CONFIG_DIR}")
         logger.debug(f"USER_PROFILES_FILE: {self.USER_PROFILES_FILE}")
         logger.debug(f"LEVEL_CONFIG_FILE: {self.LEVEL_CONFIG_FILE}")
 
+        self._config_cache: Dict[Path, Dict[str, Any]] = {}
+
         self.RECORDS_DIR.mkdir(parents=True, exist_ok=True)
         self.CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         logger.info("Directories created/verified")
@@ -38,20 +56,10 @@ class FileDataManager(DataManager):
                         logger.debug(f"Profile data: {profile}")
                         return profile
             logger.info(f"No existing profile found for user_id: {user_id}. Creating new profile.")
-            return {
-                'user_id': user_id,
-                'total_coins': 0,
-                'current_streak': {'count': 0, 'last_activity_date': '1970-01-01'},
-                'last_check_in_date': '1970-01-01'
-            }
+            return self._new_profile(user_id)
         except FileNotFoundError:
             logger.warning(f"User profiles file not found. Creating new profile for user_id: {user_id}")
-            return {
-                'user_id': user_id,
-                'total_coins': 0,
-                'current_streak': {'count': 0, 'last_activity_date': '1970-01-01'},
-                'last_check_in_date': '1970-01-01'
-            }
+            return self._new_profile(user_id)
         except json.JSONDecodeError as e:
             logger.error(f"JSON decoding error in user profiles file: {e}")
             raise
@@ -113,19 +121,114 @@ class FileDataManager(DataManager):
         except Exception as e:
             logger.error(f"Error verifying saved profile: {e}")
 
+    async def get_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        wanted = {str(user_id) for user_id in user_ids}
+        logger.info(f"Getting {len(wanted)} user profiles in one pass")
+        profiles = {}
+        try:
+            with open(self.USER_PROFILES_FILE, 'r') as f:
+                for line in f:
+                    profile = json.loads(line)
+                    if profile['user_id'] in wanted:
+                        profiles[profile['user_id']] = profile
+                        if len(profiles) == len(wanted):
+                            break
+        except FileNotFoundError:
+            logger.warning("User profiles file not found. Creating new profiles for all requested users.")
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decoding error in user profiles file: {e}")
+            raise
+
+        missing = wanted - profiles.keys()
+        if missing:
+            logger.info(f"No existing profile found for {len(missing)} user(s). Creating new profiles.")
+            for user_id in missing:
+                profiles[user_id] = self._new_profile(user_id)
+        return profiles
+
+    async def save_profiles(self, profiles: List[Dict[str, Any]]) -> None:
+        pending = {str(p['user_id']): p for p in profiles}
+        if not pending:
+            return
+        logger.info(f"Saving {len(pending)} user profiles in one pass")
+
+        tmp_file = self.USER_PROFILES_FILE.with_suffix('.jsonl.tmp')
+        written = 0
+        try:
+            with open(tmp_file, 'w') as out:
+                try:
+                    with open(self.USER_PROFILES_FILE, 'r') as f:
+                        for line in f:
+                            user_id = json.loads(line)['user_id']
+                            profile = pending.pop(user_id, None)
+                            if profile is not None:
+                                line = json.dumps(profile) + '\n'
+                            elif not line.endswith('\n'):
+                                line += '\n'
+                            out.write(line)
+                            written += 1
+                except FileNotFoundError:
+                    logger.warning("User profiles file not found. Will create new file.")
+                for profile in pending.values():
+                    out.write(json.dumps(profile) + '\n')
+                    written += 1
+            tmp_file.replace(self.USER_PROFILES_FILE)
+            logger.info(f"Successfully saved {written} profiles to file")
+        except Exception as e:
+            logger.error(f"Error saving user profiles to file: {e}")
+            tmp_file.unlink(missing_ok=True)
+            raise
+
+    async def iter_profiles(self) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            with open(self.USER_PROFILES_FILE, 'r') as f:
+                for line in f:
+                    yield json.loads(line)
+        except FileNotFoundError:
+            logger.warning("User profiles file not found. No profiles to iterate.")
+
+    def _new_profile(self, user_id: str) -> Dict[str, Any]:
+        return {
+            'user_id': user_id,
+            'total_coins': 0,
+            'current_streak': {'count': 0, 'last_activity_date': '1970-01-01'},
+            'last_check_in_date': '1970-01-01'
+        }
+
     async def get_level_config(self) -> Dict[str, Any]:
-        logger.info("Getting level configuration")
+        return self._load_config(self.LEVEL_CONFIG_FILE)
+
+    async def get_activity_config(self) -> Dict[str, Any]:
+        return self._load_config(self.ACTIVITY_CONFIG_FILE)
+
+    async def get_streak_config(self) -> Dict[str, Any]:
+        return self._load_config(self.STREAK_CONFIG_FILE)
+
+    def _load_config(self, config_file: Path) -> Dict[str, Any]:
+        """Return a config file's contents, re-reading it only when its mtime changes"""
+        cached = self._config_cache.get(config_file)
+        now = time.monotonic()
+        if cached and now - cached['checked_at'] < self.CONFIG_CHECK_SECONDS:
+            return cached['config']
+
         try:
-            with open(self.LEVEL_CONFIG_FILE, 'r') as f:
+            mtime = os.stat(config_file).st_mtime_ns
+            if cached and mtime == cached['mtime']:
+                cached['checked_at'] = now
+                return cached['config']
+
+            logger.info(f"Loading configuration from {config_file}")
+            with open(config_file, 'r') as f:
                 config = json.load(f)
-                logger.debug(f"Loaded level config: {config}")
-                return config
+                logger.debug(f"Loaded config: {config}")
+            self._config_cache[config_file] = {'config': config, 'mtime': mtime, 'checked_at': now}
+            return config
         except FileNotFoundError:
-            logger.error(f"Level config file not found: {self.LEVEL_CONFIG_FILE}")
+            logger.error(f"Config file not found: {config_file}")
             raise
         except json.JSONDecodeError as e:
-            logger.error(f"JSON decoding error in level config file: {e}")
+            logger.error(f"JSON decoding error in config file {config_file}: {e}")
             raise
         except Exception as e:
-            logger.error(f"Unexpected error loading level config: {e}")
+            logger.error(f"Unexpected error loading config {config_file}: {e}")
             raise
\ No newline at end of file
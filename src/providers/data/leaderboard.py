@@ -0,0 +1,103 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+
+logger = logging.getLogger(__name__)
+
+
+class CoinLeaderboard:
+    """
+    Order-statistics index of users by total coins.
+    Entries are stored as (-coins, user_id) in SortedLists, so top-K and rank
+    queries are logarithmic. The global partition holds every known user;
+    per-guild partitions only hold that guild's members.
+    """
+
+    GLOBAL = 'global'
+
+    def __init__(self, scores: Iterable[Tuple[str, int]] = ()):
+        self._scores: Dict[str, int] = {str(user_id): coins for user_id, coins in scores}
+        self._partitions: Dict[str, SortedList] = {
+            self.GLOBAL: SortedList((-coins, user_id) for user_id, coins in self._scores.items())
+        }
+        self._memberships: Dict[str, Set[str]] = {}  # user_id -> partitions besides global
+        logger.info(f"Built coin leaderboard with {len(self._scores)} users")
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def coins(self, user_id: str) -> Optional[int]:
+        return self._scores.get(str(user_id))
+
+    def update(self, user_id: str, coins: int) -> None:
+        """Move a user to their new coin total in every partition they belong to"""
+        user_id = str(user_id)
+        old_coins = self._scores.get(user_id)
+        if old_coins == coins:
+            return
+        self._scores[user_id] = coins
+
+        for partition in self._partitions_for(user_id):
+            entries = self._partitions[partition]
+            if old_coins is not None:
+                entries.discard((-old_coins, user_id))
+            entries.add((-coins, user_id))
+
+    def has_partition(self, partition: str) -> bool:
+        return partition in self._partitions
+
+    def build_partition(self, partition: str, member_ids: Iterable[str]) -> None:
+        """(Re)build a partition, e.g. a guild, from its current member ids"""
+        self.drop_partition(partition)
+        entries = []
+        for user_id in map(str, member_ids):
+            self._memberships.setdefault(user_id, set()).add(partition)
+            if user_id in self._scores:
+                entries.append((-self._scores[user_id], user_id))
+        self._partitions[partition] = SortedList(entries)
+        logger.info(f"Built leaderboard partition {partition} with {len(entries)} ranked members")
+
+    def drop_partition(self, partition: str) -> None:
+        if partition == self.GLOBAL or self._partitions.pop(partition, None) is None:
+            return
+        for partitions in self._memberships.values():
+            partitions.discard(partition)
+
+    def add_member(self, partition: str, user_id: str) -> None:
+        user_id = str(user_id)
+        if partition not in self._partitions:
+            return
+        self._memberships.setdefault(user_id, set()).add(partition)
+        if user_id in self._scores:
+            self._partitions[partition].add((-self._scores[user_id], user_id))
+
+    def remove_member(self, partition: str, user_id: str) -> None:
+        user_id = str(user_id)
+        if partition not in self._partitions:
+            return
+        self._memberships.get(user_id, set()).discard(partition)
+        if user_id in self._scores:
+            self._partitions[partition].discard((-self._scores[user_id], user_id))
+
+    def top(self, k: int, partition: str = GLOBAL) -> List[Tuple[str, int]]:
+        """Return the k richest users of a partition as (user_id, coins)"""
+        entries = self._partitions.get(partition)
+        if not entries:
+            return []
+        return [(user_id, -neg_coins) for neg_coins, user_id in entries.islice(0, k)]
+
+    def rank(self, user_id: str, partition: str = GLOBAL) -> Optional[Tuple[int, int]]:
+        """
+        Return (rank, partition size) for a user, or None if unranked.
+        Users with equal coins share the same rank.
+        """
+        user_id = str(user_id)
+        entries = self._partitions.get(partition)
+        coins = self._scores.get(user_id)
+        if entries is None or coins is None or (-coins, user_id) not in entries:
+            return None
+        return entries.bisect_left((-coins,)) + 1, len(entries)
+
+    def _partitions_for(self, user_id: str) -> List[str]:
+        return [self.GLOBAL, *self._memberships.get(user_id, ())]
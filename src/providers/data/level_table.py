@@ -0,0 +1,22 @@
+import bisect
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class LevelTable:
+    """Level definitions sorted by coin threshold, resolved with bisect"""
+
+    def __init__(self, level_config: Dict[str, Any]):
+        self.levels: List[Dict[str, Any]] = sorted(level_config['levels'], key=lambda level: level['coins_required'])
+        if not self.levels:
+            raise ValueError("Level config must define at least one level")
+        self.thresholds: List[int] = [level['coins_required'] for level in self.levels]
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def resolve(self, coins: int) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Return (current_level, next_level) for a coin total; next_level is None at max level"""
+        index = max(bisect.bisect_right(self.thresholds, coins) - 1, 0)
+        current_level = self.levels[index]
+        next_level = self.levels[index + 1] if index + 1 < len(self.levels) else None
+        return current_level, next_level
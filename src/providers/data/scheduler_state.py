@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class SchedulerState:
+    """
+    Per-task scheduler state (last fire time, next due time, counters and
+    duration stats) kept in one small JSON file so restarts neither repeat
+    nor lose a scheduled run. Every save rewrites the file atomically.
+    """
+    DATA_DIR = Path("data/user_data")
+    RECORDS_DIR = DATA_DIR / "records"
+
+    STATE_FILE = RECORDS_DIR / "scheduler_state.json"
+
+    _shared: Optional['SchedulerState'] = None
+
+    @classmethod
+    def shared(cls) -> 'SchedulerState':
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self.RECORDS_DIR.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.STATE_FILE, 'r') as f:
+                return json.load(f).get('tasks', {})
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            # Worst case a task runs as after a fresh install; never block startup on it
+            logger.error(f"Unreadable scheduler state {self.STATE_FILE}, starting fresh: {e}")
+            return {}
+
+    def get(self, task_name: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._tasks.get(task_name, {}))
+
+    def save(self, task_name: str, state: Dict[str, Any]) -> None:
+        """Replace one task's state and write the file; blocking, so run it off the event loop"""
+        with self._lock:
+            self._tasks[task_name] = state
+            tmp_file = self.STATE_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'tasks': self._tasks}, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.STATE_FILE)
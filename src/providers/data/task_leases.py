@@ -0,0 +1,174 @@
+import importlib
+import logging
+import os
+import socket
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Identifies this bot process among replicas sharing a lease backend
+REPLICA_ID = os.getenv('REPLICA_ID') or f"{socket.gethostname()}:{os.getpid()}"
+
+# Claimed runs are kept this long so a late replica can't repeat them
+RUN_HISTORY_SECONDS = 7 * 24 * 3600
+
+class LeaseBackend(ABC):
+    """
+    Leases let exactly one bot replica execute each scheduled run. A lease is
+    held by one replica until it expires; every change of holder increments the
+    lease's fencing token, so a replica that stalled past its lease can tell it
+    was superseded. All methods block, so call them off the event loop.
+    """
+
+    @abstractmethod
+    def acquire(self, name: str, holder: str, ttl_seconds: float) -> Optional[int]:
+        """Take (or extend our own) lease; returns its fencing token, or None if another replica holds it"""
+        pass
+
+    @abstractmethod
+    def renew(self, name: str, holder: str, token: int, ttl_seconds: float) -> bool:
+        """Extend a held lease; False if it expired or was taken over"""
+        pass
+
+    @abstractmethod
+    def release(self, name: str, holder: str, token: int) -> None:
+        pass
+
+    @abstractmethod
+    def claim_run(self, name: str, fire_time: str, holder: str, token: int) -> bool:
+        """
+        Record that the lease holder runs the scheduled fire_time. False if that
+        run was already claimed or the token is no longer current.
+        """
+        pass
+
+class SqliteLeaseBackend(LeaseBackend):
+    """Lease table in a SQLite file; replicas on one host or a shared volume coordinate through it"""
+    DATA_DIR = Path("data/user_data")
+    RECORDS_DIR = DATA_DIR / "records"
+
+    LEASE_DB = RECORDS_DIR / "task_leases.db"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS leases (
+        name TEXT PRIMARY KEY,
+        holder TEXT NOT NULL,
+        token INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS runs (
+        name TEXT NOT NULL,
+        fire_time TEXT NOT NULL,
+        holder TEXT NOT NULL,
+        token INTEGER NOT NULL,
+        claimed_at REAL NOT NULL,
+        PRIMARY KEY (name, fire_time)
+    );
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path is not None else self.LEASE_DB
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; writes take the database lock up front with BEGIN IMMEDIATE
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def _current(self, conn: sqlite3.Connection, name: str):
+        return conn.execute("SELECT holder, token, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+
+    def acquire(self, name: str, holder: str, ttl_seconds: float) -> Optional[int]:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = self._current(conn, name)
+            if row is None:
+                token = 1
+                conn.execute("INSERT INTO leases (name, holder, token, expires_at) VALUES (?, ?, ?, ?)",
+                             (name, holder, token, now + ttl_seconds))
+            elif row[0] == holder and row[2] > now:
+                token = row[1]
+                conn.execute("UPDATE leases SET expires_at = ? WHERE name = ?", (now + ttl_seconds, name))
+            elif row[2] <= now:
+                token = row[1] + 1
+                conn.execute("UPDATE leases SET holder = ?, token = ?, expires_at = ? WHERE name = ?",
+                             (holder, token, now + ttl_seconds, name))
+            else:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute("COMMIT")
+            return token
+        finally:
+            conn.close()
+
+    def renew(self, name: str, holder: str, token: int, ttl_seconds: float) -> bool:
+        conn = self._connect()
+        try:
+            now = time.time()
+            cursor = conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE name = ? AND holder = ? AND token = ? AND expires_at > ?",
+                (now + ttl_seconds, name, holder, token, now)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def release(self, name: str, holder: str, token: int) -> None:
+        conn = self._connect()
+        try:
+            # Expire rather than delete, so the next holder's token keeps increasing
+            conn.execute("UPDATE leases SET expires_at = 0 WHERE name = ? AND holder = ? AND token = ?",
+                         (name, holder, token))
+        finally:
+            conn.close()
+
+    def claim_run(self, name: str, fire_time: str, holder: str, token: int) -> bool:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = self._current(conn, name)
+            if row is None or row[0] != holder or row[1] != token or row[2] <= now:
+                conn.execute("ROLLBACK")
+                return False
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO runs (name, fire_time, holder, token, claimed_at) VALUES (?, ?, ?, ?, ?)",
+                (name, fire_time, holder, token, now)
+            )
+            conn.execute("DELETE FROM runs WHERE claimed_at < ?", (now - RUN_HISTORY_SECONDS,))
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+LEASE_BACKENDS: Dict[str, Callable[[], LeaseBackend]] = {
+    'sqlite': SqliteLeaseBackend,
+}
+
+def create_lease_backend(name: str) -> LeaseBackend:
+    """A registered backend name, or 'package.module:ClassName' for a LeaseBackend subclass"""
+    if name in LEASE_BACKENDS:
+        return LEASE_BACKENDS[name]()
+    if ':' not in name:
+        raise ValueError(f"Unknown lease backend '{name}'. Use one of {sorted(LEASE_BACKENDS)} or 'module:ClassName'.")
+    module_name, class_name = name.split(':', 1)
+    return getattr(importlib.import_module(module_name), class_name)()
+
+_backend: Optional[LeaseBackend] = None
+
+def get_lease_backend() -> LeaseBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_lease_backend(os.getenv('LEASE_BACKEND', 'sqlite'))
+        logger.info(f"Scheduled task leases use {_backend.__class__.__name__} as replica {REPLICA_ID}")
+    return _backend
@@ -1,12 +1,34 @@
+import asyncio
 import logging
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .data.activity_ledger import ActivityLedger
 from .data.data_manager import DataManager
 from .data.file_data_manager import FileDataManager
+from .data.leaderboard import CoinLeaderboard
+from .data.level_table import LevelTable
+from ..utils.executors import get_executor
 
 logger = logging.getLogger(__name__)
 
+# Users with unsaved question deck cursors that trigger a batch write
+DECK_FLUSH_BATCH = int(os.getenv('DECK_FLUSH_BATCH', '20'))
+
 class DataProvider:
+    # Shared by every DataProvider in the process so all coin changes land in one index
+    _leaderboard: Optional[CoinLeaderboard] = None
+    _leaderboard_build: Optional[asyncio.Future] = None
+    # Coin totals saved while the first scan runs, applied once it finishes
+    _pending_scores: Dict[str, int] = {}
+    # user_id -> question deck cursors, drawn from in memory and written back in batches
+    _question_decks: Dict[str, Dict[str, List[int]]] = {}
+    _dirty_decks: Set[str] = set()
+
     def __init__(self):
         self.data_manager = self._initialize_data_manager()
+        self.activity_ledger = ActivityLedger()
+        self._level_config = None
+        self._level_table = None
         logger.info(f"Initialized DataProvider with {self.data_manager.__class__.__name__}")
 
     def _initialize_data_manager(self) -> DataManager:
@@ -17,6 +39,115 @@ class DataProvider:
 
     async def save_user_profile(self, profile):
         await self.data_manager.save_user_profile(profile)
+        self._update_leaderboard([profile])
+
+    async def get_profiles(self, user_ids):
+        return await self.data_manager.get_profiles(user_ids)
+
+    async def save_profiles(self, profiles):
+        await self.data_manager.save_profiles(profiles)
+        self._update_leaderboard(profiles)
+
+    async def get_question_decks(self, user_id: str) -> Dict[str, List[int]]:
+        """
+        The user's deck cursors, kept in memory so a draw doesn't rewrite the profile
+        store. Callers draw from the returned dict in place, then call mark_decks_dirty.
+        """
+        user_id = str(user_id)
+        decks = DataProvider._question_decks.get(user_id)
+        if decks is None:
+            profile = await self.data_manager.get_user_profile(user_id)
+            decks = DataProvider._question_decks.setdefault(user_id, profile.get('question_decks', {}))
+        return decks
+
+    async def mark_decks_dirty(self, user_id: str) -> None:
+        """
+        Record a draw from the user's decks. The change is saved by flush_question_decks
+        (at session end) or here, once DECK_FLUSH_BATCH users have unsaved changes.
+        """
+        DataProvider._dirty_decks.add(str(user_id))
+        if len(DataProvider._dirty_decks) >= DECK_FLUSH_BATCH:
+            await self.flush_question_decks()
+
+    async def flush_question_decks(self, user_ids: Optional[Iterable[str]] = None) -> None:
+        """Save changed deck cursors (all, or just user_ids') into their profiles in one write"""
+        pending = set(DataProvider._dirty_decks)
+        if user_ids is not None:
+            pending &= {str(user_id) for user_id in user_ids}
+        if not pending:
+            return
+        DataProvider._dirty_decks -= pending
+        try:
+            profiles = await self.data_manager.get_profiles(list(pending))
+            for user_id, profile in profiles.items():
+                profile['question_decks'] = DataProvider._question_decks[user_id]
+            await self.save_profiles(list(profiles.values()))
+        except Exception:
+            DataProvider._dirty_decks |= pending
+            raise
+        # Saved cursors are reloaded from the profile on next use
+        for user_id in pending - DataProvider._dirty_decks:
+            DataProvider._question_decks.pop(user_id, None)
 
     async def get_level_config(self):
-        return await self.data_manager.get_level_config()
\ No newline at end of file
+        return await self.data_manager.get_level_config()
+
+    async def get_activity_config(self):
+        return await self.data_manager.get_activity_config()
+
+    async def get_streak_config(self):
+        return await self.data_manager.get_streak_config()
+
+    async def record_activity(self, user_id: str, activity: str, **details):
+        """Append a coin-earning event; coins are credited when the aggregator folds the ledger"""
+        return await get_executor('disk').run(self.activity_ledger.append, user_id, activity, **details)
+
+    async def get_level_table(self) -> LevelTable:
+        """Level table rebuilt only when the data manager hands back a new level config"""
+        level_config = await self.data_manager.get_level_config()
+        if level_config is not self._level_config:
+            self._level_table = LevelTable(level_config)
+            self._level_config = level_config
+        return self._level_table
+
+    async def get_leaderboard(self) -> CoinLeaderboard:
+        """
+        Coin leaderboard, built from one full profile scan on first use and kept current
+        on every save. The scan runs on the disk executor, and concurrent first callers
+        share it.
+        """
+        if DataProvider._leaderboard is None:
+            if DataProvider._leaderboard_build is None:
+                DataProvider._leaderboard_build = asyncio.ensure_future(self._build_leaderboard())
+            try:
+                await asyncio.shield(DataProvider._leaderboard_build)
+            except Exception:
+                DataProvider._leaderboard_build = None
+                raise
+        return DataProvider._leaderboard
+
+    async def _build_leaderboard(self) -> None:
+        scores = await get_executor('disk').run(self._scan_scores)
+        board = CoinLeaderboard(scores)
+        for user_id, coins in DataProvider._pending_scores.items():
+            board.update(user_id, coins)
+        DataProvider._pending_scores.clear()
+        DataProvider._leaderboard = board
+        logger.info(f"Built coin leaderboard from {len(scores)} profiles")
+
+    def _scan_scores(self) -> List[Tuple[str, int]]:
+        """Every profile's coin total (runs in a disk worker thread)"""
+        async def collect():
+            return [(profile['user_id'], profile.get('total_coins', 0))
+                    async for profile in self.data_manager.iter_profiles()]
+        # iter_profiles only does blocking reads, so it can run on this thread's own loop
+        return asyncio.run(collect())
+
+    def _update_leaderboard(self, profiles):
+        if DataProvider._leaderboard is None:
+            if DataProvider._leaderboard_build is not None:
+                for profile in profiles:
+                    DataProvider._pending_scores[profile['user_id']] = profile.get('total_coins', 0)
+            return
+        for profile in profiles:
+            DataProvider._leaderboard.update(profile['user_id'], profile.get('total_coins', 0))
\ No newline at end of file
@@ -0,0 +1,122 @@
+import io
+import json
+import os
+import random
+import time
+from typing import Any, Dict
+
+from .prompt_manager import estimate_tokens
+
+# Canned completions shaped like real model output so the response parsers run unchanged
+EVALUATION_COMPLETION = """Evaluation: The candidate gave a structured answer with a relevant example, but the impact of their actions was only described in general terms.
+Need more information: Yes
+Follow-up needed: Yes
+Follow-up question: What measurable outcome did your approach lead to?"""
+
+SUMMARY_COMPLETION = """Overall Assessment: The candidate communicated clearly and reasoned through each question, with room to go deeper on trade-offs.
+
+Strengths:
+- Clear, well-structured answers
+- Good use of concrete examples
+- Receptive to follow-up questions
+
+Areas for Improvement:
+- Quantify the impact of past work
+- Discuss alternatives before committing to a design
+
+Key Examples:
+1. Explained the approach to the first question step by step
+2. Adjusted the answer after the follow-up question
+
+Final Decision: Meets the bar for this level
+
+Additional Comments: Practice summarising outcomes with numbers."""
+
+RESUME_COMPLETION = """Overall Assessment:
+A solid resume with relevant experience that undersells measurable results.
+
+Strengths:
+- Relevant technical experience
+- Clear chronological layout
+
+Improvements Needed:
+- Lead each bullet with an action verb and a result
+- Remove duplicated skills
+
+Refined Resume:
+Software Engineer, Example Corp
+- Cut API latency by 40% by introducing request batching
+
+Additional Tips:
+- Tailor the summary to each role"""
+
+SECTION_COMPLETION = """Strengths:
+- Specific, relevant content
+- Easy to scan
+
+Improvements Needed:
+- Quantify results where possible
+- Start each bullet with a strong verb
+
+Refined Section:
+Senior Engineer, Example Corp
+- Led a team of four to ship a billing service processing 2M transactions a day"""
+
+GENERIC_COMPLETION = """1. Direct Answer: Focus on a specific example and the result you achieved.
+2. Explanation: Interviewers look for ownership, clarity and impact.
+3. Tips or Strategies: Use the STAR format and keep each part brief.
+4. Example: Describe a project, your role, the actions you took and the outcome.
+5. Encouragement: With a little practice this becomes second nature."""
+
+class FakeBedrockRuntime:
+    """
+    Stand-in for the bedrock-runtime client, selected with LLM_BACKEND=fake.
+    Returns canned completions after a simulated delay so prompt changes and
+    the surrounding code can be benchmarked offline without AWS credentials.
+
+    FAKE_LLM_LATENCY_MS         fixed time to first token (default 300)
+    FAKE_LLM_MS_PER_INPUT_TOKEN prompt processing time per token (default 0.05)
+    FAKE_LLM_MS_PER_OUTPUT_TOKEN generation time per token (default 15)
+    FAKE_LLM_JITTER             relative random variation of the delay (default 0.1)
+    """
+
+    def __init__(self):
+        self.latency_ms = float(os.getenv('FAKE_LLM_LATENCY_MS', 300))
+        self.ms_per_input_token = float(os.getenv('FAKE_LLM_MS_PER_INPUT_TOKEN', 0.05))
+        self.ms_per_output_token = float(os.getenv('FAKE_LLM_MS_PER_OUTPUT_TOKEN', 15))
+        self.jitter = float(os.getenv('FAKE_LLM_JITTER', 0.1))
+
+    @staticmethod
+    def _completion_for(prompt: str) -> str:
+        if "Follow-up needed:" in prompt:
+            return EVALUATION_COMPLETION
+        if "Final Decision:" in prompt:
+            return SUMMARY_COMPLETION
+        if "Refined Section:" in prompt:
+            return SECTION_COMPLETION
+        if "Refined Resume:" in prompt or "Additional Tips:" in prompt:
+            return RESUME_COMPLETION
+        return GENERIC_COMPLETION
+
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        request = json.loads(body)
+        prompt = request.get("prompt", "")
+        completion = self._completion_for(prompt)
+
+        # Never return more than the caller allowed
+        max_chars = request.get("max_tokens_to_sample", 1000) * 4
+        completion = completion[:max_chars]
+
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(completion)
+        delay_ms = (self.latency_ms + input_tokens * self.ms_per_input_token
+                    + output_tokens * self.ms_per_output_token)
+        time.sleep(delay_ms * random.uniform(1 - self.jitter, 1 + self.jitter) / 1000)
+
+        return {
+            "ResponseMetadata": {"HTTPHeaders": {
+                "x-amzn-bedrock-input-token-count": str(input_tokens),
+                "x-amzn-bedrock-output-token-count": str(output_tokens),
+            }},
+            "body": io.BytesIO(json.dumps({"completion": completion, "stop_reason": "stop_sequence"}).encode()),
+        }
@@ -1,16 +1,52 @@
 import os
 import logging
 import json
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
 from .prompt_manager import PromptManager
+from .fake_bedrock import FakeBedrockRuntime
+from ..utils.executors import get_executor
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
+class TokenUsage:
+    """Tokens used by the LLM calls made within one usage_scope()"""
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def add(self, usage: Dict[str, int]) -> None:
+        # Concurrent calls (map-reduce sections) report from several executor threads
+        with self._lock:
+            self.input_tokens += usage['input_tokens']
+            self.output_tokens += usage['output_tokens']
+            self.calls += 1
+
+_usage: ContextVar[Optional[TokenUsage]] = ContextVar('llm_usage', default=None)
+
+@contextmanager
+def usage_scope() -> Iterator[TokenUsage]:
+    """
+    Total the token usage of every LLM call made in this context, including calls
+    from tasks it starts and jobs it sends to a workload executor.
+    """
+    usage = TokenUsage()
+    reset = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(reset)
+
 class LLMProvider:
     """
     Provider for LLM services using AWS Bedrock.
@@ -22,10 +58,14 @@ class LLMProvider:
         self.prompt_manager = PromptManager()
         logger.info("PromptManager initialized successfully")
 
-        # Initialize AWS Bedrock client
-        self.bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime'
-        )
+        # Initialize AWS Bedrock client (LLM_BACKEND=fake serves canned responses for offline benchmarks)
+        if os.getenv('LLM_BACKEND', 'bedrock') == 'fake':
+            self.bedrock_runtime = FakeBedrockRuntime()
+            logger.warning("Using fake LLM backend; responses are canned")
+        else:
+            self.bedrock_runtime = boto3.client(
+                service_name='bedrock-runtime'
+            )
 
         # Default model configuration
         self.default_model_id = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-instant-1.2')
@@ -68,6 +108,17 @@ class LLMProvider:
 
             logger.debug(f"Raw response from Bedrock: {response}")
 
+            # Bedrock reports token usage in the response headers
+            headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+            usage = {
+                'input_tokens': int(headers.get('x-amzn-bedrock-input-token-count', 0)),
+                'output_tokens': int(headers.get('x-amzn-bedrock-output-token-count', 0))
+            }
+            logger.info(f"LLM usage for {model_id}: {usage}")
+            scope = _usage.get()
+            if scope is not None:
+                scope.add(usage)
+
             # Read the response body
             response_body = json.loads(response.get('body').read())
             logger.debug(f"Parsed response body: {response_body}")
@@ -76,7 +127,7 @@ class LLMProvider:
             if "anthropic.claude" in model_id:
                 content = response_body.get('completion', '')
                 logger.debug(f"Extracted content: {content}")
-                return {"content": content}
+                return {"content": content, "usage": usage}
             else:
                 return {"content": "Unsupported model response"}
 
@@ -90,7 +141,7 @@ class LLMProvider:
         """
         history_prompt = self._format_question_history(question_history)
 
-        prompt = self.prompt_manager.format_prompt(
+        rendered = self.prompt_manager.render(
             "evaluation",
             interview_type=interview_type,
             level=level,
@@ -98,8 +149,9 @@ class LLMProvider:
             current_question=current_question,
             current_response=current_response
         )
+        prompt = rendered.text
 
-        logger.debug(f"Evaluation prompt: {prompt}")
+        logger.debug(f"Evaluation prompt (~{rendered.tokens} tokens): {prompt}")
 
         try:
             result = self._invoke_model(prompt)
@@ -137,7 +189,8 @@ class LLMProvider:
             logger.error(f"Error evaluating response: {e}", exc_info=True)
             return False, None
 
-    def _format_question_history(self, question_history: List[Dict[str, str]]) -> str:
+    @staticmethod
+    def _format_question_history(question_history: List[Dict[str, str]]) -> str:
         """Format the question history for the prompt."""
         formatted_history = ""
         for i, qa in enumerate(question_history, 1):
@@ -145,6 +198,20 @@ class LLMProvider:
             formatted_history += f"A{i}: {qa['answer']}\n\n"
         return formatted_history.strip()
 
+    @staticmethod
+    def _format_transcript(questions_and_responses: List[Dict[str, Any]]) -> str:
+        """Format questions, answers and follow-ups for the summary prompt."""
+        formatted_qa = ""
+        for i, qa in enumerate(questions_and_responses, 1):
+            formatted_qa += f"Q{i}: {qa['question']}\n"
+            formatted_qa += f"A{i}: {qa['answer']}\n"
+            if qa.get('follow_ups'):
+                for j, fu in enumerate(qa['follow_ups'], 1):
+                    formatted_qa += f"  Follow-up {j}: {fu['question']}\n"
+                    formatted_qa += f"  Response {j}: {fu['answer']}\n"
+            formatted_qa += "\n"
+        return formatted_qa
+
     def generate_interview_summary(self, interview_type: str, level: str,
                                    questions_and_responses: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -158,25 +225,17 @@ class LLMProvider:
         Returns:
             Dictionary containing the summary sections
         """
-        # Format questions and responses for the prompt
-        formatted_qa = ""
-        for i, qa in enumerate(questions_and_responses, 1):
-            formatted_qa += f"Q{i}: {qa['question']}\n"
-            formatted_qa += f"A{i}: {qa['answer']}\n"
-            if qa.get('follow_ups'):
-                for j, fu in enumerate(qa['follow_ups'], 1):
-                    formatted_qa += f"  Follow-up {j}: {fu['question']}\n"
-                    formatted_qa += f"  Response {j}: {fu['answer']}\n"
-            formatted_qa += "\n"
+        formatted_qa = self._format_transcript(questions_and_responses)
 
-        prompt = self.prompt_manager.format_prompt(
+        rendered = self.prompt_manager.render(
             "summary",
             interview_type=interview_type,
             level=level,
             questions_and_responses=formatted_qa
         )
+        prompt = rendered.text
 
-        logger.debug(f"Summary generation prompt: {prompt}")
+        logger.debug(f"Summary generation prompt (~{rendered.tokens} tokens): {prompt}")
 
         result = self._invoke_model(
             prompt,
@@ -238,10 +297,10 @@ class LLMProvider:
             logger.error(f"Error generating coach response: {e}", exc_info=True)
             raise Exception(f"Failed to generate coach response: {str(e)}")
 
-    def generate_resume_feedback(self, prompt: str) -> dict:
-        """Generate feedback for a resume"""
+    def generate_resume_feedback(self, prompt: str, max_tokens: int = 1500) -> dict:
+        """Generate feedback for a resume, or for one section of it"""
         try:
-            result = self._invoke_model(prompt, max_tokens=1500)
+            result = self._invoke_model(prompt, max_tokens=max_tokens)
             content = result.get("content", "").strip()
 
             # Parse the structured feedback
@@ -267,7 +326,7 @@ class LLMProvider:
                     current_section = "strengths"
                 elif "improvements" in lower_line:
                     current_section = "improvements"
-                elif "refined resume" in lower_line:
+                elif "refined resume" in lower_line or "refined section" in lower_line:
                     current_section = "refined_content"
                     sections[current_section] = ""
                 elif "additional tips" in lower_line:
@@ -285,25 +344,30 @@ class LLMProvider:
             logger.error(f"Error generating resume feedback: {e}", exc_info=True)
             raise Exception(f"Failed to generate resume feedback: {str(e)}")
 
+    async def generate_daily_tip(self) -> str:
+        """Generate and format a daily technical tip, raising if the model call fails."""
+        # Get the prompt template
+        prompt = self.prompt_manager.format_prompt(
+            "daily_tech_tip",
+        )
+        # Generate the complete tip off the event loop
+        result = await get_executor('llm').run(
+            self._invoke_model,
+            prompt=prompt,
+            max_tokens=1500,
+            temperature=0.7
+        )
+        content = result.get("content", "").strip()
+        if not content:
+            raise ValueError("Empty daily tip from the model")
+
+        # Add footer
+        return f"{content}\n\n*Happy learning! 📚*"
+
     async def create_daily_tip(self) -> str:
         """Generate and format a daily technical tip."""
         try:
-            # Get the prompt template
-            prompt = self.prompt_manager.format_prompt(
-                "daily_tech_tip",
-            )
-            # Generate the complete tip
-            result = self._invoke_model(
-                prompt=prompt,
-                max_tokens=1500,
-                temperature=0.7
-            )
-            content = result.get("content", "").strip()
-
-            # Add footer
-            content = f"{content}\n\n*Happy learning! 📚*"
-
-            return content
+            return await self.generate_daily_tip()
         except Exception as e:
             logger.error(f"Error creating daily tip: {e}", exc_info=True)
             return "Sorry, I couldn't generate today's tech tip. Please try again later."
\ No newline at end of file
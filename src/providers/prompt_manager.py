@@ -1,34 +1,205 @@
 import json
 import os
 import logging
+from string import Formatter
+from typing import Dict, Any, List, NamedTuple
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n[... truncated ...]\n"
+KEEP_MODES = ("head", "tail", "middle")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for the Claude family (about four characters per token)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def truncate_text(text: str, max_chars: int, keep: str = "head") -> str:
+    """Shorten text to at most max_chars, marking the cut; keep the head, the tail or both ends"""
+    if len(text) <= max_chars:
+        return text
+    room = max(max_chars - len(TRUNCATION_MARKER), 0)
+    if keep == "tail":
+        return TRUNCATION_MARKER + text[len(text) - room:]
+    if keep == "middle":
+        head = room // 2
+        return text[:head] + TRUNCATION_MARKER + text[len(text) - (room - head):]
+    return text[:room] + TRUNCATION_MARKER
+
+class RenderedPrompt(NamedTuple):
+    text: str
+    tokens: int  # Estimated input tokens
+    truncated: bool  # The budget's truncate parameter was shortened to fit
+
+class CompiledTemplate:
+    """
+    A prompt template parsed once at load: literal segments, named fields and an
+    optional size budget. Construction raises ValueError for anything that would
+    only fail at render time.
+    """
+
+    def __init__(self, name: str, prompt_data: Any):
+        if not isinstance(prompt_data, dict) or not isinstance(prompt_data.get("template"), str):
+            raise ValueError(f"Prompt '{name}' has no template")
+        parameters = prompt_data.get("parameters")
+        if not isinstance(parameters, list):
+            raise ValueError(f"Prompt '{name}' has no parameter list")
+
+        self.name = name
+        self.template = prompt_data["template"]
+        self.parameters = tuple(parameters)
+        self._required = frozenset(parameters)
+
+        # [(literal, field, conversion, format_spec)] with field None for a trailing literal
+        try:
+            self.segments = [
+                (literal, field, conversion, spec)
+                for literal, field, spec, conversion in Formatter().parse(self.template)
+            ]
+        except ValueError as e:
+            raise ValueError(f"Prompt '{name}' has a malformed template: {e}")
+
+        fields = [field for _, field, _, _ in self.segments if field is not None]
+        for field in fields:
+            if not field.isidentifier():
+                raise ValueError(f"Prompt '{name}' uses unsupported placeholder '{{{field}}}'")
+        unknown = set(fields) - self._required
+        if unknown:
+            raise ValueError(f"Prompt '{name}' uses undeclared parameters {sorted(unknown)}")
+        unused = self._required - set(fields)
+        if unused:
+            logger.warning(f"Prompt '{name}' declares parameters it never uses: {sorted(unused)}")
+        self.field_counts = {field: fields.count(field) for field in set(fields)}
+        self.fixed_tokens = estimate_tokens("".join(literal for literal, _, _, _ in self.segments))
+
+        budget = prompt_data.get("budget") or {}
+        self.max_tokens = budget.get("max_tokens")
+        self.truncate = budget.get("truncate")
+        self.keep = budget.get("keep", "head")
+        if self.max_tokens is not None:
+            if not isinstance(self.max_tokens, int) or self.max_tokens <= self.fixed_tokens:
+                raise ValueError(f"Prompt '{name}' budget must exceed its fixed text ({self.fixed_tokens} tokens)")
+            if self.truncate is not None and self.truncate not in self.field_counts:
+                raise ValueError(f"Prompt '{name}' budget truncates unknown parameter '{self.truncate}'")
+            if self.keep not in KEEP_MODES:
+                raise ValueError(f"Prompt '{name}' budget keep must be one of {KEEP_MODES}")
+
+        # Catch bad conversions and format specs now rather than mid-interview
+        self.render(**{parameter: "" for parameter in self.parameters})
+
+    def _format_fields(self, kwargs: Dict[str, Any]) -> Dict[str, str]:
+        values = {}
+        for _, field, conversion, spec in self.segments:
+            if field is None or field in values:
+                continue
+            value = kwargs[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            values[field] = format(value, spec) if spec else str(value)
+        return values
+
+    def _join(self, values: Dict[str, str]) -> str:
+        return "".join(literal + (values[field] if field is not None else "")
+                       for literal, field, _, _ in self.segments)
+
+    def render(self, **kwargs) -> RenderedPrompt:
+        """Fill in the template, shortening the budget's truncate parameter if the prompt is over budget"""
+        missing = self._required.difference(kwargs)
+        if missing:
+            raise ValueError(f"Missing parameter '{sorted(missing)[0]}' for prompt '{self.name}'")
+
+        values = self._format_fields(kwargs)
+        text = self._join(values)
+        tokens = estimate_tokens(text)
+        if self.max_tokens is None or tokens <= self.max_tokens or self.truncate is None:
+            return RenderedPrompt(text, tokens, False)
+
+        overflow = (tokens - self.max_tokens) * CHARS_PER_TOKEN
+        value = values[self.truncate]
+        per_occurrence = -(-overflow // self.field_counts[self.truncate])
+        values[self.truncate] = truncate_text(value, len(value) - per_occurrence, self.keep)
+        text = self._join(values)
+        tokens = estimate_tokens(text)
+        logger.warning(f"Prompt '{self.name}' over its {self.max_tokens} token budget; "
+                       f"truncated '{self.truncate}' to {len(values[self.truncate])} chars")
+        return RenderedPrompt(text, tokens, True)
+
+def load_prompt_file(prompt_file: str) -> Dict[str, CompiledTemplate]:
+    """Load and compile a prompts file; raises ValueError rather than serving a broken template"""
+    with open(prompt_file, 'r') as f:
+        prompts = json.load(f)
+
+    if not isinstance(prompts, dict):
+        raise ValueError(f"{prompt_file}: expected an object of prompt definitions")
+    return {prompt_type: CompiledTemplate(prompt_type, prompt_data) for prompt_type, prompt_data in prompts.items()}
+
+class PromptRegistry:
+    """
+    Process-wide set of prompt templates for one prompts file, shared by every
+    PromptManager so a reload reaches all of them with a single swap.
+    """
+    _registries: Dict[str, 'PromptRegistry'] = {}
+
+    @classmethod
+    def shared(cls, prompt_file: str) -> 'PromptRegistry':
+        key = os.path.abspath(prompt_file)
+        if key not in cls._registries:
+            cls._registries[key] = cls(prompt_file)
+        return cls._registries[key]
+
+    @classmethod
+    def loaded_registries(cls) -> List['PromptRegistry']:
+        return list(cls._registries.values())
+
+    def __init__(self, prompt_file: str):
+        self.prompt_file = prompt_file
+        self.name = f"prompts:{prompt_file}"
+        logger.debug(f"Loading prompts from {prompt_file}")
+        fingerprint = self.current_fingerprint()
+        self.templates = load_prompt_file(prompt_file)
+        self._fingerprint = fingerprint
+        logger.info(f"Loaded {len(self.templates)} prompts")
+
+    # Hot-reload protocol (see utils/hot_reload.py)
+
+    @property
+    def loaded_fingerprint(self) -> str:
+        return self._fingerprint
+
+    def current_fingerprint(self) -> str:
+        stat = os.stat(self.prompt_file)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def build_reload(self):
+        fingerprint = self.current_fingerprint()
+        return fingerprint, load_prompt_file(self.prompt_file)
+
+    def apply_reload(self, snapshot) -> None:
+        self._fingerprint, self.templates = snapshot
+        logger.info(f"Reloaded {len(self.templates)} prompts")
+
 class PromptManager:
     def __init__(self, prompt_file="data/prompts/prompts.json"):
         self.prompt_file = prompt_file
-        self.prompts = self._load_prompts()
+        self.registry = PromptRegistry.shared(prompt_file)
 
-    def _load_prompts(self):
-        logger.debug("Loading prompts from ", self.prompt_file)
-        with open(self.prompt_file, 'r') as f:
-            return json.load(f)
+    @property
+    def templates(self) -> Dict[str, CompiledTemplate]:
+        return self.registry.templates
 
-        logger.info("Loaded prompts")
-
-    def format_prompt(self, prompt_type, **kwargs):
-        """Format a prompt template with the provided parameters"""
-        if prompt_type not in self.prompts:
+    def get_template(self, prompt_type) -> CompiledTemplate:
+        template = self.templates.get(prompt_type)
+        if template is None:
             raise ValueError(f"Unknown prompt type: {prompt_type}")
+        return template
 
-        prompt_data = self.prompts[prompt_type]
-        template = prompt_data["template"]
-
-        # Validate that all required parameters are provided
-        for param in prompt_data["parameters"]:
-            if param not in kwargs:
-                raise ValueError(f"Missing parameter '{param}' for prompt '{prompt_type}'")
+    def render(self, prompt_type, **kwargs) -> RenderedPrompt:
+        """Render a prompt with its estimated token count, applying the template's size budget"""
+        return self.get_template(prompt_type).render(**kwargs)
 
-        # Format the template with the provided parameters
-        return template.format(**kwargs)
\ No newline at end of file
+    def format_prompt(self, prompt_type, **kwargs):
+        """Format a prompt template with the provided parameters"""
+        return self.render(prompt_type, **kwargs).text
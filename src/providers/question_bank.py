@@ -0,0 +1,190 @@
+import os
+import random
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from .question_deck import draw_from_deck
+from .question_search import BM25Index
+from .question_store import (
+    QUESTION_TYPES, QuestionStore, compile_question_store, default_store_path, is_store_current,
+    source_fingerprint
+)
+
+logger = logging.getLogger(__name__)
+
+# Question files use both naming schemes for levels; index each question under both
+DIFFICULTY_ALIASES = {
+    'entry': 'easy',
+    'easy': 'entry',
+    'senior': 'hard',
+    'hard': 'senior',
+}
+
+class QuestionIndex:
+    """
+    Immutable snapshot of a compiled store plus its metadata indexes
+    (type, difficulty, category, keyword, id -> rowid) and a full-text search
+    index. Question bodies are read lazily on selection, so memory stays flat
+    as the bank grows.
+    """
+
+    def __init__(self, store: QuestionStore):
+        self.store = store
+        self.fingerprint = store.fingerprint
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_id: Dict[str, int] = {}
+        self.by_difficulty: Dict[Tuple[str, str], List[int]] = {}
+        self.by_category: Dict[Tuple[str, str], List[int]] = {}
+        self.by_keyword: Dict[Tuple[str, str], List[int]] = {}
+
+        self.rowid_types: Dict[int, str] = {}
+        for rowid, question_type, question_id in store.iter_metadata():
+            self.by_type.setdefault(question_type, []).append(rowid)
+            self.rowid_types[rowid] = question_type
+            if question_id is not None:
+                self.by_id[question_id] = rowid
+
+        for rowid, facet, value in store.iter_tags():
+            key = (self.rowid_types[rowid], value)
+            if facet == 'difficulty':
+                self._add(self.by_difficulty, key, rowid)
+                if value in DIFFICULTY_ALIASES:
+                    self._add(self.by_difficulty, (key[0], DIFFICULTY_ALIASES[value]), rowid)
+            elif facet == 'category':
+                self._add(self.by_category, key, rowid)
+            elif facet == 'keyword':
+                self._add(self.by_keyword, key, rowid)
+
+        self.search = BM25Index(store.iter_search_text())
+
+    @staticmethod
+    def _add(index: Dict[Tuple[str, str], List[int]], key: Tuple[str, str], rowid: int) -> None:
+        rowids = index.setdefault(key, [])
+        if not rowids or rowids[-1] != rowid:  # tags arrive grouped by question, skip alias duplicates
+            rowids.append(rowid)
+
+    def counts(self) -> Dict[str, int]:
+        return {question_type: len(rowids) for question_type, rowids in self.by_type.items()}
+
+class QuestionBank:
+    """
+    Process-wide question bank backed by a compiled SQLite store.
+    The store is recompiled from the authoring JSON whenever those files change;
+    reloads build a new QuestionIndex off the event loop and swap it in with a
+    single assignment, keeping the old index if validation fails.
+    """
+    _banks: Dict[str, 'QuestionBank'] = {}
+
+    @classmethod
+    def shared(cls, data_path: str = "data/questions") -> 'QuestionBank':
+        key = os.path.abspath(data_path)
+        if key not in cls._banks:
+            cls._banks[key] = cls(data_path)
+        return cls._banks[key]
+
+    @classmethod
+    def loaded_banks(cls) -> List['QuestionBank']:
+        return list(cls._banks.values())
+
+    def __init__(self, data_path: str = "data/questions", store_path: Optional[str] = None):
+        self.data_path = data_path
+        self.store_path = store_path or default_store_path(data_path)
+        self.name = f"questions:{data_path}"
+        self._index = self._load()
+        logger.info(f"Loaded question bank from {self.store_path}: {self.counts()}")
+
+    def _load(self) -> QuestionIndex:
+        """Compile the store if the authoring files changed, falling back to the last good store"""
+        if not is_store_current(self.data_path, self.store_path):
+            try:
+                compile_question_store(self.data_path, self.store_path)
+            except Exception as e:
+                if not os.path.exists(self.store_path):
+                    raise
+                logger.error(f"Question files failed to compile ({e}); serving the last compiled store")
+        return QuestionIndex(QuestionStore(self.store_path))
+
+    # Hot-reload protocol (see utils/hot_reload.py)
+
+    @property
+    def loaded_fingerprint(self) -> Optional[str]:
+        return self._index.fingerprint
+
+    def current_fingerprint(self) -> str:
+        return source_fingerprint(self.data_path)
+
+    def build_reload(self) -> QuestionIndex:
+        """Validate, compile and index the changed files; blocking, so run it off the event loop"""
+        compile_question_store(self.data_path, self.store_path)
+        return QuestionIndex(QuestionStore(self.store_path))
+
+    def apply_reload(self, index: QuestionIndex) -> None:
+        old_index, self._index = self._index, index
+        old_index.store.close()
+        logger.info(f"Reloaded question bank: {self.counts()}")
+
+    def counts(self) -> Dict[str, int]:
+        return self._index.counts()
+
+    def _check_type(self, question_type: str) -> None:
+        if question_type not in QUESTION_TYPES:
+            raise ValueError(f"Invalid question type: {question_type}")
+
+    def get_question(self, question_id: str) -> Optional[Dict[str, Any]]:
+        index = self._index
+        rowid = index.by_id.get(question_id)
+        return index.store.get(rowid) if rowid is not None else None
+
+    def get_questions_by_difficulty(self, question_type: str, difficulty: str) -> List[Dict[str, Any]]:
+        self._check_type(question_type)
+        index = self._index
+        return [index.store.get(rowid) for rowid in index.by_difficulty.get((question_type, difficulty.lower()), [])]
+
+    def get_questions_by_category(self, question_type: str, category: str) -> List[Dict[str, Any]]:
+        self._check_type(question_type)
+        index = self._index
+        return [index.store.get(rowid) for rowid in index.by_category.get((question_type, category.lower()), [])]
+
+    def get_questions_by_keyword(self, question_type: str, keyword: str) -> List[Dict[str, Any]]:
+        self._check_type(question_type)
+        index = self._index
+        return [index.store.get(rowid) for rowid in index.by_keyword.get((question_type, keyword.lower()), [])]
+
+    def _eligible_rowids(self, index: QuestionIndex, question_type: str, difficulty: str) -> List[int]:
+        """Question rowids of a type at a difficulty, falling back to every level of that type"""
+        self._check_type(question_type)
+        eligible = index.by_difficulty.get((question_type, difficulty.lower()))
+
+        if not eligible:
+            # Not every type has every level yet; any question of the type beats an error
+            eligible = index.by_type.get(question_type)
+            if eligible:
+                logger.warning(f"No {question_type} questions at {difficulty} level, using any level")
+
+        if not eligible:
+            raise ValueError(f"No questions found for {question_type} at {difficulty} level")
+
+        return eligible
+
+    def get_random_question(self, question_type: str, difficulty: str) -> Dict[str, Any]:
+        """Pick a random question of the given type and difficulty"""
+        index = self._index
+        return index.store.get(random.choice(self._eligible_rowids(index, question_type, difficulty)))
+
+    def draw_question(self, decks: Dict[str, List[int]], question_type: str, difficulty: str,
+                      owner: str = "") -> Dict[str, Any]:
+        """Draw the next unseen question from the owner's deck for this type and difficulty"""
+        index = self._index
+        deck_key = f"{owner}{question_type}:{difficulty.lower()}"
+        rowids = self._eligible_rowids(index, question_type, difficulty)
+        return index.store.get(draw_from_deck(decks, deck_key, rowids))
+
+    def search_questions(self, query: str, question_type: Optional[str] = None,
+                         limit: int = 5) -> List[Tuple[str, Dict[str, Any]]]:
+        """Rank questions against free-text terms; returns (type, question) pairs, best first"""
+        index = self._index
+        accept = None
+        if question_type is not None:
+            self._check_type(question_type)
+            accept = lambda rowid: index.rowid_types[rowid] == question_type
+        return [(index.rowid_types[rowid], index.store.get(rowid))
+                for _, rowid in index.search.search(query, limit, accept)]
@@ -0,0 +1,62 @@
+import random
+import logging
+from typing import Dict, List, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+FEISTEL_ROUNDS = 4
+
+def _round_key(seed: int, round_index: int, value: int) -> int:
+    """32-bit mix of the seed, round and half-block (murmur3 finalizer)"""
+    x = (value * 0x9E3779B1 + seed * 0x85EBCA77 + round_index * 0xC2B2AE3D) & 0xFFFFFFFF
+    x ^= x >> 16
+    x = (x * 0x85EBCA6B) & 0xFFFFFFFF
+    x ^= x >> 13
+    x = (x * 0xC2B2AE35) & 0xFFFFFFFF
+    return x ^ (x >> 16)
+
+def _permuted_index(seed: int, size: int, position: int) -> int:
+    """
+    The position-th entry of a seeded permutation of range(size), in O(1) time
+    and memory: a Feistel network is a bijection on [0, 4**half_bits), and
+    outputs outside range(size) are fed back in (cycle walking) until one lands
+    inside. The domain is under 4 * size, so that takes a few steps on average.
+    """
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+    value = position
+    while True:
+        left, right = value >> half_bits, value & mask
+        for round_index in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ (_round_key(seed, round_index, right) & mask)
+        value = (left << half_bits) | right
+        if value < size:
+            return value
+
+T = TypeVar('T')
+
+def draw_from_deck(decks: Dict[str, List[int]], deck_key: str, questions: Sequence[T]) -> T:
+    """
+    Draw the next unseen item (a question or its store rowid) of a shuffled deck.
+    A deck cursor is stored as [seed, position, size] in `decks` (usually a
+    profile's 'question_decks'), so it survives restarts without storing the
+    question list. The deck is reshuffled with a new seed once exhausted, or
+    when the question list changes size.
+    """
+    if not questions:
+        raise ValueError(f"No questions available for deck {deck_key}")
+
+    size = len(questions)
+    cursor = decks.get(deck_key)
+    if not cursor or cursor[2] != size or cursor[1] >= size:
+        previous_last = _permuted_index(cursor[0], size, size - 1) if cursor and cursor[2] == size else None
+        cursor = [random.getrandbits(32), 0, size]
+        # Avoid repeating the last question of the old deck as the first of the new one
+        while previous_last is not None and size > 1 and _permuted_index(cursor[0], size, 0) == previous_last:
+            cursor[0] += 1
+        logger.debug(f"Shuffled new deck {deck_key} with {size} questions")
+
+    seed, position, _ = cursor
+    question = questions[_permuted_index(seed, size, position)]
+    decks[deck_key] = [seed, position + 1, size]
+    return question
\ No newline at end of file
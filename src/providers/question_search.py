@@ -0,0 +1,89 @@
+import heapq
+import math
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how',
+    'i', 'if', 'in', 'is', 'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'what', 'when',
+    'which', 'why', 'with', 'you', 'your'
+}
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+class BM25Index:
+    """
+    Inverted index over question text ranked with Okapi BM25.
+
+    Per-document term weights are precomputed at build time, so a query is a
+    sum over the postings of its terms. Terms are scored rarest first; once no
+    unseen document could reach the current top k, the remaining (common)
+    terms only update documents already being scored.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[int, str]], k1: float = 1.2, b: float = 0.75):
+        term_freqs: Dict[str, Dict[int, int]] = {}
+        lengths: Dict[int, int] = {}
+        for doc_id, text in documents:
+            tokens = tokenize(text)
+            lengths[doc_id] = len(tokens)
+            for token in tokens:
+                postings = term_freqs.setdefault(token, {})
+                postings[doc_id] = postings.get(doc_id, 0) + 1
+
+        self.doc_count = len(lengths)
+        average_length = (sum(lengths.values()) / self.doc_count) if self.doc_count else 0.0
+
+        # term -> {doc_id: BM25 weight}, and each term's highest weight for pruning
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._max_weight: Dict[str, float] = {}
+        for term, postings in term_freqs.items():
+            idf = math.log(1 + (self.doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weights = {}
+            for doc_id, tf in postings.items():
+                norm = k1 * (1 - b + b * lengths[doc_id] / average_length)
+                weights[doc_id] = idf * tf * (k1 + 1) / (tf + norm)
+            self._postings[term] = weights
+            self._max_weight[term] = max(weights.values())
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def search(self, query: str, limit: int = 5,
+               accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[float, int]]:
+        """Return up to `limit` (score, doc_id) pairs, best first; `accept` filters documents"""
+        terms = sorted((term for term in set(tokenize(query)) if term in self._postings),
+                       key=lambda term: len(self._postings[term]))
+        if not terms or limit <= 0:
+            return []
+
+        # remaining[i]: the most any document can gain from terms[i:]
+        remaining = [0.0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + self._max_weight[terms[i]]
+
+        scores: Dict[int, float] = {}
+        for i, term in enumerate(terms):
+            postings = self._postings[term]
+            if len(scores) >= limit and heapq.nlargest(limit, scores.values())[-1] > remaining[i]:
+                # Unseen documents can no longer make the top k; only top up known ones
+                if len(scores) < len(postings):
+                    for doc_id in scores:
+                        scores[doc_id] += postings.get(doc_id, 0.0)
+                else:
+                    for doc_id, weight in postings.items():
+                        if doc_id in scores:
+                            scores[doc_id] += weight
+                continue
+
+            for doc_id, weight in postings.items():
+                if doc_id in scores:
+                    scores[doc_id] += weight
+                elif accept is None or accept(doc_id):
+                    scores[doc_id] = weight
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, doc_id) for doc_id, score in best]
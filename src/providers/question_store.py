@@ -0,0 +1,196 @@
+import json
+import os
+import sqlite3
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUESTION_TYPES = ["behavioral", "system_design", "technical"]
+
+# Bump when the table layout changes so stale stores are recompiled
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE questions (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    type TEXT NOT NULL,
+    body TEXT NOT NULL,
+    search_text TEXT NOT NULL
+);
+CREATE TABLE tags (
+    question INTEGER NOT NULL REFERENCES questions(rowid),
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX questions_by_type ON questions(type, rowid);
+"""
+
+def default_store_path(source_dir: str) -> str:
+    return os.path.join(source_dir, "compiled", "questions.db")
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).lower() for v in value]
+    return [str(value).lower()]
+
+def _search_text(question: Dict[str, Any]) -> str:
+    """Text the search index sees: question, category, keywords and follow-up"""
+    parts = [question.get('question', '')]
+    parts += _as_list(question.get('category'))
+    parts += _as_list(question.get('keywords'))
+    follow_up = question.get('follow_up') or []
+    parts += [str(f) for f in follow_up] if isinstance(follow_up, list) else [str(follow_up)]
+    return "\n".join(part for part in parts if part)
+
+def _source_files(source_dir: str) -> Dict[str, str]:
+    """Authoring files per question type: {type}.json plus optional {type}.jsonl for generated questions"""
+    files = {}
+    for question_type in QUESTION_TYPES:
+        for ext in ("json", "jsonl"):
+            path = os.path.join(source_dir, f"{question_type}.{ext}")
+            if os.path.exists(path):
+                files[f"{question_type}.{ext}"] = path
+    return files
+
+def source_fingerprint(source_dir: str) -> str:
+    """Identify the authoring files' current contents by name, size and mtime"""
+    stamps = {}
+    for name, path in sorted(_source_files(source_dir).items()):
+        stat = os.stat(path)
+        stamps[name] = [stat.st_size, stat.st_mtime_ns]
+    return json.dumps({'schema': SCHEMA_VERSION, 'files': stamps}, sort_keys=True)
+
+def _iter_source_questions(source_dir: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for name, path in sorted(_source_files(source_dir).items()):
+        question_type = name.rsplit('.', 1)[0]
+        try:
+            with open(path, 'r') as f:
+                if path.endswith('.jsonl'):
+                    for line in f:
+                        if line.strip():
+                            yield question_type, json.loads(line)
+                else:
+                    for question in json.load(f)["questions"]:
+                        yield question_type, question
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error in {path}: {str(e)}")
+            raise
+
+KNOWN_DIFFICULTIES = {'easy', 'entry', 'medium', 'hard', 'senior'}
+
+def validate_question(question_type: str, question: Any, seen_ids: set) -> None:
+    """Raise ValueError if a question would be unusable by the bank"""
+    if not isinstance(question, dict):
+        raise ValueError(f"{question_type}: question entries must be objects, got {type(question).__name__}")
+    label = f"{question_type} question {question.get('id', '<no id>')}"
+    if not isinstance(question.get('question'), str) or not question['question'].strip():
+        raise ValueError(f"{label}: missing question text")
+    question_id = question.get('id')
+    if question_id is not None:
+        if question_id in seen_ids:
+            raise ValueError(f"{label}: duplicate id")
+        seen_ids.add(question_id)
+    unknown = set(_as_list(question.get('difficulty'))) - KNOWN_DIFFICULTIES
+    if unknown:
+        raise ValueError(f"{label}: unknown difficulty {sorted(unknown)}")
+
+def compile_question_store(source_dir: str, store_path: str) -> int:
+    """
+    Validate and compile the authoring JSON into a SQLite store. The old store
+    is only replaced (atomically) once every question passed validation.
+    """
+    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+    tmp_path = f"{store_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    fingerprint = source_fingerprint(source_dir)
+    count = 0
+    seen_ids = set()
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        for question_type, question in _iter_source_questions(source_dir):
+            validate_question(question_type, question, seen_ids)
+            cursor = conn.execute(
+                "INSERT INTO questions (id, type, body, search_text) VALUES (?, ?, ?, ?)",
+                (question.get('id'), question_type, json.dumps(question), _search_text(question))
+            )
+            rowid = cursor.lastrowid
+            tags = [(rowid, 'difficulty', value) for value in _as_list(question.get('difficulty'))]
+            tags += [(rowid, 'category', value) for value in _as_list(question.get('category'))]
+            tags += [(rowid, 'keyword', value) for value in _as_list(question.get('keywords'))]
+            conn.executemany("INSERT INTO tags (question, facet, value) VALUES (?, ?, ?)", tags)
+            count += 1
+        conn.execute("INSERT INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        conn.commit()
+    except Exception:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+
+    os.replace(tmp_path, store_path)
+    logger.info(f"Compiled {count} questions from {source_dir} into {store_path}")
+    return count
+
+def is_store_current(source_dir: str, store_path: str) -> bool:
+    if not os.path.exists(store_path):
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Unreadable question store {store_path}: {e}")
+        return False
+    return row is not None and row[0] == source_fingerprint(source_dir)
+
+class QuestionStore:
+    """Read-only view of a compiled store; question bodies are fetched lazily through a small LRU"""
+
+    def __init__(self, store_path: str, cache_size: int = 512):
+        self.store_path = store_path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._conn = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True, check_same_thread=False)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        self.fingerprint = row[0] if row else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def iter_metadata(self) -> Iterator[Tuple[int, str, str]]:
+        """Yield (rowid, type, id) for every question, in authoring order"""
+        yield from self._conn.execute("SELECT rowid, type, id FROM questions ORDER BY rowid")
+
+    def iter_search_text(self) -> Iterator[Tuple[int, str]]:
+        """Yield (rowid, searchable text) for every question"""
+        yield from self._conn.execute("SELECT rowid, search_text FROM questions ORDER BY rowid")
+
+    def iter_tags(self) -> Iterator[Tuple[int, str, str]]:
+        """Yield (rowid, facet, value) for every tag"""
+        yield from self._conn.execute("SELECT question, facet, value FROM tags ORDER BY question")
+
+    def get(self, rowid: int) -> Dict[str, Any]:
+        question = self._cache.get(rowid)
+        if question is not None:
+            self._cache.move_to_end(rowid)
+            return question
+
+        row = self._conn.execute("SELECT body FROM questions WHERE rowid = ?", (rowid,)).fetchone()
+        if row is None:
+            raise KeyError(f"No question with rowid {rowid}")
+        question = json.loads(row[0])
+        self._cache[rowid] = question
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return question
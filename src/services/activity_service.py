@@ -0,0 +1,112 @@
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Tuple
+from ..providers.data_provider import DataProvider
+
+logger = logging.getLogger(__name__)
+
+class CoinRules:
+    """Coin awards for activity events, driven by activity_config.json and streak_config.json"""
+
+    def __init__(self, activity_config: Dict[str, Any], streak_config: Dict[str, Any]):
+        self.activities = activity_config.get('activities', {})
+        self.streak_bonuses = {bonus['days']: bonus['bonus_coins'] for bonus in streak_config.get('streak_bonuses', [])}
+
+    def award(self, event: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Return (coins, breakdown) for a single event"""
+        activity = event['activity']
+        rule = self.activities.get(activity)
+        if rule is None:
+            logger.warning(f"No coin rule for activity '{activity}'")
+            return 0, {'rule': None}
+
+        base_coins = rule.get('base_coins', 0)
+        multiplier = 1.0
+        if 'streak_multiplier' in rule:
+            multiplier = self._tiered(rule['streak_multiplier'], event.get('streak', 0))
+        elif 'difficulty_multiplier' in rule:
+            multiplier = rule['difficulty_multiplier'].get(event.get('difficulty'), 1.0)
+        elif 'duration_multiplier' in rule:
+            multiplier = self._tiered(rule['duration_multiplier'], event.get('duration_minutes', 0))
+
+        bonus = 0
+        if activity == 'daily_check_in':
+            bonus = self.streak_bonuses.get(event.get('streak'), 0)
+
+        coins = round(base_coins * multiplier) + bonus
+        return coins, {'rule': activity, 'base_coins': base_coins, 'multiplier': multiplier, 'streak_bonus': bonus}
+
+    @staticmethod
+    def _tiered(tiers: Dict[str, float], value: float) -> float:
+        """Pick the multiplier of the highest tier reached, with tiers keyed like '7_days' or '30_minutes'"""
+        multiplier = 1.0
+        best_threshold = None
+        for key, tier_multiplier in tiers.items():
+            threshold = int(key.split('_', 1)[0])
+            if value >= threshold and (best_threshold is None or threshold > best_threshold):
+                best_threshold = threshold
+                multiplier = tier_multiplier
+        return multiplier
+
+class ActivityService:
+    def __init__(self):
+        self.data_provider = DataProvider()
+        self.ledger = self.data_provider.activity_ledger
+        self.batch_size = 10000  # Events folded per profile batch
+
+    async def aggregate(self) -> Dict[str, int]:
+        """Fold every pending ledger event into profile snapshots in batches"""
+        totals = Counter()
+        while True:
+            events, end_offset = self.ledger.read_pending(self.batch_size)
+            if not events:
+                break
+
+            rules = CoinRules(
+                await self.data_provider.get_activity_config(),
+                await self.data_provider.get_streak_config()
+            )
+            profiles = await self.data_provider.get_profiles({event['user_id'] for event in events})
+
+            audit = []
+            aggregated_at = datetime.now().isoformat(timespec='seconds')
+            for event in events:
+                profile = profiles[event['user_id']]
+                # Events below the profile's watermark were folded before an interrupted commit
+                if event['offset'] < profile.get('ledger_offset', 0):
+                    totals['skipped'] += 1
+                    continue
+
+                coins, breakdown = rules.award(event)
+                profile['total_coins'] += coins
+                activity_counts = profile.setdefault('activity_counts', {})
+                activity_counts[event['activity']] = activity_counts.get(event['activity'], 0) + 1
+
+                audit.append({
+                    'aggregated_at': aggregated_at,
+                    'event_offset': event['offset'],
+                    'event_ts': event['ts'],
+                    'user_id': event['user_id'],
+                    'activity': event['activity'],
+                    'coins': coins,
+                    'balance': profile['total_coins'],
+                    **breakdown
+                })
+                totals['events'] += 1
+                totals['coins'] += coins
+
+            for profile in profiles.values():
+                profile['ledger_offset'] = end_offset
+
+            await self.data_provider.save_profiles(list(profiles.values()))
+            self.ledger.write_audit(audit)
+            self.ledger.commit(end_offset)
+            totals['profiles'] += len(profiles)
+
+            if len(events) < self.batch_size:
+                break
+
+        if totals:
+            logger.info(f"Aggregated activity ledger: {dict(totals)}")
+        return dict(totals)
@@ -1,9 +1,10 @@
-import asyncio
 import logging
 from typing import Dict, Optional, Tuple, List
 import discord
 from ..providers.llm_provider import LLMProvider
 from ..providers.question_provider import QuestionProvider
+from ..providers.data_provider import DataProvider
+from ..utils.executors import get_executor
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
@@ -25,6 +26,7 @@ class InterviewService:
         self.active_sessions: Dict[int, InterviewSession] = {}
         self.llm_provider = LLMProvider()
         self.question_provider = QuestionProvider()
+        self.data_provider = DataProvider()
         self.max_follow_ups = 5  # Maximum number of follow-up questions
 
     def create_session(self, user_id: int, interview_type: str) -> InterviewSession:
@@ -37,10 +39,14 @@ class InterviewService:
         """Get active session for a user"""
         return self.active_sessions.get(user_id)
 
-    def end_session(self, user_id: int):
-        """End an interview session"""
+    async def end_session(self, user_id: int):
+        """End an interview session and save the user's deck position"""
         if user_id in self.active_sessions:
             del self.active_sessions[user_id]
+        try:
+            await self.data_provider.flush_question_decks([user_id])
+        except Exception as e:
+            logger.error(f"Failed to save question decks for user {user_id}: {e}")
 
     def set_difficulty(self, user_id: int, difficulty: str) -> bool:
         """Set difficulty for a session"""
@@ -58,10 +64,14 @@ class InterviewService:
             return None
 
         try:
-            question_data = self.question_provider.get_random_question(
+            # Draw from the user's persistent deck so questions don't repeat until it runs out
+            decks = await self.data_provider.get_question_decks(str(user_id))
+            question_data = self.question_provider.draw_question(
+                decks,
                 session.interview_type,
                 session.difficulty
             )
+            await self.data_provider.mark_decks_dirty(str(user_id))
             session.current_question = question_data
             session.status = "waiting_for_answer"
             return question_data
@@ -122,9 +132,7 @@ class InterviewService:
 
     async def _evaluate_response_async(self, interview_type: str, level: str, qa_history: List[Dict[str, str]], current_question: str, current_response: str) -> Tuple[bool, Optional[str]]:
         """Async wrapper for LLM evaluation"""
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
+        return await get_executor('llm').run(
             self.llm_provider.evaluate_response,
             interview_type,
             level,
@@ -135,9 +143,7 @@ class InterviewService:
 
     async def _generate_summary_async(self, interview_type: str, level: str, qa_history: List[dict]):
         """Async wrapper for summary generation"""
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
+        return await get_executor('llm').run(
             self.llm_provider.generate_interview_summary,
             interview_type,
             level,
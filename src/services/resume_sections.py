@@ -0,0 +1,75 @@
+import re
+from typing import List, Tuple
+
+# Heading words mapped to the section they start; matched against short standalone lines
+SECTION_HEADINGS = {
+    'summary': 'Summary', 'profile': 'Summary', 'objective': 'Summary', 'about me': 'Summary',
+    'professional summary': 'Summary',
+    'experience': 'Experience', 'work experience': 'Experience', 'professional experience': 'Experience',
+    'employment': 'Experience', 'employment history': 'Experience', 'work history': 'Experience',
+    'education': 'Education', 'academic background': 'Education',
+    'skills': 'Skills', 'technical skills': 'Skills', 'core competencies': 'Skills',
+    'projects': 'Projects', 'personal projects': 'Projects',
+    'certifications': 'Certifications', 'licenses': 'Certifications', 'certificates': 'Certifications',
+    'awards': 'Awards', 'honors': 'Awards', 'achievements': 'Awards',
+    'publications': 'Publications',
+    'volunteer': 'Volunteering', 'volunteering': 'Volunteering', 'volunteer experience': 'Volunteering',
+    'languages': 'Languages',
+    'interests': 'Interests', 'hobbies': 'Interests',
+}
+
+HEADING_PATTERN = re.compile(r"^[#*\s]*([A-Za-z][A-Za-z &/]{1,40}?)[\s:*]*$")
+
+def _heading(line: str):
+    match = HEADING_PATTERN.match(line.strip())
+    if not match:
+        return None
+    words = " ".join(match.group(1).lower().replace('&', ' ').split())
+    return SECTION_HEADINGS.get(words)
+
+def _split_long(name: str, text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """Split an oversized section at blank lines (or lines) into numbered parts"""
+    if len(text) <= max_chars:
+        return [(name, text)]
+    blocks = re.split(r"\n\s*\n", text)
+    if len(blocks) == 1:
+        blocks = text.split("\n")
+    parts, current = [], ""
+    for block in blocks:
+        if current and len(current) + len(block) + 2 > max_chars:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n\n{block}" if current else block
+    if current:
+        parts.append(current)
+    if len(parts) == 1:
+        return [(name, text)]
+    return [(f"{name} (part {i})", part) for i, part in enumerate(parts, 1)]
+
+def split_sections(resume_text: str, max_chars: int = 6000) -> List[Tuple[str, str]]:
+    """
+    Split a resume into (section name, text) pairs in document order.
+    Text before the first recognised heading becomes 'Header' (usually contact details);
+    repeated headings get merged into one section.
+    """
+    sections: List[Tuple[str, List[str]]] = [('Header', [])]
+    for line in resume_text.splitlines():
+        name = _heading(line)
+        if name is None:
+            sections[-1][1].append(line)
+            continue
+        existing = next((lines for section, lines in sections if section == name), None)
+        if existing is not None:
+            sections.append((name, existing))  # Keep appending to the first occurrence
+        else:
+            sections.append((name, [line]))
+
+    result, seen = [], set()
+    for name, lines in sections:
+        if id(lines) in seen:
+            continue
+        seen.add(id(lines))
+        text = "\n".join(lines).strip()
+        if text:
+            result.extend(_split_long(name, text, max_chars))
+    return result
@@ -1,20 +1,143 @@
+import asyncio
+import copy
+import logging
+import os
+from typing import Any, Dict, List, Tuple
 from ..providers.llm_provider import LLMProvider
-from ..providers.prompt_manager import PromptManager
+from ..providers.prompt_manager import PromptManager, estimate_tokens
+from ..utils.executors import get_executor
+from ..utils.ttl_cache import TTLCache, content_hash
+from .resume_sections import split_sections
+
+logger = logging.getLogger(__name__)
+
+# Resumes estimated above this many tokens are analyzed section by section
+MAP_REDUCE_MIN_TOKENS = int(os.getenv('RESUME_MAP_REDUCE_TOKENS', '1500'))
+# Section calls one resume may have in flight (the llm executor caps the whole bot)
+SECTION_CONCURRENCY = int(os.getenv('RESUME_SECTION_CONCURRENCY', '4'))
+
+def normalize_resume_text(resume_text: str) -> str:
+    """Collapse whitespace so re-extracted or re-pasted copies of a resume hash the same"""
+    return " ".join(resume_text.split())
 
 class ResumeService:
+    # Feedback keyed by the normalized resume text and the prompt it was produced with
+    feedback_cache = TTLCache(max_entries=256, ttl_seconds=24 * 3600)
+    # Per-section reviews keyed the same way, reused when a re-upload leaves a section unchanged
+    section_cache = TTLCache(max_entries=2048, ttl_seconds=24 * 3600)
+    # user_id -> {section name: section hash} of the last resume each user sent
+    last_versions = TTLCache(max_entries=1024, ttl_seconds=24 * 3600)
+
     def __init__(self):
         self.llm_provider = LLMProvider()
         self.prompt_manager = PromptManager()
 
-    async def analyze_resume(self, resume_text: str) -> dict:
-        """Analyze the resume and provide recommendations"""
-        prompt = self.prompt_manager.format_prompt(
-            "resume_analysis",
-            resume_text=resume_text
+    async def analyze_resume(self, resume_text: str, user_id=None) -> dict:
+        """
+        Analyze the resume and provide recommendations.
+        With a user_id, a re-upload whose earlier section reviews are mostly still cached
+        is reviewed section by section so only changed sections go to the LLM; the
+        result lists which sections were served from cache (reused_sections) and which
+        were reviewed again (changed_sections).
+        """
+        sections = split_sections(resume_text)
+        section_hashes = {name: content_hash(normalize_resume_text(text)) for name, text in sections}
+        previous = self.last_versions.get(user_id) if user_id is not None else None
+        resume_hash = content_hash(normalize_resume_text(resume_text))
+
+        # A short re-upload is only split when most section reviews can be reused; with
+        # nothing cached, a review per section plus the merge costs more than one call
+        map_reduce = len(sections) > 1 and (
+            estimate_tokens(resume_text) > MAP_REDUCE_MIN_TOKENS
+            or (previous is not None and 2 * self._cached_section_count(sections, section_hashes) >= len(sections))
+        )
+        # An unchanged resume is served whole, whichever way it was first analyzed
+        modes = [map_reduce, not map_reduce] if len(sections) > 1 else [False]
+        cached = None
+        for mode in modes:
+            cached = self.feedback_cache.get(self._feedback_key(resume_hash, mode))
+            if cached is not None:
+                break
+
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            reused = [name for name, _ in sections]
+        else:
+            try:
+                if map_reduce:
+                    result, reused = await self._analyze_by_section(sections, section_hashes)
+                else:
+                    rendered = self.prompt_manager.render("resume_analysis", resume_text=resume_text)
+                    result = await get_executor('llm').run(self.llm_provider.generate_resume_feedback, rendered.text)
+                    # Over-budget resumes are cut to fit; let the caller tell the user
+                    result["truncated"] = rendered.truncated
+                    reused = []
+            except Exception as e:
+                raise Exception(f"Failed to analyze resume: {str(e)}")
+            self.feedback_cache.set(self._feedback_key(resume_hash, map_reduce), copy.deepcopy(result))
+
+        # Only a successful analysis becomes the baseline for the next upload
+        if user_id is not None:
+            self.last_versions.set(user_id, section_hashes)
+        if previous is not None:
+            result["reused_sections"] = reused
+            result["changed_sections"] = [name for name, _ in sections if name not in reused]
+        return result
+
+    def _section_key(self, name: str, section_hash: str) -> Tuple[str, str, str]:
+        section_prompt = content_hash(self.prompt_manager.get_template("resume_section_analysis").template)
+        return name, section_hash, section_prompt
+
+    def _cached_section_count(self, sections: List[Tuple[str, str]], section_hashes: Dict[str, str]) -> int:
+        return sum(1 for name, _ in sections if self.section_cache.get(self._section_key(name, section_hashes[name])) is not None)
+
+    def _feedback_key(self, resume_hash: str, map_reduce: bool) -> Tuple[str, str]:
+        """Whole-resume cache key: the normalized text and the templates that produce the feedback"""
+        templates = ("resume_section_analysis", "resume_merge") if map_reduce else ("resume_analysis",)
+        prompt_hash = content_hash("".join(self.prompt_manager.get_template(name).template for name in templates))
+        return resume_hash, prompt_hash
+
+    async def _analyze_by_section(self, sections: List[Tuple[str, str]],
+                                  section_hashes: Dict[str, str]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Map: review every section concurrently. Reduce: one short call merges the findings.
+        Returns the merged feedback and the sections whose review came from the section cache.
+        """
+        semaphore = asyncio.Semaphore(SECTION_CONCURRENCY)
+        reused: List[str] = []
+
+        async def review(name: str, text: str) -> Dict[str, Any]:
+            key = self._section_key(name, section_hashes[name])
+            cached = self.section_cache.get(key)
+            if cached is not None:
+                reused.append(name)
+                return copy.deepcopy(cached)
+            async with semaphore:
+                section = await self._analyze_section(name, text)
+            self.section_cache.set(key, copy.deepcopy(section))
+            return section
+
+        reviews = await asyncio.gather(*(review(name, text) for name, text in sections))
+        logger.info(f"Analyzed resume in {len(sections)} sections ({len(sections) - len(reused)} reviewed, "
+                    f"{len(reused)} reused): {[name for name, _ in sections]}")
+
+        findings = []
+        for (name, _), section in zip(sections, reviews):
+            findings.append(f"{name}:")
+            findings += [f"+ {strength}" for strength in section["strengths"]]
+            findings += [f"- {improvement}" for improvement in section["improvements"]]
+        rendered = self.prompt_manager.render("resume_merge", section_feedback="\n".join(findings))
+        result = await get_executor('llm').run(self.llm_provider.generate_resume_feedback, rendered.text, 800)
+
+        # The refined resume is the refined sections in their original order; no need to regenerate it
+        result["refined_content"] = "\n\n".join(
+            section["refined_content"].strip() for section in reviews if section["refined_content"].strip()
         )
+        result["truncated"] = rendered.truncated or any(section["truncated"] for section in reviews)
+        return result, reused
 
-        try:
-            result = self.llm_provider.generate_resume_feedback(prompt)
-            return result
-        except Exception as e:
-            raise Exception(f"Failed to analyze resume: {str(e)}")
\ No newline at end of file
+    async def _analyze_section(self, name: str, text: str) -> Dict[str, Any]:
+        rendered = self.prompt_manager.render("resume_section_analysis", section_name=name, section_text=text)
+        section = await get_executor('llm').run(self.llm_provider.generate_resume_feedback, rendered.text, 1000)
+        section["truncated"] = rendered.truncated
+        return section
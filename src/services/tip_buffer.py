@@ -0,0 +1,183 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Tips at least this similar (Jaccard over word 3-shingles) to a sent or queued tip are rejected
+DUPLICATE_SIMILARITY = float(os.getenv('TIP_DUPLICATE_SIMILARITY', '0.35'))
+SHINGLE_WORDS = 3
+SENT_HISTORY = 365
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TOPIC = re.compile(r"Today's Topic:\s*(.+?)\**\s*$", re.IGNORECASE | re.MULTILINE)
+
+def shingles(text: str) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def tip_topic(text: str) -> Optional[str]:
+    """The '**Today's Topic: ...**' line the daily tip prompt asks for, normalized"""
+    match = _TOPIC.search(text)
+    return " ".join(_WORD.findall(match.group(1).lower())) if match else None
+
+class TipBuffer:
+    """
+    Queue of pre-generated daily tips plus the history of sent ones, in a SQLite
+    file so replicas sharing the records volume (see task_leases) see one
+    buffer: every operation re-reads it inside a write transaction, so a tip is
+    popped once and no replica writes back a stale copy. A new tip is refused
+    when its topic or its text is too close to any sent or queued tip. Methods
+    block on file I/O; call them off the event loop.
+    """
+    DATA_DIR = Path("data/user_data")
+    RECORDS_DIR = DATA_DIR / "records"
+
+    BUFFER_DB = RECORDS_DIR / "daily_tip_buffer.db"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tips (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        text TEXT NOT NULL,
+        topic TEXT,
+        generated_at TEXT,
+        sent_at TEXT
+    );
+    """
+
+    _shared: Optional['TipBuffer'] = None
+
+    @classmethod
+    def shared(cls) -> 'TipBuffer':
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path is not None else self.BUFFER_DB
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+        # Shingle sets are derived, so they are cached in memory instead of stored
+        self._shingles: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; writes take the database lock up front with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _entries(self, conn: sqlite3.Connection) -> Dict[str, List[sqlite3.Row]]:
+        rows = conn.execute("SELECT id, text, topic, sent_at FROM tips ORDER BY id").fetchall()
+        texts = {row['text'] for row in rows}
+        with self._lock:
+            # Drop shingles of tips that have left the buffer
+            self._shingles = {text: cached for text, cached in self._shingles.items() if text in texts}
+        return {
+            'pending': [row for row in rows if row['sent_at'] is None],
+            'sent': [row for row in rows if row['sent_at'] is not None],
+        }
+
+    def _shingles_of(self, text: str) -> Set[str]:
+        with self._lock:
+            cached = self._shingles.get(text)
+            if cached is None:
+                cached = self._shingles[text] = shingles(text)
+            return cached
+
+    def pending_count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tips WHERE sent_at IS NULL").fetchone()[0]
+        finally:
+            conn.close()
+
+    def find_duplicate(self, text: str) -> Optional[str]:
+        """Why a tip would be rejected, or None if it is new enough"""
+        conn = self._connect()
+        try:
+            return self._find_duplicate(self._entries(conn), text)
+        finally:
+            conn.close()
+
+    def _find_duplicate(self, entries: Dict[str, List[sqlite3.Row]], text: str) -> Optional[str]:
+        topic = tip_topic(text)
+        candidate = shingles(text)
+        for kind in ('pending', 'sent'):
+            for entry in entries[kind]:
+                if topic and topic == entry['topic']:
+                    return f"same topic as a {kind} tip ({topic})"
+                similarity = jaccard(candidate, self._shingles_of(entry['text']))
+                if similarity >= DUPLICATE_SIMILARITY:
+                    return f"{similarity:.0%} similar to a {kind} tip"
+        return None
+
+    def add(self, text: str) -> Optional[str]:
+        """Queue a tip; returns the rejection reason for near-duplicates instead"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            reason = self._find_duplicate(self._entries(conn), text)
+            if reason is not None:
+                conn.execute("ROLLBACK")
+                return reason
+            conn.execute("INSERT INTO tips (text, topic, generated_at) VALUES (?, ?, ?)",
+                         (text, tip_topic(text), _now()))
+            conn.execute("COMMIT")
+            return None
+        finally:
+            conn.close()
+
+    def pop(self) -> Optional[str]:
+        """Take the next queued tip and move it to the sent history"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT id, text FROM tips WHERE sent_at IS NULL ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute("UPDATE tips SET sent_at = ? WHERE id = ?", (_now(), row['id']))
+            self._prune_sent(conn)
+            conn.execute("COMMIT")
+            return row['text']
+        finally:
+            conn.close()
+
+    def record_sent(self, text: str) -> None:
+        """Remember a tip generated on the spot, so queued ones aren't compared against stale history"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT INTO tips (text, topic, sent_at) VALUES (?, ?, ?)", (text, tip_topic(text), _now()))
+            self._prune_sent(conn)
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _prune_sent(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "DELETE FROM tips WHERE sent_at IS NOT NULL AND id NOT IN "
+            "(SELECT id FROM tips WHERE sent_at IS NOT NULL ORDER BY sent_at DESC, id DESC LIMIT ?)",
+            (SENT_HISTORY,)
+        )
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
@@ -0,0 +1,28 @@
+"""
+Compile the authoring question files into the SQLite question store.
+
+Usage:
+    python -m src.tools.build_question_bank [--source data/questions] [--output path/to/questions.db]
+
+The bot also recompiles automatically at startup when the authoring files
+changed; run this as a build step to ship a ready store and skip that work.
+"""
+import argparse
+import logging
+import time
+
+from ..providers.question_store import compile_question_store, default_store_path
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile question JSON into the SQLite question store")
+    parser.add_argument('--source', default="data/questions", help="Directory with {type}.json/.jsonl files")
+    parser.add_argument('--output', help="Store path (default: <source>/compiled/questions.db)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    count = compile_question_store(args.source, args.output or default_store_path(args.source))
+    print(f"Compiled {count} questions in {time.perf_counter() - start:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Bulk profile import/export and storage benchmark for DataManager backends.
+
+Usage:
+    python -m src.tools.profile_bench generate --count 1000000 --output /tmp/profiles.jsonl
+    python -m src.tools.profile_bench import --input /tmp/profiles.jsonl --data-dir /tmp/bench
+    python -m src.tools.profile_bench export --output /tmp/export.jsonl --data-dir /tmp/bench
+    python -m src.tools.profile_bench bench --count 100000 --data-dir /tmp/bench
+
+--backend takes a registered name ('file') or 'package.module:ClassName' for a
+DataManager subclass whose constructor accepts data_dir.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from ..providers.data.data_manager import DataManager
+from ..providers.data.file_data_manager import FileDataManager
+from ..providers.data.leaderboard import CoinLeaderboard
+
+BACKENDS: Dict[str, Callable[[Path], DataManager]] = {
+    'file': lambda data_dir: FileDataManager(data_dir=data_dir),
+}
+
+def create_backend(name: str, data_dir: Path) -> DataManager:
+    if name in BACKENDS:
+        return BACKENDS[name](data_dir)
+    if ':' not in name:
+        raise SystemExit(f"Unknown backend '{name}'. Use one of {sorted(BACKENDS)} or 'module:ClassName'.")
+    module_name, class_name = name.split(':', 1)
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(data_dir=data_dir)
+
+def synthetic_profiles(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield realistic-looking profiles with a long-tailed coin distribution"""
+    rng = random.Random(seed)
+    today = date.today()
+    for i in range(count):
+        last_activity = today - timedelta(days=rng.randint(0, 60))
+        yield {
+            'user_id': str(100000000000000000 + i),
+            'total_coins': int(rng.paretovariate(1.5) * 50),
+            'current_streak': {'count': rng.randint(0, 30), 'last_activity_date': last_activity.isoformat()},
+            'last_check_in_date': last_activity.isoformat()
+        }
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+async def import_profiles(manager: DataManager, profiles: Iterator[Dict[str, Any]], batch_size: int) -> int:
+    total = 0
+    batch: List[Dict[str, Any]] = []
+    for profile in profiles:
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            await manager.save_profiles(batch)
+            total += len(batch)
+            batch = []
+            print(f"  imported {total} profiles")
+    if batch:
+        await manager.save_profiles(batch)
+        total += len(batch)
+    return total
+
+class LatencyRecorder:
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: List[float] = []
+        self.items = 0
+
+    def record(self, seconds: float, items: int = 1) -> None:
+        self.samples.append(seconds)
+        self.items += items
+
+    def report(self) -> str:
+        if not self.samples:
+            return f"{self.name:<18} no samples"
+        ordered = sorted(self.samples)
+        p50 = ordered[int(0.50 * (len(ordered) - 1))]
+        p99 = ordered[int(0.99 * (len(ordered) - 1))]
+        elapsed = sum(ordered)
+        throughput = self.items / elapsed if elapsed else float('inf')
+        return (f"{self.name:<18} n={len(ordered):<6} items/s={throughput:>12.1f} "
+                f"p50={p50 * 1000:>10.3f}ms p99={p99 * 1000:>10.3f}ms")
+
+async def timed(recorder: LatencyRecorder, coro, items: int = 1):
+    start = time.perf_counter()
+    result = await coro
+    recorder.record(time.perf_counter() - start, items)
+    return result
+
+async def run_benchmark(manager: DataManager, samples: int, batch_size: int, seed: int) -> List[LatencyRecorder]:
+    rng = random.Random(seed)
+
+    # Collect the stored ids once so every operation targets existing profiles
+    user_ids = [profile['user_id'] async for profile in manager.iter_profiles()]
+    if not user_ids:
+        raise SystemExit("Backend has no profiles; run 'import' or pass --count first.")
+    print(f"Benchmarking {manager.__class__.__name__} with {len(user_ids)} profiles")
+
+    get_single = LatencyRecorder('get_user_profile')
+    save_single = LatencyRecorder('save_user_profile')
+    get_batch = LatencyRecorder(f'get_profiles[{batch_size}]')
+    save_batch = LatencyRecorder(f'save_profiles[{batch_size}]')
+    board_build = LatencyRecorder('leaderboard_build')
+    board_update = LatencyRecorder('leaderboard_update')
+    board_top = LatencyRecorder('leaderboard_top10')
+    board_rank = LatencyRecorder('leaderboard_rank')
+
+    for _ in range(samples):
+        profile = await timed(get_single, manager.get_user_profile(rng.choice(user_ids)))
+        profile['total_coins'] += 1
+        await timed(save_single, manager.save_user_profile(profile))
+
+    batch_rounds = max(1, samples // 10)
+    for _ in range(batch_rounds):
+        ids = rng.sample(user_ids, min(batch_size, len(user_ids)))
+        profiles = await timed(get_batch, manager.get_profiles(ids), len(ids))
+        for profile in profiles.values():
+            profile['total_coins'] += 1
+        await timed(save_batch, manager.save_profiles(list(profiles.values())), len(profiles))
+
+    async def build_board():
+        scores = [(p['user_id'], p.get('total_coins', 0)) async for p in manager.iter_profiles()]
+        return CoinLeaderboard(scores)
+
+    board = await timed(board_build, build_board(), len(user_ids))
+    for _ in range(samples * 10):
+        user_id = rng.choice(user_ids)
+        start = time.perf_counter()
+        board.update(user_id, (board.coins(user_id) or 0) + rng.randint(1, 500))
+        board_update.record(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        board.top(10)
+        board_top.record(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        board.rank(user_id)
+        board_rank.record(time.perf_counter() - start)
+
+    return [get_single, save_single, get_batch, save_batch, board_build, board_update, board_top, board_rank]
+
+async def main_async(args) -> None:
+    if args.command == 'generate':
+        output = Path(args.output)
+        with open(output, 'w') as f:
+            for profile in synthetic_profiles(args.count, args.seed):
+                f.write(json.dumps(profile) + '\n')
+        print(f"Wrote {args.count} synthetic profiles to {output}")
+        return
+
+    data_dir = Path(args.data_dir)
+    manager = create_backend(args.backend, data_dir)
+
+    if args.command == 'import':
+        start = time.perf_counter()
+        total = await import_profiles(manager, read_jsonl(Path(args.input)), args.batch_size)
+        print(f"Imported {total} profiles in {time.perf_counter() - start:.1f}s")
+
+    elif args.command == 'export':
+        count = 0
+        with open(args.output, 'w') as f:
+            async for profile in manager.iter_profiles():
+                f.write(json.dumps(profile) + '\n')
+                count += 1
+        print(f"Exported {count} profiles to {args.output}")
+
+    elif args.command == 'bench':
+        if args.count:
+            start = time.perf_counter()
+            total = await import_profiles(manager, synthetic_profiles(args.count, args.seed), args.import_batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"Loaded {total} synthetic profiles in {elapsed:.1f}s ({total / elapsed:.0f} profiles/s)")
+        for recorder in await run_benchmark(manager, args.samples, args.batch_size, args.seed):
+            print(recorder.report())
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile storage import/export and benchmark tool")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help="Write synthetic profiles to a JSONL file")
+    generate.add_argument('--count', type=int, required=True)
+    generate.add_argument('--output', required=True)
+    generate.add_argument('--seed', type=int, default=42)
+
+    for name, help_text in (('import', "Import profiles from a JSONL file into a backend"),
+                            ('export', "Export every profile of a backend to a JSONL file"),
+                            ('bench', "Benchmark get/save/batch/leaderboard operations")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--backend', default='file')
+        sub.add_argument('--data-dir', required=True, help="Backend data directory (never point this at live data)")
+        if name == 'import':
+            sub.add_argument('--input', required=True)
+            sub.add_argument('--batch-size', type=int, default=50000)
+        elif name == 'export':
+            sub.add_argument('--output', required=True)
+        else:
+            sub.add_argument('--count', type=int, default=0, help="Load this many synthetic profiles first")
+            sub.add_argument('--import-batch-size', type=int, default=50000)
+            sub.add_argument('--samples', type=int, default=100, help="Single get/save operations to time")
+            sub.add_argument('--batch-size', type=int, default=100, help="Profiles per batch operation")
+            sub.add_argument('--seed', type=int, default=42)
+
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""
+Prompt token profiler and benchmark for every template in prompts.json.
+
+Usage:
+    python -m src.tools.prompt_bench
+    python -m src.tools.prompt_bench --history 0,1,2,4,8,16,32 --corpus my_corpus.json
+    python -m src.tools.prompt_bench --e2e --calls 20
+
+Renders each template against a corpus of representative inputs and reports
+estimated input tokens, how often the template's budget forced truncation,
+and how evaluation and summary prompts grow with interview length. --e2e also
+sends every prompt through LLMProvider with the fake backend (LLM_BACKEND=fake,
+see providers/fake_bedrock.py) and reports output tokens and end-to-end latency.
+
+A corpus file is JSON with any of these keys (missing keys use the built-in corpus):
+    {"interviews": [{"interview_type": "technical", "level": "medium",
+                     "turns": [{"question": "...", "answer": "...", "follow_ups": [...]}]}],
+     "coach_questions": ["..."],
+     "resumes": ["..."]}
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, List
+
+from ..providers.prompt_manager import PromptManager
+from ..providers.question_provider import QuestionProvider
+from ..providers.llm_provider import LLMProvider, usage_scope
+from ..services.resume_sections import split_sections
+from ..services.resume_service import ResumeService
+from .profile_bench import LatencyRecorder
+
+ANSWER_SENTENCES = [
+    "In my last role I owned the service end to end, from design reviews to on-call.",
+    "We measured p99 latency before and after the change and saw it drop by about forty percent.",
+    "I started by clarifying the requirements and the expected read and write volumes.",
+    "The main trade-off was consistency versus availability during a network partition.",
+    "I set up a short meeting with the other team to agree on the interface and a rollout plan.",
+    "Looking back, I would have added load tests earlier to catch the regression sooner.",
+    "A hash map gives constant time lookups on average, at the cost of extra memory.",
+    "We sharded the table by customer id so that hot tenants did not affect everyone else.",
+]
+
+COACH_QUESTIONS = [
+    "How should I answer 'What's your greatest weakness?'",
+    "How do I explain a six month gap in my resume?",
+    "What should I do if I freeze during a coding interview?",
+    "How much detail should I give when describing a past project in a behavioral round, "
+    "especially when the project was large, involved several teams and took more than a year?",
+]
+
+RESUME_HEADER = """Jane Doe
+jane.doe@example.com | github.com/janedoe
+
+Summary
+Backend engineer with eight years of experience building payment and data systems.
+"""
+
+RESUME_EXPERIENCE = """Software Engineer, Example Corp (2019 - 2023)
+- Designed and shipped a payments reconciliation service handling 2M transactions a day
+- Reduced API p99 latency from 800ms to 350ms by batching database reads
+- Mentored three junior engineers and ran the team's interview loop
+"""
+
+RESUME_FOOTER = """
+Education
+BSc Computer Science, Example University (2015)
+
+Skills
+Python, Go, PostgreSQL, Kafka, AWS, Terraform, Kubernetes
+"""
+
+def _answer(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(ANSWER_SENTENCES) for _ in range(sentences))
+
+def builtin_corpus(seed: int = 42) -> Dict[str, Any]:
+    """Interviews drawn from the question bank with short, typical and long answers"""
+    rng = random.Random(seed)
+    questions = QuestionProvider()
+    interviews = []
+    for interview_type in ("behavioral", "technical", "system_design"):
+        for level, sentences in (("easy", 2), ("medium", 5), ("hard", 12)):
+            try:
+                question = questions.get_random_question(interview_type, level)['question']
+            except ValueError:
+                continue
+            turns = []
+            for _ in range(4):
+                turns.append({
+                    'question': question,
+                    'answer': _answer(rng, sentences),
+                    'follow_ups': [{'question': "What measurable outcome did your approach lead to?",
+                                    'answer': _answer(rng, max(1, sentences // 2))}]
+                })
+            interviews.append({'interview_type': interview_type, 'level': level, 'turns': turns})
+
+    resumes = [f"{RESUME_HEADER}\nExperience\n{RESUME_EXPERIENCE * pages * 4}{RESUME_FOOTER}" for pages in (1, 2, 4, 8)]
+    return {'interviews': interviews, 'coach_questions': COACH_QUESTIONS, 'resumes': resumes}
+
+def load_corpus(path: str, seed: int) -> Dict[str, Any]:
+    corpus = builtin_corpus(seed)
+    if path:
+        with open(path, 'r') as f:
+            corpus.update(json.load(f))
+    return corpus
+
+def _history(turns: List[Dict[str, Any]], length: int) -> List[Dict[str, Any]]:
+    """Repeat the interview's turns to the requested history length"""
+    return [turns[i % len(turns)] for i in range(length)]
+
+def template_inputs(corpus: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Keyword arguments for every template, built exactly the way LLMProvider builds them"""
+    inputs = {name: [] for name in ('evaluation', 'summary', 'interview_coach', 'resume_analysis', 'daily_tech_tip',
+                                    'resume_section_analysis', 'resume_merge')}
+    for interview in corpus['interviews']:
+        turns = interview['turns']
+        inputs['evaluation'].append({
+            'interview_type': interview['interview_type'],
+            'level': interview['level'],
+            'question_history': LLMProvider._format_question_history(turns[:-1]),
+            'current_question': turns[-1]['question'],
+            'current_response': turns[-1]['answer']
+        })
+        inputs['summary'].append({
+            'interview_type': interview['interview_type'],
+            'level': interview['level'],
+            'questions_and_responses': LLMProvider._format_transcript(turns)
+        })
+    inputs['interview_coach'] = [{'question': question} for question in corpus['coach_questions']]
+    inputs['resume_analysis'] = [{'resume_text': resume} for resume in corpus['resumes']]
+    for resume in corpus['resumes']:
+        sections = split_sections(resume)
+        inputs['resume_section_analysis'] += [{'section_name': name, 'section_text': text} for name, text in sections]
+        # Typical reduce input: a name line plus three findings per section
+        findings = "\n".join(f"{name}:\n+ {ANSWER_SENTENCES[0]}\n- {ANSWER_SENTENCES[1]}\n- {ANSWER_SENTENCES[5]}"
+                             for name, _ in sections)
+        inputs['resume_merge'].append({'section_feedback': findings})
+    inputs['daily_tech_tip'] = [{}]
+    return inputs
+
+def _percentile(values: List[int], fraction: float) -> int:
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+def report_templates(prompt_manager: PromptManager, inputs: Dict[str, List[Dict[str, Any]]]) -> None:
+    print(f"{'template':<24} {'n':>4} {'fixed':>6} {'p50':>7} {'max':>7} {'budget':>7} {'truncated':>9}")
+    for name, template in prompt_manager.templates.items():
+        samples = inputs.get(name)
+        if not samples:
+            print(f"{name:<24} no corpus inputs")
+            continue
+        rendered = [template.render(**kwargs) for kwargs in samples]
+        tokens = [r.tokens for r in rendered]
+        truncated = sum(r.truncated for r in rendered)
+        print(f"{name:<24} {len(tokens):>4} {template.fixed_tokens:>6} {_percentile(tokens, 0.5):>7} "
+              f"{max(tokens):>7} {template.max_tokens or '-':>7} {truncated:>9}")
+
+def report_growth(prompt_manager: PromptManager, corpus: Dict[str, Any], lengths: List[int]) -> None:
+    """Input tokens of evaluation and summary prompts as the interview gets longer"""
+    interview = max(corpus['interviews'], key=lambda i: len(LLMProvider._format_transcript(i['turns'])))
+    turns = interview['turns']
+    print(f"\nGrowth with history length ({interview['interview_type']}, {interview['level']} answers)")
+    print(f"{'turns':>6} {'evaluation':>11} {'summary':>9}")
+    for length in lengths:
+        evaluation = prompt_manager.render(
+            'evaluation', interview_type=interview['interview_type'], level=interview['level'],
+            question_history=LLMProvider._format_question_history(_history(turns, length)),
+            current_question=turns[0]['question'], current_response=turns[0]['answer'])
+        summary = prompt_manager.render(
+            'summary', interview_type=interview['interview_type'], level=interview['level'],
+            questions_and_responses=LLMProvider._format_transcript(_history(turns, max(length, 1))))
+        print(f"{length:>6} {evaluation.tokens:>10}{'*' if evaluation.truncated else ' '} "
+              f"{summary.tokens:>8}{'*' if summary.truncated else ' '}")
+    print("(* = truncated to the template budget)")
+
+def run_end_to_end(corpus: Dict[str, Any], calls: int) -> None:
+    """Time every LLMProvider entry point against the fake backend"""
+    os.environ['LLM_BACKEND'] = 'fake'
+    provider = LLMProvider()
+    prompt_manager = provider.prompt_manager
+
+    def evaluation(i):
+        interview = corpus['interviews'][i % len(corpus['interviews'])]
+        turns = interview['turns']
+        provider.evaluate_response(interview['interview_type'], interview['level'], turns[:-1],
+                                   turns[-1]['question'], turns[-1]['answer'])
+
+    def summary(i):
+        interview = corpus['interviews'][i % len(corpus['interviews'])]
+        provider.generate_interview_summary(interview['interview_type'], interview['level'], interview['turns'])
+
+    def interview_coach(i):
+        question = corpus['coach_questions'][i % len(corpus['coach_questions'])]
+        provider.generate_coach_response(prompt_manager.format_prompt('interview_coach', question=question))
+
+    def resume_analysis(i):
+        resume = corpus['resumes'][i % len(corpus['resumes'])]
+        provider.generate_resume_feedback(prompt_manager.format_prompt('resume_analysis', resume_text=resume))
+
+    resume_service = ResumeService()
+    resume_service.llm_provider = provider
+
+    def resume_service_analysis(i):
+        # Whole-resume or map-reduce analysis, whichever ResumeService picks for this length
+        resume_service.feedback_cache.clear()
+        asyncio.run(resume_service.analyze_resume(corpus['resumes'][i % len(corpus['resumes'])]))
+
+    def daily_tech_tip(i):
+        asyncio.run(provider.create_daily_tip())
+
+    print(f"\nEnd to end against the fake backend ({calls} calls each)")
+    print(f"{'template':<18} {'in p50':>7} {'out p50':>8}  latency")
+    for name, call in (('evaluation', evaluation), ('summary', summary), ('interview_coach', interview_coach),
+                       ('resume_analysis', resume_analysis), ('resume_service', resume_service_analysis),
+                       ('daily_tech_tip', daily_tech_tip)):
+        recorder = LatencyRecorder(name)
+        input_tokens, output_tokens = [], []
+        for i in range(calls):
+            # Totals every model call the entry point makes, e.g. all map-reduce sections
+            with usage_scope() as usage:
+                start = time.perf_counter()
+                call(i)
+                recorder.record(time.perf_counter() - start)
+            input_tokens.append(usage.input_tokens)
+            output_tokens.append(usage.output_tokens)
+        print(f"{name:<18} {_percentile(input_tokens, 0.5):>7} {_percentile(output_tokens, 0.5):>8}  "
+              f"{recorder.report()}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prompt token profiler and benchmark")
+    parser.add_argument('--corpus', default='', help="JSON corpus file overriding the built-in inputs")
+    parser.add_argument('--prompts', default='data/prompts/prompts.json')
+    parser.add_argument('--history', default='0,1,2,4,8,16,32,64', help="History lengths for the growth report")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--e2e', action='store_true', help="Also call LLMProvider with the fake backend")
+    parser.add_argument('--calls', type=int, default=10, help="Calls per template for --e2e")
+    args = parser.parse_args()
+
+    # The providers log every prompt at DEBUG; keep the report readable
+    logging.getLogger().setLevel(logging.WARNING)
+
+    prompt_manager = PromptManager(args.prompts)
+    corpus = load_corpus(args.corpus, args.seed)
+
+    report_templates(prompt_manager, template_inputs(corpus))
+    report_growth(prompt_manager, corpus, [int(n) for n in args.history.split(',')])
+    if args.e2e:
+        run_end_to_end(corpus, args.calls)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional, Union
+
+import aiohttp
+
+from .document_parser import MAX_DOCUMENT_BYTES, DocumentTooLarge
+
+logger = logging.getLogger(__name__)
+
+# Downloads stay in memory up to this size and spill to a temporary file beyond it
+SPOOL_THRESHOLD_BYTES = int(os.getenv('ATTACHMENT_SPOOL_BYTES', str(1024 * 1024)))
+CHUNK_BYTES = 64 * 1024
+DOWNLOAD_TIMEOUT_SECONDS = 60
+
+class DownloadedFile(NamedTuple):
+    source: Union[bytes, str]  # The content, or the path of a temporary copy once spilled
+    digest: str  # SHA-256 of the content
+    size: int
+
+_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT_SECONDS))
+    return _session
+
+async def close_http_session() -> None:
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        await session.close()
+
+def _too_large(size: int, max_bytes: int) -> DocumentTooLarge:
+    return DocumentTooLarge(f"File is too large ({size // 1024} KB). The limit is {max_bytes // 1024} KB.")
+
+@asynccontextmanager
+async def download_attachment(attachment, max_bytes: int = MAX_DOCUMENT_BYTES) -> AsyncIterator[DownloadedFile]:
+    """
+    Stream a Discord attachment, hashing it on the way. Files over max_bytes are
+    rejected from the attachment's declared size before any byte is fetched, and
+    again if the stream runs past it. Content beyond SPOOL_THRESHOLD_BYTES goes to
+    a named temporary file (so a parser process can open it), removed on exit.
+    """
+    if attachment.size > max_bytes:
+        raise _too_large(attachment.size, max_bytes)
+
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    spill = None
+    size = 0
+    try:
+        async with _get_session().get(attachment.url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(size, max_bytes)
+                digest.update(chunk)
+                if spill is None and len(buffer) + len(chunk) > SPOOL_THRESHOLD_BYTES:
+                    spill = tempfile.NamedTemporaryFile(prefix='upload-', suffix=os.path.splitext(attachment.filename)[1],
+                                                        delete=False)
+                    spill.write(buffer)
+                    buffer = bytearray()
+                if spill is not None:
+                    spill.write(chunk)
+                else:
+                    buffer += chunk
+
+        if spill is not None:
+            spill.close()
+            logger.debug(f"Spooled {size} byte attachment {attachment.filename} to {spill.name}")
+            yield DownloadedFile(spill.name, digest.hexdigest(), size)
+        else:
+            yield DownloadedFile(bytes(buffer), digest.hexdigest(), size)
+    finally:
+        if spill is not None:
+            spill.close()
+            try:
+                os.remove(spill.name)
+            except FileNotFoundError:
+                pass
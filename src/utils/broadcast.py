@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LIMIT = 2000
+
+# Channels sent to at once; each channel is its own Discord rate-limit bucket,
+# so this mostly keeps a large fan-out under the global request limit
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', '5'))
+MAX_RATE_LIMIT_RETRIES = 3
+FENCE = "```"
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+    """
+    Split text into messages of at most `limit` characters, preferring paragraph,
+    then line, then word boundaries. A code block cut in two is closed at the end
+    of one message and reopened (with its language) at the start of the next.
+    """
+    chunks: List[str] = []
+    rest = text.strip()
+    reopen = ""
+    while rest:
+        rest = reopen + rest
+        if len(rest) <= limit:
+            chunks.append(rest)
+            break
+
+        # Leave room to close a code block left open by the cut
+        window = rest[:limit - len(FENCE) - 1]
+        cut = _best_cut(window)
+        chunk, rest = rest[:cut].rstrip(), rest[cut:].lstrip('\n')
+
+        reopen = ""
+        open_fence = _open_fence(chunk)
+        if open_fence is not None:
+            chunk += "\n" + FENCE
+            reopen = open_fence + "\n"
+        chunks.append(chunk)
+    return chunks
+
+def _best_cut(window: str) -> int:
+    # Don't accept a boundary in the first half: many tiny messages read worse than a word break
+    floor = len(window) // 2
+    for separator in ("\n\n", "\n", " "):
+        index = window.rfind(separator)
+        if index > floor:
+            return index + len(separator)
+    return len(window)
+
+def _open_fence(chunk: str) -> Optional[str]:
+    """The opening line of a code block left unclosed at the end of chunk, if any"""
+    opening = None
+    for line in chunk.split("\n"):
+        stripped = line.strip()
+        if stripped.startswith(FENCE):
+            if opening is None:
+                opening = stripped if stripped.count(FENCE) == 1 else None
+            elif stripped == FENCE or stripped.endswith(FENCE):
+                opening = None
+    return opening
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds Discord asked us to wait, for rate-limit errors"""
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        header = error.response.headers.get('Retry-After') if error.response is not None else None
+        return float(header) if header else 1.0
+    return None
+
+async def send_with_retry(channel, stats: Optional['BroadcastStats'] = None, **kwargs) -> discord.Message:
+    """channel.send that waits out and retries 429 responses Discord's client gave up on"""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        try:
+            return await channel.send(**kwargs)
+        except (discord.RateLimited, discord.HTTPException) as e:
+            delay = _retry_after(e)
+            if delay is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            if stats is not None:
+                stats.retries += 1
+            logger.warning(f"Rate limited sending to channel {channel.id}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+class BroadcastStats:
+    def __init__(self):
+        self.delivered: List[int] = []
+        self.failed: Dict[int, str] = {}
+        self.missing: List[int] = []
+        self.messages = 0
+        self.retries = 0
+        self.elapsed = 0.0
+
+    def summary(self) -> str:
+        return (f"delivered to {len(self.delivered)} channel(s) in {self.elapsed:.1f}s "
+                f"({self.messages} messages, {self.retries} rate-limit retries), "
+                f"{len(self.failed)} failed, {len(self.missing)} not found")
+
+async def fan_out(bot, channel_ids: Iterable[int],
+                  deliver: Callable[[discord.abc.Messageable, 'BroadcastStats'], Awaitable[None]],
+                  label: str = "broadcast") -> BroadcastStats:
+    """
+    Run deliver(channel, stats) for every channel concurrently, at most
+    BROADCAST_CONCURRENCY at a time. One channel failing doesn't affect the others.
+    """
+    stats = BroadcastStats()
+    semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+    start = time.monotonic()
+
+    async def deliver_to(channel_id: int) -> None:
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            logger.warning(f"[{label}] Could not find channel with ID {channel_id}")
+            stats.missing.append(channel_id)
+            return
+        async with semaphore:
+            try:
+                await deliver(channel, stats)
+                stats.delivered.append(channel_id)
+            except Exception as e:
+                stats.failed[channel_id] = str(e)
+                logger.error(f"[{label}] Failed to deliver to channel {channel_id}: {e}")
+
+    await asyncio.gather(*(deliver_to(channel_id) for channel_id in channel_ids))
+    stats.elapsed = time.monotonic() - start
+    logger.info(f"[{label}] {stats.summary()}")
+    return stats
+
+async def broadcast(bot, channel_ids: Iterable[int], text: str, label: str = "broadcast") -> BroadcastStats:
+    """Send text, split on markdown boundaries, to every channel; each channel gets its chunks in order"""
+    chunks = split_message(text)
+
+    async def deliver(channel, stats: BroadcastStats) -> None:
+        for chunk in chunks:
+            await send_with_retry(channel, stats, content=chunk)
+            stats.messages += 1
+
+    return await fan_out(bot, channel_ids, deliver, label)
@@ -0,0 +1,54 @@
+import logging
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+DMHandler = Callable[[discord.Message], Awaitable[None]]
+
+class _Flow(NamedTuple):
+    name: str
+    handler: DMHandler
+
+class DMRouter:
+    """
+    Tracks the one DM conversation (interview answers, resume upload, ...) each
+    user is in and hands their DMs to that flow's handler alone. A cog starts a
+    flow when it begins talking to a user and ends it when done; starting a
+    second flow while one is active is refused.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._flows: Dict[int, _Flow] = {}
+        bot.add_listener(self.on_message, 'on_message')
+
+    def start(self, user_id: int, name: str, handler: DMHandler) -> Optional[str]:
+        """Begin a flow; returns the name of the user's other active flow instead if there is one"""
+        current = self._flows.get(user_id)
+        if current is not None and current.name != name:
+            return current.name
+        self._flows[user_id] = _Flow(name, handler)
+        return None
+
+    def end(self, user_id: int, name: str) -> None:
+        """End the user's flow if it is the named one"""
+        current = self._flows.get(user_id)
+        if current is not None and current.name == name:
+            del self._flows[user_id]
+
+    def active_flow(self, user_id: int) -> Optional[str]:
+        current = self._flows.get(user_id)
+        return current.name if current is not None else None
+
+    async def on_message(self, message: discord.Message) -> None:
+        if message.author.bot or not isinstance(message.channel, discord.DMChannel):
+            return
+        flow = self._flows.get(message.author.id)
+        if flow is None:
+            return
+        try:
+            await flow.handler(message)
+        except Exception as e:
+            logger.error(f"Error in {flow.name} DM flow for user {message.author.id}: {e}", exc_info=True)
@@ -0,0 +1,207 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from typing import List, NamedTuple, Optional, Union
+
+from .executors import EXECUTOR_WORKERS, get_executor
+from .ttl_cache import TTLCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+# Limits for uploaded documents; parsing stops at the first one reached
+MAX_DOCUMENT_BYTES = int(os.getenv('DOCUMENT_MAX_BYTES', str(5 * 1024 * 1024)))
+MAX_DOCUMENT_PAGES = int(os.getenv('DOCUMENT_MAX_PAGES', '20'))
+MAX_DOCUMENT_CHARS = int(os.getenv('DOCUMENT_MAX_CHARS', '60000'))
+PARSE_TIME_LIMIT_SECONDS = float(os.getenv('DOCUMENT_PARSE_SECONDS', '10'))
+
+# Extra time a worker gets past its own deadline before it is killed
+KILL_GRACE_SECONDS = 5
+# How often a waiting parse checks whether another parse's timeout killed its pool
+POOL_CHECK_SECONDS = 0.25
+
+# Re-uploads of the same file (often after an error) skip parsing entirely
+extraction_cache = TTLCache(max_entries=256, ttl_seconds=24 * 3600)
+
+SUPPORTED_FORMATS = ['.txt', '.doc', '.docx', '.pdf']
+
+class ExtractionResult(NamedTuple):
+    text: str
+    pages: int  # Pages (PDF) or paragraphs (Word) read
+    limit_hit: Optional[str] = None  # 'pages', 'chars' or 'time' when the text is partial
+
+class DocumentTooLarge(ValueError):
+    pass
+
+class _TextCollector:
+    """Accumulates extracted pieces until a page, character or time limit is reached"""
+
+    def __init__(self, max_pages: int, max_chars: int, time_limit: float):
+        self.parts: List[str] = []
+        self.chars = 0
+        self.pages = 0
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.deadline = time.monotonic() + time_limit
+        self.limit_hit: Optional[str] = None
+
+    def add(self, text: str) -> bool:
+        """Add one page of text; returns False once a limit stops extraction"""
+        if self.pages >= self.max_pages:
+            self.limit_hit = 'pages'
+            return False
+        if time.monotonic() > self.deadline:
+            self.limit_hit = 'time'
+            return False
+        room = self.max_chars - self.chars
+        if len(text) >= room:
+            self.parts.append(text[:room])
+            self.chars = self.max_chars
+            self.pages += 1
+            self.limit_hit = 'chars'
+            return False
+        self.parts.append(text)
+        self.chars += len(text)
+        self.pages += 1
+        return True
+
+    def result(self, separator: str = "\n") -> ExtractionResult:
+        return ExtractionResult(separator.join(self.parts), self.pages, self.limit_hit)
+
+def _open_source(source: Union[bytes, str]):
+    return io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+
+def extract_text(file_ext: str, source: Union[bytes, str], max_pages: int = MAX_DOCUMENT_PAGES,
+                 max_chars: int = MAX_DOCUMENT_CHARS,
+                 time_limit: float = PARSE_TIME_LIMIT_SECONDS) -> ExtractionResult:
+    """
+    Extract text page by page, stopping early at any limit (runs inside a parser process).
+    `source` is the file's bytes or the path of a temporary copy for large uploads.
+    """
+    with _open_source(source) as stream:
+        return _extract_stream(file_ext, stream, _TextCollector(max_pages, max_chars, time_limit))
+
+def _extract_stream(file_ext: str, stream, collector: _TextCollector) -> ExtractionResult:
+    if file_ext == '.txt':
+        collector.max_pages = 1
+        collector.add(stream.read(collector.max_chars * 4).decode('utf-8', errors='replace'))
+        return collector.result()
+
+    if file_ext == '.pdf':
+        import PyPDF2
+        reader = PyPDF2.PdfReader(stream)
+        # Pages are parsed lazily, so stopping early skips the rest of the document
+        for page in reader.pages:
+            if not collector.add(page.extract_text() or ""):
+                break
+        return collector.result()
+
+    if file_ext in ('.doc', '.docx'):
+        import docx
+        document = docx.Document(stream)
+        collector.max_pages *= 50  # Roughly fifty paragraphs to a page
+        for paragraph in document.paragraphs:
+            if not collector.add(paragraph.text):
+                break
+        return collector.result()
+
+    raise ValueError(f"Unsupported file format. Supported formats: {', '.join(SUPPORTED_FORMATS)}")
+
+_pool = None
+_pool_lock = threading.Lock()
+# Pools terminated because one of their workers was stuck
+_killed_pools = weakref.WeakSet()
+
+class _PoolKilled(Exception):
+    """Another parse's timeout terminated the pool this job was queued or running in"""
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned (not forked) workers: the bot process is multi-threaded.
+            # Recycling workers bounds memory held by the PDF and Word libraries.
+            context = multiprocessing.get_context('spawn')
+            _pool = context.Pool(processes=EXECUTOR_WORKERS['document-parse'], maxtasksperchild=50)
+        return _pool
+
+def _reset_pool(pool) -> None:
+    """Kill a pool whose worker is stuck; the next parse starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+        _killed_pools.add(pool)
+    pool.terminate()
+
+def _wait_for(pool, job, timeout: float) -> ExtractionResult:
+    """job's result; raises multiprocessing.TimeoutError, or _PoolKilled if the pool died under it"""
+    deadline = time.monotonic() + timeout
+    while not job.ready():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise multiprocessing.TimeoutError()
+        job.wait(min(remaining, POOL_CHECK_SECONDS))
+        if not job.ready() and pool in _killed_pools:
+            raise _PoolKilled()
+    return job.get()
+
+def _parse_blocking(file_ext: str, source: Union[bytes, str], size: int) -> ExtractionResult:
+    # A timeout kills the whole pool; jobs that were only sharing it get one retry on a fresh pool
+    for _ in range(2):
+        pool = _get_pool()
+        job = pool.apply_async(extract_text, (file_ext, source))
+        try:
+            return _wait_for(pool, job, PARSE_TIME_LIMIT_SECONDS + KILL_GRACE_SECONDS)
+        except _PoolKilled:
+            logger.warning(f"Parser processes were restarted during a {size} byte {file_ext} parse; retrying")
+        except multiprocessing.TimeoutError:
+            logger.error(f"Document parser exceeded {PARSE_TIME_LIMIT_SECONDS}s on a {size} byte {file_ext}; "
+                         f"restarting parser processes")
+            _reset_pool(pool)
+            raise ValueError("The document took too long to read. Please try a simpler file or paste the text.")
+    raise ValueError("The document reader was restarted while reading your file. Please try again.")
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+async def parse_document(file_ext: str, source: Union[bytes, str], digest: Optional[str] = None) -> ExtractionResult:
+    """
+    Extract text from an uploaded document (its bytes, or a file path) in a separate process.
+    Oversized files are rejected; page, character and time limits return partial text.
+    `digest` is the SHA-256 of the content when the caller already computed it.
+    """
+    if file_ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format. Supported formats: {', '.join(SUPPORTED_FORMATS)}")
+    size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+    if size > MAX_DOCUMENT_BYTES:
+        raise DocumentTooLarge(f"File is too large ({size // 1024} KB). "
+                               f"The limit is {MAX_DOCUMENT_BYTES // 1024} KB.")
+
+    if digest is None:
+        digest = content_hash(source) if isinstance(source, bytes) else await get_executor('disk').run(_file_hash, source)
+    cache_key = (digest, file_ext)
+    cached = extraction_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # The document-parse executor's threads bound how many parses run at once
+    result = await get_executor('document-parse').run(_parse_blocking, file_ext, source, size)
+    extraction_cache.set(cache_key, result)
+    return result
+
+def shutdown_parser_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,138 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per workload class; each class gets its own pool so a burst of
+# slow Bedrock calls cannot starve file I/O or document parsing
+EXECUTOR_WORKERS = {
+    'llm': int(os.getenv('LLM_EXECUTOR_WORKERS', '8')),
+    'disk': int(os.getenv('DISK_EXECUTOR_WORKERS', '2')),
+    'document-parse': int(os.getenv('DOCUMENT_PARSE_EXECUTOR_WORKERS', '2')),
+}
+
+SAMPLE_WINDOW = 1000  # Recent jobs kept for wait/run percentiles
+
+class WorkloadExecutor:
+    """
+    Named thread pool with queue-depth and wait/run-time metrics.
+    Use `await executor.run(func, *args)` in place of loop.run_in_executor(None, ...).
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=SAMPLE_WINDOW)
+        self._runs = deque(maxlen=SAMPLE_WINDOW)
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.closed = False
+
+    def _job(self, enqueued_at: float, func: Callable, args, kwargs):
+        started_at = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._waits.append(started_at - enqueued_at)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.running -= 1
+                self._runs.append(time.perf_counter() - started_at)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        if self.closed:
+            raise RuntimeError(f"Executor '{self.name}' is shut down")
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        # Run in a copy of the caller's context, as asyncio.to_thread does, so context
+        # variables such as the LLM usage scope follow the job into the worker thread
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, self._job, time.perf_counter(), func, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future) -> None:
+        # Jobs cancelled before starting (caller gave up, or shutdown) never reach _job
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    @staticmethod
+    def _percentile(samples, fraction: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[int(fraction * (len(ordered) - 1))]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits, runs = list(self._waits), list(self._runs)
+            return {
+                'workers': self.max_workers,
+                'running': self.running,
+                'queued': self.queued,
+                'max_queued': self.max_queued,
+                'completed': self.completed,
+                'failed': self.failed,
+                'wait_p50_ms': self._percentile(waits, 0.50) * 1000,
+                'wait_p95_ms': self._percentile(waits, 0.95) * 1000,
+                'run_p50_ms': self._percentile(runs, 0.50) * 1000,
+                'run_p95_ms': self._percentile(runs, 0.95) * 1000,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop queued jobs and optionally wait for running ones"""
+        self.closed = True
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+_executors: Dict[str, WorkloadExecutor] = {}
+
+def get_executor(name: str) -> WorkloadExecutor:
+    if name not in EXECUTOR_WORKERS:
+        raise ValueError(f"Unknown executor: {name}")
+    executor = _executors.get(name)
+    if executor is None:
+        executor = _executors[name] = WorkloadExecutor(name, EXECUTOR_WORKERS[name])
+        logger.info(f"Started '{name}' executor with {executor.max_workers} workers")
+    return executor
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+async def shutdown_executors(timeout: float = 30.0) -> None:
+    """Cancel queued work and give running jobs up to `timeout` seconds to finish"""
+    executors = list(_executors.values())
+    _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False)
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(asyncio.to_thread(executor.shutdown, True) for executor in executors)),
+            timeout
+        )
+        logger.info("All executors shut down")
+    except asyncio.TimeoutError:
+        logger.warning(f"Executors still busy after {timeout}s; abandoning running jobs")
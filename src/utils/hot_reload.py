@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from .executors import get_executor
+
+logger = logging.getLogger(__name__)
+
+class HotReloader:
+    """
+    Polls reloadable sources (question banks, prompt registries) for changed files.
+
+    A source exposes:
+        name                  - label for logs and status
+        loaded_fingerprint    - fingerprint of the data currently served
+        current_fingerprint() - fingerprint of the files on disk
+        build_reload()        - validate and build a new snapshot (blocking)
+        apply_reload(snapshot) - swap the snapshot in
+
+    Snapshots are built in an executor so the event loop never blocks on parsing
+    or compiling; the swap itself is a single reference assignment, so a request
+    either sees the old data or the new data, never a mix. A snapshot that fails
+    validation is discarded and the old data keeps serving until the files change
+    again.
+    """
+
+    def __init__(self, sources: List[Any]):
+        self.sources = sources
+        self._failed: Dict[str, str] = {}  # source name -> fingerprint that failed to build
+        self.last_errors: Dict[str, str] = {}
+        self._lock = asyncio.Lock()
+
+    async def check(self, force: bool = False) -> Dict[str, str]:
+        """Reload every changed source; returns {source name: outcome}"""
+        async with self._lock:
+            results = {}
+            for source in self.sources:
+                outcome = await self._check_source(source, force)
+                if outcome:
+                    results[source.name] = outcome
+            return results
+
+    async def _check_source(self, source: Any, force: bool) -> Optional[str]:
+        disk = get_executor('disk')
+        try:
+            fingerprint = await disk.run(source.current_fingerprint)
+        except OSError as e:
+            logger.warning(f"[{source.name}] Cannot stat source files: {e}")
+            return None
+
+        if fingerprint == source.loaded_fingerprint and not force:
+            return None
+        if self._failed.get(source.name) == fingerprint and not force:
+            return None  # Same broken edit as last time; wait for the next change
+
+        try:
+            snapshot = await disk.run(source.build_reload)
+        except Exception as e:
+            self._failed[source.name] = fingerprint
+            self.last_errors[source.name] = str(e)
+            logger.error(f"[{source.name}] Reload rejected, keeping current version: {e}")
+            return f"rejected: {e}"
+
+        source.apply_reload(snapshot)
+        self._failed.pop(source.name, None)
+        self.last_errors.pop(source.name, None)
+        return "reloaded"
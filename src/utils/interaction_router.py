@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+ReactionHandler = Callable[[discord.Reaction, discord.User], Awaitable[None]]
+ReactionCheck = Callable[[discord.Reaction, discord.User], bool]
+
+class _Route:
+    __slots__ = ('handler', 'check', 'once', 'on_expire', 'timer')
+
+    def __init__(self, handler: ReactionHandler, check: Optional[ReactionCheck], once: bool,
+                 on_expire: Optional[Callable[[], Awaitable[None]]]):
+        self.handler = handler
+        self.check = check
+        self.once = once
+        self.on_expire = on_expire
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+class InteractionRouter:
+    """
+    Single reaction listener for the bot. Handlers are registered per message
+    id, so each reaction costs one dict lookup instead of running every cog's
+    listener and every pending wait_for check. Routes expire after their
+    timeout. Bot reactions (including our own option emojis) are never routed.
+
+    Button and select interactions are already dispatched per message by
+    discord.py's view store, so views need no routing here.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._routes: Dict[int, _Route] = {}
+        bot.add_listener(self.on_reaction_add, 'on_reaction_add')
+
+    def register(self, message_id: int, handler: ReactionHandler, *, check: Optional[ReactionCheck] = None,
+                 timeout: Optional[float] = None, once: bool = True,
+                 on_expire: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        """
+        Call handler(reaction, user) for reactions on message_id that pass check.
+        A `once` route is removed before its handler runs, so concurrent reactions
+        can't both claim it. on_expire runs if the timeout passes first.
+        """
+        self.unregister(message_id)
+        route = _Route(handler, check, once, on_expire)
+        if timeout is not None:
+            route.timer = asyncio.get_running_loop().call_later(timeout, self._expire, message_id, route)
+        self._routes[message_id] = route
+
+    def unregister(self, message_id: int) -> None:
+        route = self._routes.pop(message_id, None)
+        if route is not None and route.timer is not None:
+            route.timer.cancel()
+
+    def is_registered(self, message_id: int) -> bool:
+        return message_id in self._routes
+
+    async def wait(self, message_id: int, *, timeout: float,
+                   check: Optional[ReactionCheck] = None) -> Tuple[discord.Reaction, discord.User]:
+        """Like bot.wait_for('reaction_add') scoped to one message; raises asyncio.TimeoutError"""
+        future = asyncio.get_running_loop().create_future()
+
+        async def resolve(reaction, user):
+            if not future.done():
+                future.set_result((reaction, user))
+
+        self.register(message_id, resolve, check=check)
+        route = self._routes[message_id]
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if self._routes.get(message_id) is route:
+                self.unregister(message_id)
+
+    def _expire(self, message_id: int, route: _Route) -> None:
+        if self._routes.get(message_id) is not route:
+            return
+        del self._routes[message_id]
+        if route.on_expire is not None:
+            asyncio.get_running_loop().create_task(self._run(route.on_expire(), f"expiry of message {message_id}"))
+
+    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User) -> None:
+        route = self._routes.get(reaction.message.id)
+        if route is None or user.bot:
+            return
+        try:
+            if route.check is not None and not route.check(reaction, user):
+                return
+        except Exception as e:
+            logger.error(f"Reaction check for message {reaction.message.id} failed: {e}", exc_info=True)
+            return
+        if route.once:
+            self.unregister(reaction.message.id)
+        await self._run(route.handler(reaction, user), f"reaction on message {reaction.message.id}")
+
+    @staticmethod
+    async def _run(coro: Awaitable[None], label: str) -> None:
+        try:
+            await coro
+        except Exception as e:
+            logger.error(f"Error handling {label}: {e}", exc_info=True)
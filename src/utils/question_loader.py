@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import discord
 from pathlib import Path
 import logging
@@ -95,6 +95,24 @@ class QuestionLoader:
             logger.error(f"Error getting random question: {e}")
             return None
 
+    def draw_question(self, decks: Dict[str, List[int]], interview_type: str, difficulty: str = "medium",
+                      owner: str = "") -> Optional[Dict[str, Any]]:
+        """Draw an unseen question from a persistent deck"""
+        try:
+            return self.question_provider.draw_question(decks, interview_type, difficulty, owner)
+        except Exception as e:
+            logger.error(f"Error drawing question: {e}")
+            return None
+
+    def search_questions(self, query: str, interview_type: Optional[str] = None,
+                         limit: int = 5) -> List[Tuple[str, Dict[str, Any]]]:
+        """Find questions matching free-text terms as (type, question) pairs"""
+        try:
+            return self.question_provider.search_questions(query, interview_type, limit)
+        except Exception as e:
+            logger.error(f"Error searching questions: {e}")
+            return []
+
     @classmethod
     def get_interview_type_from_reaction(cls, emoji: str) -> Optional[str]:
         """Convert reaction emoji to interview type"""
@@ -1,85 +1,318 @@
-from discord.ext import commands, tasks
-from datetime import datetime, time
+from discord.ext import commands
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
-import pytz
-from zoneinfo import ZoneInfo
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
 from tzlocal import get_localzone
 import discord
 from ..config.task_config import TASK_CONFIG
+from ..providers.data.scheduler_state import SchedulerState
+from ..providers.data.task_leases import REPLICA_ID, get_lease_backend
+from .executors import get_executor
 
 logger = logging.getLogger(__name__)
 
+# Runs that start this late are catch-ups and get a random delay so a restart doesn't fire every task at once
+LATE_AFTER_SECONDS = 60
+DEFAULT_JITTER_SECONDS = 30
+
+# A replica running a task renews its lease every third of this; a dead one loses it after this long
+LEASE_TTL_SECONDS = float(os.getenv('LEASE_TTL_SECONDS', '60'))
+
+class Schedule:
+    """
+    Fire times of a task's 'schedule' config, as minutes past local midnight:
+      all_hours       every `every_minutes` minutes, all day
+      business_hours  every `every_minutes` minutes from hours[0] until hours[1]
+      daily           once, at hours[0]
+      specific_hours  at each of `hours`
+    Hour-based types fire at `minute` past the hour (default 0). Fire times are
+    returned in UTC, so sleeps and lateness checks measure real elapsed time
+    across DST changes.
+    """
+
+    def __init__(self, config: Dict[str, Any], tz):
+        self.timezone = tz
+        schedule_type = config.get('type')
+        hours = config.get('hours', [])
+        minute = config.get('minute', 0)
+        every = config.get('every_minutes', 60)
+
+        if schedule_type == 'all_hours':
+            minutes = range(0, 24 * 60, every)
+        elif schedule_type == 'business_hours' and len(hours) == 2:
+            minutes = range(hours[0] * 60, hours[1] * 60, every)
+        elif schedule_type == 'daily' and len(hours) == 1:
+            minutes = [hours[0] * 60 + minute]
+        elif schedule_type == 'specific_hours' and hours:
+            minutes = [hour * 60 + minute for hour in hours]
+        else:
+            raise ValueError(f"Invalid schedule: {config}")
+        self.minutes: List[int] = sorted(set(minutes))
+
+    def _fire_times(self, day: datetime) -> List[datetime]:
+        # Adding to an aware datetime is wall-clock arithmetic, which gives the local
+        # fire time; a time skipped by a DST jump lands just after the jump
+        midnight = datetime(day.year, day.month, day.day, tzinfo=self.timezone)
+        return [(midnight + timedelta(minutes=m)).astimezone(timezone.utc) for m in self.minutes]
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First fire time strictly after moment"""
+        local = moment.astimezone(self.timezone)
+        for day in (local, local + timedelta(days=1)):
+            for fire in self._fire_times(day):
+                if fire > moment:
+                    return fire
+        raise AssertionError("a schedule fires at least once a day")
+
+    def latest(self, moment: datetime) -> datetime:
+        """Last fire time at or before moment"""
+        local = moment.astimezone(self.timezone)
+        for day in (local, local - timedelta(days=1)):
+            for fire in reversed(self._fire_times(day)):
+                if fire <= moment:
+                    return fire
+        raise AssertionError("a schedule fires at least once a day")
+
+class DurationHistogram:
+    """Run durations counted into fixed buckets (seconds)"""
+    BUCKETS = (1, 5, 15, 60, 300)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = next((i for i, bound in enumerate(self.BUCKETS) if seconds <= bound), len(self.BUCKETS))
+        self.counts[index] += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> str:
+        runs = sum(self.counts)
+        if not runs:
+            return "no runs yet"
+        labels = [f"≤{bound}s" for bound in self.BUCKETS] + [f">{self.BUCKETS[-1]}s"]
+        buckets = ", ".join(f"{label}: {count}" for label, count in zip(labels, self.counts) if count)
+        return f"{buckets}\nmean {self.total / runs:.1f}s, max {self.max:.1f}s"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'buckets': list(self.BUCKETS), 'counts': self.counts, 'total': self.total, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DurationHistogram':
+        histogram = cls()
+        if data.get('buckets') == list(cls.BUCKETS):  # Counts under other bounds can't be carried over
+            histogram.counts = list(data['counts'])
+            histogram.total = data.get('total', 0.0)
+            histogram.max = data.get('max', 0.0)
+        return histogram
+
+class DeadlineLoop:
+    """
+    Sleeps until the schedule's next fire time and runs the task once. Fire
+    times missed while the bot was down or busy are coalesced into a single
+    jittered catch-up run if still within `catchup_minutes`, otherwise skipped.
+    """
+
+    def __init__(self, owner: 'BaseScheduledTask', schedule: Schedule, catchup: timedelta, jitter_seconds: float):
+        self.owner = owner
+        self.schedule = schedule
+        # Waking a little late is normal; anything within LATE_AFTER_SECONDS still counts as on time
+        self.catchup = max(catchup, timedelta(seconds=LATE_AFTER_SECONDS))
+        self.jitter_seconds = jitter_seconds
+        self.next_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def _run(self) -> None:
+        name = self.owner.task_name
+        await self.owner.bot.wait_until_ready()
+
+        try:
+            fire = self._first_fire()
+        except Exception as e:
+            logger.error(f"[{name}] Failed to restore the schedule position: {e}", exc_info=True)
+            fire = self.schedule.next_after(self._now())
+
+        while True:
+            try:
+                fire = await self._run_due(fire)
+            except Exception as e:
+                # One bad iteration (lease store, state file, ...) must not end the loop
+                self.owner.task_stats['errors'] += 1
+                self.owner.task_stats['last_error'] = (datetime.now(self.schedule.timezone), str(e))
+                logger.error(f"[{name}] Scheduler iteration for the {fire} run failed: {e}", exc_info=True)
+                fire = self.schedule.next_after(max(fire, self._now()))
+                self.next_run = fire
+
+    def _first_fire(self) -> datetime:
+        """
+        A fire time shortly before startup is caught up like one missed while
+        running, unless the persisted state shows it already ran
+        """
+        name = self.owner.task_name
+        now = self._now()
+        fire = self.schedule.latest(now)
+        last_fire = self.owner.last_fire
+        if last_fire is not None and last_fire >= fire:
+            logger.info(f"[{name}] The {fire} run already happened before the restart")
+            fire = self.schedule.next_after(now)
+        elif now - fire > self.catchup:
+            if last_fire is not None:
+                missed = 1 + sum(1 for _ in self._fires_between(last_fire, fire))
+                self.owner.task_stats['missed'] += missed
+                logger.warning(f"[{name}] Missed {missed} run(s) while the bot was down")
+            fire = self.schedule.next_after(now)
+        return fire
+
+    async def _run_due(self, fire: datetime) -> datetime:
+        """Sleep until fire, run it (or record it as missed) and return the next fire time"""
+        name = self.owner.task_name
+        self.next_run = fire
+        while (delay := (fire - self._now()).total_seconds()) > 0:
+            await asyncio.sleep(delay)
+
+        now = self._now()
+        latest = self.schedule.latest(now)
+        if latest > fire:
+            skipped = sum(1 for _ in self._fires_between(fire, latest))
+            self.owner.task_stats['missed'] += skipped
+            logger.warning(f"[{name}] Fell behind schedule; skipping {skipped} run(s) before {latest}")
+            fire = latest
+
+        if now - fire > self.catchup:
+            self.owner.task_stats['missed'] += 1
+            logger.warning(f"[{name}] Missed the {fire} run by more than {self.catchup}")
+        else:
+            if (now - fire).total_seconds() > LATE_AFTER_SECONDS:
+                delay = random.uniform(0, self.jitter_seconds)
+                logger.info(f"[{name}] Catching up on the {fire} run in {delay:.0f}s")
+                await asyncio.sleep(delay)
+            # Claim the fire time before running: a crash mid-run must not repeat it on
+            # restart, and exactly one replica may run it
+            token = await self.owner.claim_run(fire)
+            self.owner.last_fire = fire
+            await self.owner.save_state()
+            if token is not None:
+                await self.owner.run_leased(token)
+
+        fire = self.schedule.next_after(fire)
+        self.next_run = fire
+        await self.owner.save_state()
+        return fire
+
+    def _fires_between(self, start: datetime, end: datetime):
+        """Fire times after start and before end"""
+        fire = self.schedule.next_after(start)
+        while fire < end:
+            yield fire
+            fire = self.schedule.next_after(fire)
+
 class BaseScheduledTask:
     def __init__(self, bot):
         self.bot = bot
         self.timezone = get_localzone()
-        self._last_run = None
+        self.task_name = self.__class__.__name__.lower()
         self.task_stats = {
             'runs': 0,
             'errors': 0,
+            'missed': 0,
             'last_error': None,
-            'last_success': None
+            'last_success': None,
+            'durations': DurationHistogram()
         }
-        self.last_run = {}
+        self.last_fire: Optional[datetime] = None  # Schedule time of the last run started
+        self.task_loop: Optional[DeadlineLoop] = None
+        self.state_store = SchedulerState.shared()
+        self._restore_state()
         self._register_status_command()
 
-    def create_task_loop(self):
-        """Create the task loop with configured interval"""
-        task_name = self.__class__.__name__.lower()
-        logger.info(f"[{task_name}] Loading task config")
-        logger.info(f"[{task_name}] Available configs: {TASK_CONFIG.keys()}")
-
-        config = TASK_CONFIG.get(task_name, {})
-        logger.info(f"[{task_name}] Loaded config: {config}")
+    def _restore_state(self) -> None:
+        """Load the counters and last run persisted by a previous process"""
+        state = self.state_store.get(self.task_name)
+        if not state:
+            return
+        parse = lambda value: datetime.fromisoformat(value) if value else None
+        self.last_fire = parse(state.get('last_fire'))
+        self.task_stats['runs'] = state.get('runs', 0)
+        self.task_stats['errors'] = state.get('errors', 0)
+        self.task_stats['missed'] = state.get('missed', 0)
+        self.task_stats['last_success'] = parse(state.get('last_success'))
+        if state.get('last_error'):
+            when, error = state['last_error']
+            self.task_stats['last_error'] = (parse(when), error)
+        self.task_stats['durations'] = DurationHistogram.from_dict(state.get('durations', {}))
+        logger.info(f"[{self.task_name}] Restored scheduler state, last run scheduled for {self.last_fire}")
 
-        loop_minutes = config.get('loop_minutes', 30)  # Default to 30 minutes if not specified
-        logger.info(f"Creating task loop for {task_name} with {loop_minutes} minute interval")
+    async def save_state(self) -> None:
+        """Persist the last run, next due time and stats"""
+        iso = lambda value: value.isoformat() if value else None
+        last_error = self.task_stats['last_error']
+        state = {
+            'last_fire': iso(self.last_fire),
+            'next_run': iso(self.task_loop.next_run if self.task_loop else None),
+            'runs': self.task_stats['runs'],
+            'errors': self.task_stats['errors'],
+            'missed': self.task_stats['missed'],
+            'last_success': iso(self.task_stats['last_success']),
+            'last_error': [iso(last_error[0]), last_error[1]] if last_error else None,
+            'durations': self.task_stats['durations'].to_dict()
+        }
+        try:
+            await get_executor('disk').run(self.state_store.save, self.task_name, state)
+        except OSError as e:
+            logger.error(f"[{self.task_name}] Failed to save scheduler state: {e}")
 
-        @tasks.loop(minutes=loop_minutes)
-        async def task_loop():  # Remove 'self' parameter here
-            logger.info(f"Task loop executing for {task_name}")
-            await self.safe_execute()  # 'self' is available from closure
+    def create_task_loop(self) -> DeadlineLoop:
+        """Create the deadline loop for this task's configured schedule"""
+        config = TASK_CONFIG.get(self.task_name, {})
+        schedule_config = config.get('schedule', {})
+        schedule = Schedule(schedule_config, self.timezone)
+        catchup = timedelta(minutes=schedule_config.get('catchup_minutes', 0))
+        jitter = schedule_config.get('jitter_seconds', DEFAULT_JITTER_SECONDS)
+        logger.info(f"[{self.task_name}] Scheduled at {len(schedule.minutes)} time(s) a day, catch-up window {catchup}")
+        return DeadlineLoop(self, schedule, catchup, jitter)
 
-        @task_loop.before_loop
-        async def before_task_loop():  # Remove 'self' parameter here
-            logger.info(f"Waiting for bot to be ready before starting {task_name}")
-            await self.bot.wait_until_ready()
-            logger.info(f"Bot is ready, {task_name} task can start")
+    def start_task_loop(self) -> None:
+        """Create and start the task loop, unless the task is disabled in TASK_CONFIG"""
+        if not TASK_CONFIG.get(self.task_name, {}).get('enabled', False):
+            logger.info(f"[{self.task_name}] Task is not enabled in config")
+            return
+        self.task_loop = self.create_task_loop()
+        self.task_loop.start()
 
-        return task_loop
+    def stop_task_loop(self) -> None:
+        if self.task_loop is not None:
+            self.task_loop.cancel()
 
     def _register_status_command(self):
         """Register status command with a unique name based on the subclass"""
         # Get the subclass name and convert to lowercase for command name
-        command_name = f"status_{self.__class__.__name__.lower()}"
+        command_name = f"status_{self.task_name}"
 
         @commands.command(name=command_name)
         @commands.is_owner()
         async def status(ctx):
             """Show task statistics"""
-            embed = discord.Embed(
-                title=f"Task Status: {self.__class__.__name__}",
-                color=discord.Color.blue()
-            )
-            embed.add_field(name="Total Runs", value=self.task_stats['runs'])
-            embed.add_field(name="Total Errors", value=self.task_stats['errors'])
-
-            if self.task_stats['last_success']:
-                embed.add_field(
-                    name="Last Success",
-                    value=self.task_stats['last_success'].strftime('%Y-%m-%d %H:%M:%S'),
-                    inline=False
-                )
-
-            if self.task_stats['last_error']:
-                time, error = self.task_stats['last_error']
-                embed.add_field(
-                    name="Last Error",
-                    value=f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n{error}",
-                    inline=False
-                )
-
-            await ctx.send(embed=embed)
+            await ctx.send(embed=self.create_status_embed())
 
         # Add the command to the class
         setattr(self, command_name, status)
@@ -87,78 +320,57 @@ class BaseScheduledTask:
         # Add the command to the bot commands
         self.bot.add_command(status)
 
-    def should_run(self) -> bool:
-        """Common logic for determining if a task should run based on configuration"""
-        task_name = self.__class__.__name__.lower()
-        logger.info(f"Checking should_run for {task_name}")
-
-        config = TASK_CONFIG.get(task_name, {})
-        if not config.get('enabled', False):
-            logger.info(f"[{task_name}] Task is not enabled in config")
-            return False
-
-        schedule = config.get('schedule', {})
-        schedule_type = schedule.get('type')
-        hours = schedule.get('hours', [])
-        minute_window = schedule.get('minute_window', 60)
-        interval = schedule.get('interval', 0)
-
-        now = datetime.now(self.timezone)
-        current_hour = now.hour
-        current_minute = now.minute
-
-        logger.info(f"""
-        [{task_name}] Schedule check details:
-        - Current time: {now}
-        - Schedule type: {schedule_type}
-        - Target hours: {hours}
-        - Current hour: {current_hour}
-        - Current minute: {current_minute}
-        - Minute window: {minute_window}
-        - Interval: {interval}
-        """)
-
-        # Check if enough time has passed since last run (for interval-based tasks)
-        if interval > 0:
-            last_run = self.last_run.get(task_name)
-            if last_run:
-                time_since_last_run = (now - last_run).total_seconds() / 60
-                logger.info(f"[{task_name}] Time since last run: {time_since_last_run} minutes")
-                if time_since_last_run < interval:
-                    logger.info(f"[{task_name}] Not enough time passed since last run")
-                    return False
-
-        # Check if current time falls within the scheduled window
-        if schedule_type == 'all_hours':
-            # Always return True for 'all_hours', but still respect the interval
-            pass
-        elif schedule_type == 'business_hours':
-            if len(hours) != 2:
-                return False
-            start_hour, end_hour = hours
-            if not (start_hour <= current_hour < end_hour):
-                return False
-        elif schedule_type == 'daily':
-            if len(hours) != 1:
-                return False
-            if current_hour != hours[0]:
-                return False
-        elif schedule_type == 'specific_hours':
-            if current_hour not in hours:
-                logger.info(f"[{task_name}] Current hour {current_hour} not in target hours {hours}")
-                return False
-        else:
-            return False
+    async def claim_run(self, fire: datetime) -> Optional[int]:
+        """Take the task's lease and claim this fire time; returns the fencing token, or None to skip the run"""
+        backend = get_lease_backend()
+        disk = get_executor('disk')
+        try:
+            token = await disk.run(backend.acquire, self.task_name, REPLICA_ID, LEASE_TTL_SECONDS)
+            if token is None:
+                logger.info(f"[{self.task_name}] Another replica holds the lease; skipping the {fire} run")
+                return None
+            if not await disk.run(backend.claim_run, self.task_name, fire.isoformat(), REPLICA_ID, token):
+                logger.info(f"[{self.task_name}] The {fire} run was already claimed by another replica")
+                await disk.run(backend.release, self.task_name, REPLICA_ID, token)
+                return None
+            return token
+        except Exception as e:
+            # Without the lease we can't rule out another replica running it; skip rather than duplicate
+            self.task_stats['missed'] += 1
+            logger.error(f"[{self.task_name}] Lease backend failed, skipping the {fire} run: {e}", exc_info=True)
+            return None
 
-        # Check minute window (skip for 'all_hours')
-        if schedule_type != 'all_hours' and current_minute >= minute_window:
-            logger.info(f"[{task_name}] Current minute {current_minute} outside window {minute_window}")
-            return False
+    async def run_leased(self, token: int) -> None:
+        """Execute while renewing the lease; the run is cancelled if the lease is lost"""
+        run = asyncio.create_task(self.safe_execute())
+        heartbeat = asyncio.create_task(self._hold_lease(token, run))
+        try:
+            await asyncio.wait({run})
+        finally:
+            run.cancel()
+            heartbeat.cancel()
+            try:
+                await get_executor('disk').run(get_lease_backend().release, self.task_name, REPLICA_ID, token)
+            except Exception as e:
+                logger.warning(f"[{self.task_name}] Failed to release lease {token}, it expires on its own: {e}")
 
-        # Update last run time
-        logger.info(f"[{task_name}] All checks passed - task should run")
-        self.last_run[task_name] = now
-        return True
+    async def _hold_lease(self, token: int, run: asyncio.Task) -> None:
+        backend = get_lease_backend()
+        while True:
+            await asyncio.sleep(LEASE_TTL_SECONDS / 3)
+            try:
+                renewed = await get_executor('disk').run(
+                    backend.renew, self.task_name, REPLICA_ID, token, LEASE_TTL_SECONDS
+                )
+            except Exception as e:
+                logger.warning(f"[{self.task_name}] Lease renewal failed, retrying: {e}")
+                continue
+            if not renewed:
+                self.task_stats['errors'] += 1
+                self.task_stats['last_error'] = (datetime.now(self.timezone), f"Lost lease {token}")
+                logger.error(f"[{self.task_name}] Lost lease {token} to another replica; stopping this run")
+                run.cancel()
+                return
 
     async def execute(self):
         """Override this method to define what the task does"""
@@ -170,16 +382,20 @@ class BaseScheduledTask:
         return 9 <= now.hour < 17 and now.weekday() < 5
 
     async def safe_execute(self):
-        """Safely execute the task with error handling"""
+        """Safely execute the task with error handling, recording how long it ran"""
+        start = time.monotonic()
         try:
-            if self.should_run():
-                await self.execute()
-                self.task_stats['runs'] += 1
-                self.task_stats['last_success'] = datetime.now(self.timezone)
+            await self.execute()
+            self.task_stats['runs'] += 1
+            self.task_stats['last_success'] = datetime.now(self.timezone)
         except Exception as e:
             self.task_stats['errors'] += 1
             self.task_stats['last_error'] = (datetime.now(self.timezone), str(e))
             logger.error(f"Error in {self.__class__.__name__}: {e}", exc_info=True)
+        finally:
+            duration = time.monotonic() - start
+            self.task_stats['durations'].record(duration)
+            logger.info(f"[{self.task_name}] Run finished in {duration:.1f}s")
 
     def create_status_embed(self) -> discord.Embed:
         """Create status embed for the task"""
@@ -189,6 +405,14 @@ class BaseScheduledTask:
         )
         embed.add_field(name="Total Runs", value=self.task_stats['runs'])
         embed.add_field(name="Total Errors", value=self.task_stats['errors'])
+        embed.add_field(name="Missed Runs", value=self.task_stats['missed'])
+
+        if self.task_loop is not None and self.task_loop.next_run:
+            embed.add_field(
+                name="Next Run",
+                value=self.task_loop.next_run.astimezone(self.timezone).strftime('%Y-%m-%d %H:%M:%S'),
+                inline=False
+            )
 
         if self.task_stats['last_success']:
             embed.add_field(
@@ -198,11 +422,12 @@ class BaseScheduledTask:
             )
 
         if self.task_stats['last_error']:
-            time, error = self.task_stats['last_error']
+            when, error = self.task_stats['last_error']
             embed.add_field(
                 name="Last Error",
-                value=f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n{error}",
+                value=f"{when.strftime('%Y-%m-%d %H:%M:%S')}\n{error}",
                 inline=False
             )
 
-        return embed
\ No newline at end of file
+        embed.add_field(name="Run Durations", value=self.task_stats['durations'].summary(), inline=False)
+        return embed
@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+import pytest
+
+from src.providers import data_provider
+from src.providers.data_provider import DataProvider
+from src.providers.question_deck import draw_from_deck
+
+QUESTIONS = list(range(5))
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_provider, 'DECK_FLUSH_BATCH', 2)
+    monkeypatch.setattr(DataProvider, '_question_decks', {})
+    monkeypatch.setattr(DataProvider, '_dirty_decks', set())
+    return DataProvider()
+
+async def _draw(provider, user_id):
+    decks = await provider.get_question_decks(user_id)
+    question = draw_from_deck(decks, 'technical:medium', QUESTIONS)
+    await provider.mark_decks_dirty(user_id)
+    return question
+
+def test_draws_across_batch_flushes_keep_deck_position(provider):
+    async def run():
+        drawn = {'1': [], '2': []}
+        # Alternating users crosses the flush threshold on every second draw
+        for _ in range(len(QUESTIONS)):
+            for user_id in drawn:
+                drawn[user_id].append(await _draw(provider, user_id))
+        return drawn
+
+    drawn = asyncio.run(run())
+    for user_id, questions in drawn.items():
+        assert sorted(questions) == QUESTIONS, f"user {user_id} saw a repeat before the deck ran out"
+
+    with open(provider.data_manager.USER_PROFILES_FILE) as f:
+        profiles = {profile['user_id']: profile for profile in map(json.loads, f)}
+    for user_id in drawn:
+        seed, position, size = profiles[user_id]['question_decks']['technical:medium']
+        assert (position, size) == (len(QUESTIONS), len(QUESTIONS))